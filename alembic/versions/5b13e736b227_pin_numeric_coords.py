@@ -0,0 +1,72 @@
+"""pin numeric coords
+
+Revision ID: 5b13e736b227
+Revises: 8a672a9b5c9e
+Create Date: 2026-10-19 15:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b13e736b227'
+down_revision: Union[str, Sequence[str], None] = '8a672a9b5c9e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# "x,y" / "x,y,yaw" 문자열 → (x, y, yaw) (형식 오류 시 None)
+def _parse(coords):
+    try:
+        parts = [float(v) for v in str(coords).split(",")]
+    except (ValueError, TypeError):
+        return None
+    if len(parts) < 2:
+        return None
+    return parts[0], parts[1], parts[2] if len(parts) > 2 else None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('pin', sa.Column('x', sa.Float(), nullable=True))
+    op.add_column('pin', sa.Column('y', sa.Float(), nullable=True))
+    op.add_column('pin', sa.Column('yaw', sa.Float(), nullable=True))
+
+    # 기존 문자열 좌표 변환 (형식 오류 좌표는 NULL)
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, coords FROM pin WHERE coords IS NOT NULL")).fetchall()
+    for pin_id, coords in rows:
+        parsed = _parse(coords)
+        if parsed is None:
+            print(f"⚠️ 핀 {pin_id} 좌표 형식 오류 → NULL: {coords!r}")
+            continue
+        conn.execute(
+            sa.text("UPDATE pin SET x = :x, y = :y, yaw = :yaw WHERE id = :id"),
+            {"x": parsed[0], "y": parsed[1], "yaw": parsed[2], "id": pin_id},
+        )
+
+    op.drop_column('pin', 'coords')
+    op.create_index('ix_pin_xy', 'pin', ['x', 'y'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('pin', sa.Column('coords', sa.String(length=255), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, x, y, yaw FROM pin WHERE x IS NOT NULL AND y IS NOT NULL")).fetchall()
+    for pin_id, x, y, yaw in rows:
+        # 방향이 있으면 "x,y,yaw" 형식 유지
+        coords = f"{x},{y}" if yaw is None else f"{x},{y},{yaw}"
+        conn.execute(
+            sa.text("UPDATE pin SET coords = :coords WHERE id = :id"),
+            {"coords": coords, "id": pin_id},
+        )
+
+    op.drop_index('ix_pin_xy', table_name='pin')
+    op.drop_column('pin', 'yaw')
+    op.drop_column('pin', 'y')
+    op.drop_column('pin', 'x')
@@ -0,0 +1,47 @@
+"""move cycle timing
+
+Revision ID: c41f0d2e9a17
+Revises: 5b13e736b227
+Create Date: 2026-10-19 18:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41f0d2e9a17'
+down_revision: Union[str, Sequence[str], None] = '5b13e736b227'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'move_cycle',
+        sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('robot_name', sa.String(length=100), nullable=False),
+        sa.Column('pin_name', sa.String(length=100), nullable=False),
+        sa.Column('stock_id', sa.BigInteger(), nullable=True),
+        sa.Column('stock_name', sa.String(length=100), nullable=True),
+        sa.Column('mode', sa.String(length=20), nullable=True),
+        sa.Column('quantity', sa.Integer(), nullable=True),
+        sa.Column('dispatched_at', sa.Double(), nullable=False),
+        sa.Column('arrived_at', sa.Double(), nullable=True),
+        sa.Column('confirmed_at', sa.Double(), nullable=True),
+        sa.Column('return_started_at', sa.Double(), nullable=True),
+        sa.Column('returned_at', sa.Double(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_move_cycle_robot', 'move_cycle', ['robot_name', 'id'])
+    op.create_index('ix_move_cycle_dispatched', 'move_cycle', ['dispatched_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_move_cycle_dispatched', table_name='move_cycle')
+    op.drop_index('ix_move_cycle_robot', table_name='move_cycle')
+    op.drop_table('move_cycle')
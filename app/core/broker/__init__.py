@@ -0,0 +1,22 @@
+from app.core.config import settings
+from app.core.broker.local import LocalBroker
+
+
+# BROKER_URL → 브로커 생성
+#   local (기본)             : 단일 워커
+#   unix:///tmp/wms.sock     : 같은 호스트 다중 워커 (Unix 소켓 허브)
+#   redis://127.0.0.1:6379/0 : Redis 호환 서버 pub/sub
+def create_broker(url: str) -> LocalBroker:
+    if url.startswith("unix://"):
+        from app.core.broker.unix_socket import UnixSocketBroker
+        return UnixSocketBroker(url[len("unix://"):])
+
+    if url.startswith(("redis://", "rediss://")):
+        from app.core.broker.redis_broker import RedisBroker
+        return RedisBroker(url)
+
+    return LocalBroker()
+
+
+# 전역 브로커
+broker = create_broker(settings.BROKER_URL)
@@ -0,0 +1,88 @@
+import json
+import uuid
+
+
+# 워커 간 메시지 브로커 (기본: 단일 프로세스)
+# - channel 별 핸들러 handler(message: dict, remote: bool) 등록
+# - publish: 로컬 핸들러 즉시 호출 + 다른 워커로 전송 (다중 워커 백엔드에서 구현)
+# - is_owner: ROS 연결을 소유하는 워커 여부 (전체 워커 중 정확히 1개)
+# - on_owner_change: 기동 이후 소유권 승계 / 상실 시 callback(owner: bool) 호출 (브로커 스레드)
+#
+# 채널
+#   broadcast  : WS 브로드캐스트 메시지 (모든 워커가 자기 클라이언트에 팬아웃)
+#   state      : 상태 저장소 변경 복제
+#   ros_command: ROS 명령 (소유 워커만 실행)
+#   cache      : 목록 GET 캐시 무효화 복제
+#   batch      : 배치 주문 시작/확인/취소 (소유 워커 실행) + 진행 상태 복제
+#   fleet      : 작업 배정기 등록/취소/완료 (소유 워커 실행) + 배정 상태 복제
+#   fsm        : 로봇 상태 기계 상태 복제 + 비상정지 보고 전달 (소유 워커 반영)
+class LocalBroker:
+    name = "local"
+
+    def __init__(self):
+        self.worker_id = uuid.uuid4().hex[:8]
+        self.is_owner = True
+        self._handlers: dict[str, list] = {}
+        self._owner_callbacks: list = []
+
+    def subscribe(self, channel: str, handler):
+        self._handlers.setdefault(channel, []).append(handler)
+
+    def on_owner_change(self, callback):
+        self._owner_callbacks.append(callback)
+
+    # 소유권 변경 반영 + 구독자 호출 (변경 없으면 무시)
+    def _set_owner(self, owner: bool):
+        if self.is_owner == owner:
+            return
+        self.is_owner = owner
+        self._notify_owner(owner)
+
+    def _notify_owner(self, owner: bool):
+        for callback in self._owner_callbacks:
+            try:
+                callback(owner)
+            except Exception as e:
+                print("[BROKER] ⚠️ 소유권 변경 처리 오류:", e)
+
+    # local=False: 다른 워커에만 전송 (이미 로컬에 반영된 변경 복제용)
+    def publish(self, channel: str, message: dict, local: bool = True):
+        if local:
+            self._dispatch(channel, message, remote=False)
+        self._send(channel, message)
+
+    def _dispatch(self, channel: str, message: dict, remote: bool):
+        for handler in self._handlers.get(channel, ()):
+            try:
+                handler(message, remote)
+            except Exception as e:
+                print(f"[BROKER] ⚠️ {channel} 핸들러 오류:", e)
+
+    # 다른 워커로 전송 (단일 프로세스는 없음)
+    def _send(self, channel: str, message: dict):
+        pass
+
+    # 전송 프레임 (발신 워커 / 채널 / 메시지)
+    def _encode(self, channel: str, message: dict) -> bytes:
+        return json.dumps(
+            {"origin": self.worker_id, "channel": channel, "message": message},
+            separators=(",", ":"),
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+    # 수신 프레임 처리 (자기 자신이 보낸 프레임은 무시)
+    def _receive(self, raw: bytes):
+        try:
+            frame = json.loads(raw)
+        except ValueError:
+            print("[BROKER] ⚠️ 잘못된 프레임 무시")
+            return
+        if frame.get("origin") == self.worker_id:
+            return
+        self._dispatch(frame.get("channel"), frame.get("message") or {}, remote=True)
+
+    def start(self):
+        print(f"[BROKER] {self.name} 브로커 시작 (worker={self.worker_id}, ROS 소유={self.is_owner})")
+
+    def stop(self):
+        pass
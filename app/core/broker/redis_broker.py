@@ -0,0 +1,104 @@
+import threading
+import time
+
+from app.core.broker.remote import RemoteBroker
+
+try:
+    import redis
+except ImportError:  # 선택 의존성 (BROKER_URL=redis://... 사용 시에만 필요)
+    redis = None
+
+
+# Redis(호환 서버 포함) pub/sub 브로커 (여러 호스트의 워커 간 중계 가능)
+# - 모든 채널을 단일 Redis 채널로 발행 → 채널 간 메시지 순서 유지
+# - ROS 소유권: SET NX + TTL 임대, 소유 워커가 주기적으로 연장
+#   (소유 워커 종료로 임대 만료 시 다른 워커가 승계, 로봇은 재연결 필요)
+#   임대 상실 / 승계는 on_owner_change 구독자에 알림 (로봇 연결 해제 / 소유 워커 작업 시작)
+# - 구독 연결 오류 시 백오프 후 재구독
+class RedisBroker(RemoteBroker):
+    name = "redis"
+
+    OWNER_TTL = 15
+    RETRY_MAX = 10.0
+
+    def __init__(self, url: str, prefix: str = "wms"):
+        if redis is None:
+            raise RuntimeError("BROKER_URL=redis:// 사용 시 redis 패키지 필요 (pip install redis)")
+        super().__init__()
+        self.channel = f"{prefix}:bus"
+        self.owner_key = f"{prefix}:ros_owner"
+        self._client = redis.Redis.from_url(url)
+        self._pubsub = None
+
+    def start(self):
+        if self._client.set(self.owner_key, self.worker_id, nx=True, ex=self.OWNER_TTL):
+            self.is_owner = True
+        self._subscribe()
+        threading.Thread(target=self._listen, daemon=True).start()
+        threading.Thread(target=self._keep_owner, daemon=True).start()
+        super().start()
+
+    def _subscribe(self):
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(self.channel)
+
+    def _try_acquire(self) -> bool:
+        if self._client.set(self.owner_key, self.worker_id, nx=True, ex=self.OWNER_TTL):
+            self._set_owner(True)
+        return self.is_owner
+
+    # 소유 임대 연장 / 비소유 워커는 만료 시 승계 시도
+    def _keep_owner(self):
+        while not self._stopped:
+            time.sleep(self.OWNER_TTL / 3)
+            try:
+                if self.is_owner:
+                    if self._client.get(self.owner_key) == self.worker_id.encode():
+                        self._client.expire(self.owner_key, self.OWNER_TTL)
+                    else:
+                        print("[BROKER] ⚠️ ROS 소유권 상실 (임대 만료) → 로봇 연결 해제")
+                        self._set_owner(False)
+                elif self._try_acquire():
+                    print(f"[BROKER] 👑 ROS 소유권 승계 (worker={self.worker_id}), 로봇 재연결 필요")
+            except redis.RedisError as e:
+                print("[BROKER] ⚠️ 소유권 갱신 실패:", e)
+
+    # 구독 수신 (연결 오류 시 1초부터 RETRY_MAX 까지 2배씩 늘려 재구독)
+    def _listen(self):
+        delay = 1.0
+        while not self._stopped:
+            try:
+                if self._pubsub is None:
+                    self._subscribe()
+                    print("[BROKER] 🔁 Redis 재구독 완료")
+                delay = 1.0
+                for item in self._pubsub.listen():
+                    if item.get("type") == "message":
+                        self._receive(item["data"])
+            except (redis.RedisError, ValueError) as e:
+                if self._stopped:
+                    return
+                print(f"[BROKER] ⚠️ Redis 구독 끊김 ({e}) → {delay:.0f}초 후 재구독")
+            self._close_pubsub()
+            time.sleep(delay)
+            delay = min(delay * 2, self.RETRY_MAX)
+
+    def _close_pubsub(self):
+        pubsub, self._pubsub = self._pubsub, None
+        if pubsub is not None:
+            try:
+                pubsub.close()
+            except redis.RedisError:
+                pass
+
+    def _write(self, frame: bytes):
+        self._client.publish(self.channel, frame)
+
+    def stop(self):
+        super().stop()
+        try:
+            if self.is_owner and self._client.get(self.owner_key) == self.worker_id.encode():
+                self._client.delete(self.owner_key)
+        except redis.RedisError:
+            pass
+        self._close_pubsub()
@@ -0,0 +1,47 @@
+import queue
+import threading
+
+from app.core.broker.local import LocalBroker
+
+
+# 다중 워커 브로커 공통 (송신 큐 + 전용 송신 스레드)
+# - publish 는 호출 스레드(이벤트 루프 / ROS 콜백)를 막지 않고 큐에 적재
+# - 단일 송신 스레드라 발행 순서 유지
+class RemoteBroker(LocalBroker):
+    def __init__(self):
+        super().__init__()
+        self.is_owner = False
+        self._outbox: queue.Queue = queue.Queue()
+        self._sender: threading.Thread | None = None
+        self._stopped = False
+
+    def _send(self, channel: str, message: dict):
+        if self._sender is None:
+            return
+        self._outbox.put(self._encode(channel, message))
+
+    def _send_loop(self):
+        while True:
+            frame = self._outbox.get()
+            if frame is None:
+                return
+            try:
+                self._write(frame)
+            except Exception as e:
+                print(f"[BROKER] ⚠️ {self.name} 전송 실패:", e)
+
+    # 백엔드별 프레임 전송
+    def _write(self, frame: bytes):
+        raise NotImplementedError
+
+    def start(self):
+        self._sender = threading.Thread(target=self._send_loop, daemon=True)
+        self._sender.start()
+        super().start()
+
+    def stop(self):
+        self._stopped = True
+        if self._sender:
+            self._outbox.put(None)
+            self._sender.join(timeout=2)
+            self._sender = None
@@ -0,0 +1,133 @@
+import os
+import fcntl
+import socket
+import threading
+import time
+
+from app.core.broker.remote import RemoteBroker
+
+
+# 로컬 Unix 소켓 브로커 (같은 호스트의 uvicorn 워커 간 중계)
+# - 소켓을 먼저 bind 한 워커가 허브 + ROS 소유 워커, 나머지는 허브에 접속
+# - 프레임: 줄 단위 JSON, 허브가 발신 워커를 제외한 전체 워커에 중계
+# - 허브 워커 종료 시 남은 워커가 재선출 (새 허브가 ROS 소유 승계, 로봇은 재연결 필요)
+class UnixSocketBroker(RemoteBroker):
+    name = "unix"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self._server: socket.socket | None = None
+        self._peers: list[socket.socket] = []
+        self._conn: socket.socket | None = None
+        self._write_lock = threading.Lock()
+
+    def start(self):
+        self._elect()
+        super().start()
+
+    # 허브 접속 또는 허브 생성 (lock 파일로 동시 선출 방지)
+    def _elect(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path + ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    conn.connect(self.path)
+                    self._conn = conn
+                    self.is_owner = False
+                    threading.Thread(target=self._read_loop, args=(conn,), daemon=True).start()
+                    return
+                except OSError:
+                    conn.close()
+
+                # 허브 없음 (또는 이전 허브의 남은 소켓 파일) → 허브 생성
+                if os.path.exists(self.path):
+                    os.unlink(self.path)
+                server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                server.bind(self.path)
+                server.listen()
+                self._server = server
+                self._conn = None
+                self.is_owner = True
+                threading.Thread(target=self._accept_loop, daemon=True).start()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    # 허브: 워커 접속 수락
+    def _accept_loop(self):
+        while not self._stopped:
+            try:
+                peer, _ = self._server.accept()
+            except OSError:
+                return
+            with self._write_lock:
+                self._peers.append(peer)
+            threading.Thread(target=self._read_loop, args=(peer,), daemon=True).start()
+
+    # 프레임 수신 (허브는 다른 워커에 중계 후 로컬 처리)
+    def _read_loop(self, conn: socket.socket):
+        try:
+            for line in conn.makefile("rb"):
+                if self._server is not None:
+                    self._relay(line, exclude=conn)
+                self._receive(line)
+        except OSError:
+            pass
+
+        if self._server is not None:
+            self._drop(conn)
+            return
+
+        # 허브 연결 끊김 → 재선출
+        if not self._stopped:
+            print("[BROKER] ⚠️ 허브 연결 끊김 → 재선출")
+            time.sleep(0.5)
+            self._elect()
+            if self.is_owner:
+                print(f"[BROKER] 👑 허브 승계 (worker={self.worker_id}) → ROS 소유 워커 전환, 로봇 재연결 필요")
+                self._notify_owner(True)
+
+    def _relay(self, line: bytes, exclude: socket.socket | None = None):
+        with self._write_lock:
+            peers = list(self._peers)
+        for peer in peers:
+            if peer is exclude:
+                continue
+            try:
+                with self._write_lock:
+                    peer.sendall(line)
+            except OSError:
+                self._drop(peer)
+
+    def _drop(self, peer: socket.socket):
+        with self._write_lock:
+            if peer in self._peers:
+                self._peers.remove(peer)
+        try:
+            peer.close()
+        except OSError:
+            pass
+
+    def _write(self, frame: bytes):
+        line = frame + b"\n"
+        if self._server is not None:
+            self._relay(line)
+            return
+        if self._conn is not None:
+            with self._write_lock:
+                self._conn.sendall(line)
+
+    def stop(self):
+        super().stop()
+        for sock in [self._conn, self._server, *self._peers]:
+            if sock is None:
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self._server is not None and os.path.exists(self.path):
+            os.unlink(self.path)
@@ -10,10 +10,92 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
 
+    # DB 연결 풀 (기본 연결 수 / 초과 허용 수 / 연결 재생성 주기 초 / 연결 대기 제한 초)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0
+
+    # 비동기 DB 엔진 (읽기 라우터용, 미설정 시 mysql+asyncmy URL 사용)
+    DB_ASYNC: bool = False
+    DB_ASYNC_URL: str | None = None
+
     # 서버 설정
     SERVER_PORT: int
     DEBUG: bool = True
 
+    # 이벤트 루프 모니터 (측정 주기 / 블로킹 판정 임계치, 초)
+    LOOP_MONITOR_INTERVAL: float = 0.1
+    LOOP_BLOCK_THRESHOLD: float = 0.25
+
+    # 텔레메트리 링 버퍼 (로봇×토픽별 샘플 수 / 최소 샘플 간격, 초)
+    TELEMETRY_CAPACITY: int = 3000
+    TELEMETRY_MIN_INTERVAL: float = 0.1
+
+    # 텔레메트리 영구 기록 (디렉터리 미설정 시 비활성)
+    TELEMETRY_RECORD_DIR: str | None = None
+    TELEMETRY_SEGMENT_RECORDS: int = 100_000
+    TELEMETRY_RETENTION_HOURS: float = 72.0
+    TELEMETRY_RECORD_INTERVAL: float = 0.1
+
+    # 다중 로봇 동시 연결 유지 (False면 로봇 전환 시 이전 로봇 연결 해제)
+    ROS_MULTI_ROBOT: bool = False
+
+    # 원본 ROS 메시지 JSONL 캡처 (미설정 시 비활성)
+    ROS_CAPTURE_PATH: str | None = None
+
+    # 텔레메트리 재생 (소스 기준 디렉터리 / 서버 시작 시 자동 재생 소스, 배속)
+    REPLAY_DIR: str = "./data/replay"
+    REPLAY_SOURCE: str | None = None
+    REPLAY_SPEED: float = 1.0
+
+    # WS 이벤트 재전송 버퍼 크기 (재접속 시 last_seq 이후 누락 이벤트 전송)
+    WS_REPLAY_BUFFER: int = 2048
+
+    # 워커 간 브로커 (local / unix:///tmp/wms.sock / redis://127.0.0.1:6379/0)
+    BROKER_URL: str = "local"
+
+    # 지도 레지스트리 (YAML 디렉터리 / 기본 지도 / 타일 저장 위치, 크기 / 변경 확인 주기, 초)
+    MAP_DIR: str = "app/static/map"
+    MAP_DEFAULT: str = "wasd_map3"
+    MAP_TILE_DIR: str = "./data/map_tiles"
+    MAP_TILE_SIZE: int = 256
+    MAP_WATCH_INTERVAL: float = 5.0
+
+    # 점유 격자 거리 변환 최대 거리 / 핀 등록 시 장애물과 최소 거리 (m)
+    MAP_CLEARANCE_MAX: float = 3.0
+    PIN_MIN_CLEARANCE: float = 0.1
+
+    # 경로 계획 (장애물 팽창 반경 / 계획 격자 해상도, m) / 이동 시간 환산 속도 (m/s) / 대기 위치 "x,y"
+    PLANNER_INFLATION: float = 0.15
+    PLANNER_RESOLUTION: float = 0.1
+    ROBOT_NOMINAL_SPEED: float = 0.2
+    WAIT_COORDS: str = "0,0"
+
+    # 배치 주문 (로봇 1회 운반 가능 수량)
+    ROBOT_CAPACITY: int = 20
+
+    # 다중 로봇 작업 배정 (주기 초 / 배정 최소 배터리 % / 정차 지점 작업 시간 초)
+    DISPATCH_INTERVAL: float = 0.5
+    DISPATCH_MIN_BATTERY: float = 20.0
+    DISPATCH_SERVICE_TIME: float = 10.0
+
+    # 배터리 기반 배정 / 충전 (작업 후 최소 잔량 %, 충전 이동 / 해제 기준 %,
+    # 이력 부족 시 방전 속도 %/h, 방전 추정 구간 초, 충전 핀 이름 접두어)
+    BATTERY_RESERVE: float = 25.0
+    BATTERY_CHARGE_AT: float = 30.0
+    BATTERY_RESUME_AT: float = 90.0
+    BATTERY_DEFAULT_DRAIN: float = 20.0
+    BATTERY_TREND_WINDOW: float = 900.0
+    CHARGE_PIN_PREFIX: str = "CHARGE"
+
+    # 로봇 상태 기계 (정지 감지 지속 초 / 정지 판단 속도 m/s,
+    # 이동·복귀 제한 초, 도착·정지 감지 상태 체류 제한 초)
+    FSM_STALL_SECONDS: float = 15.0
+    FSM_STALL_SPEED: float = 0.01
+    FSM_MOVE_TIMEOUT: float = 300.0
+    FSM_DWELL_TIMEOUT: float = 600.0
+
     class Config:
         # 환경변수 파일
         env_file = ".env"
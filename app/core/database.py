@@ -1,6 +1,10 @@
+import time
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
 from app.core.config import settings
+from app.core.metrics import instrument_engine, db_commit_seconds
 
 # DB 접속 URL
 DB_URL = (
@@ -8,15 +12,92 @@ DB_URL = (
     f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset=utf8mb4"
 )
 
+# 비동기 드라이버 접속 URL (DB_ASYNC_URL 로 변경 가능, 예: sqlite+aiosqlite:///./wms.db)
+ASYNC_DB_URL = settings.DB_ASYNC_URL or (
+    f"mysql+asyncmy://{settings.DB_USER}:{settings.DB_PASSWORD}"
+    f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}?charset=utf8mb4"
+)
+
+
+# 연결 풀 설정 (sqlite 는 풀 크기 설정 미지원)
+def _pool_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_pre_ping": True,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+    }
+
+
 # SQLAlchemy 엔진
-engine = create_engine(DB_URL, pool_pre_ping=True)
+engine = create_engine(DB_URL, **_pool_options(DB_URL))
+
+# 쿼리 실행 시간 계측
+instrument_engine(engine)
+
+
+# 커밋 시간을 계측하는 세션 클래스
+class TimedSession(Session):
+    def commit(self):
+        start = time.perf_counter()
+        try:
+            super().commit()
+        finally:
+            db_commit_seconds.observe(time.perf_counter() - start)
+
 
 # DB 세션 팩토리
 SessionLocal = sessionmaker(
+    class_=TimedSession,
     autocommit=False,
     autoflush=False,
     bind=engine
 )
 
+# 비동기 엔진 / 세션 팩토리 (DB_ASYNC 설정 시, asyncmy 또는 aiomysql / aiosqlite 드라이버 필요)
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    async_engine = create_async_engine(ASYNC_DB_URL, **_pool_options(ASYNC_DB_URL))
+    instrument_engine(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False, autoflush=False)
+
+
+# 동기 세션을 AsyncSession 과 같은 방식(await execute / scalar)으로 사용하는 어댑터
+# - 비동기 엔진 미사용 시 읽기 라우터용, 쿼리는 스레드풀에서 실행 후 결과를 메모리에 적재
+class ThreadpoolSession:
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def execute(self, statement):
+        frozen = await run_in_threadpool(lambda: self.session.execute(statement).freeze())
+        return frozen()
+
+    async def scalar(self, statement):
+        return await run_in_threadpool(self.session.scalar, statement)
+
+    async def close(self):
+        await run_in_threadpool(self.session.close)
+
+
+# 읽기 라우터용 비동기 세션 의존성
+# - DB_ASYNC: AsyncSession (DB 대기 중 스레드를 점유하지 않음)
+# - 그 외: 동기 세션 어댑터 (기존과 같이 스레드풀에서 실행)
+# - 지연 로딩은 사용 불가 → 관계는 joinedload 등으로 함께 조회
+async def get_async_db():
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+
+    db = ThreadpoolSession(SessionLocal())
+    try:
+        yield db
+    finally:
+        await db.close()
+
 # ORM 베이스 클래스
 Base = declarative_base()
\ No newline at end of file
@@ -0,0 +1,51 @@
+import numpy as np
+
+from app.core.telemetry.ring_buffer import telemetry_store
+
+# 충전 판단: 직전 샘플 대비 이 이상 오르면 충전 구간으로 간주 (%)
+CHARGE_JUMP = 0.5
+
+
+# 배터리 이력 → 방전 속도 (%/s, 추정 불가 시 None)
+# - rows: (t, percentage, voltage) 시간순 배열 (텔레메트리 링 버퍼 형식)
+# - 마지막 충전 이후, 최근 window 초 구간의 최소제곱 기울기
+# - 샘플 min_samples 개 / 구간 min_span 초 미만이면 추정 불가
+def discharge_rate(rows: np.ndarray, window: float, min_span: float = 60.0, min_samples: int = 10) -> float | None:
+    if len(rows) < min_samples:
+        return None
+
+    t, pct = rows[:, 0], rows[:, 1]
+    start = int(np.searchsorted(t, t[-1] - window, side="left"))
+
+    rises = np.flatnonzero(np.diff(pct[start:]) > CHARGE_JUMP)
+    if len(rises):
+        start += int(rises[-1]) + 1
+
+    t, pct = t[start:], pct[start:]
+    if len(t) < min_samples or t[-1] - t[0] < min_span:
+        return None
+
+    tc = t - t.mean()
+    slope = float(np.dot(tc, pct - pct.mean()) / np.dot(tc, tc))
+    return max(-slope, 0.0)
+
+
+# 로봇별 방전 속도 추정 (텔레메트리 이력 기준, 새 샘플이 있을 때만 재계산)
+class BatteryMonitor:
+    def __init__(self, window: float, default_rate: float):
+        self.window = window
+        self.default_rate = default_rate  # %/s (이력 부족 시)
+        self._cache: dict[str, tuple[float, float | None]] = {}
+
+    # 방전 속도 (%/s) + 추정 여부
+    def rate(self, robot: str) -> tuple[float, bool]:
+        rows = telemetry_store.array(robot, "battery")
+        last = float(rows[-1, 0]) if len(rows) else 0.0
+
+        cached = self._cache.get(robot)
+        if cached is None or cached[0] != last:
+            cached = self._cache[robot] = (last, discharge_rate(rows, self.window))
+
+        if cached[1] is None:
+            return self.default_rate, False
+        return cached[1], True
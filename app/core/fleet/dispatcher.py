@@ -0,0 +1,453 @@
+import json
+import math
+import threading
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.fleet.battery import BatteryMonitor
+from app.core.fleet.scoring import DEFAULT_WEIGHTS, robot_arrays, assign_jobs
+from app.core.fleet.state_machine import robot_fsm, LABELS, IDLE, RETURNING, ARRIVED
+from app.core.maps.occupancy import parse_coords
+from app.core.maps.travel import travel_matrix
+from app.models.pin_model import Pin
+from app.models.stock_model import Stock
+from app.schemas.log_schema import LogCreate
+from app.crud import log_crud
+from app.websocket.manager import ws_manager, log_move_start, apply_stock_move, start_return, now
+from app.websocket.state_store import state_store
+from app.services.batch_order_service import batch_runner
+
+# 배정기가 마지막 작업을 확인 처리한 로봇만 바로 새 작업을 받을 수 있는 상태
+# (수동 이동 / 배치 정차의 도착 = 확인 대기 중이므로 대기중이 될 때까지 배정 보류)
+RELEASED_STATES = (ARRIVED, RETURNING)
+
+# 충전 핀 목록 재조회 주기 (초)
+DOCK_REFRESH = 5.0
+
+
+# 재고 이동 목록 → 작업 목록 (DB에서 재고 / 핀 조회)
+def build_jobs(db: Session, moves: list) -> list[dict]:
+    jobs = []
+    for move in moves:
+        stock = db.query(Stock).filter(Stock.id == move.stock_id).first()
+        if not stock:
+            raise ValueError(f"재고를 찾을 수 없습니다: {move.stock_id}")
+        pin = stock.pin
+        if not pin:
+            raise ValueError(f"재고 '{stock.name}' 의 핀이 없습니다.")
+        jobs.append({
+            "id": uuid.uuid4().hex[:8],
+            "stock_id": stock.id,
+            "stock_name": stock.name,
+            "amount": move.amount,
+            "mode": move.mode,
+            "pin_id": pin.id,
+            "pin_name": pin.name,
+            "x": pin.x,
+            "y": pin.y,
+            "created": time.time(),
+        })
+    return jobs
+
+
+# 다중 로봇 작업 배정기 (ROS 소유 워커에서 주기 실행)
+# - 대기 작업 전체를 매 주기 재배정 (로봇 상태 / 위치 / 배터리 변화 반영)
+# - 진행 중 작업이 없고 대기 상태인 로봇은 배정 목록의 첫 작업 즉시 시작
+#   (도착 / 복귀 중 로봇은 배정기가 마지막 작업을 확인 처리한 경우만, 배치 실행 로봇은 제외)
+# - 작업 완료(확인) 시 같은 로봇의 다음 작업으로 바로 이동, 없으면 WAIT 복귀
+# - 배터리: 로봇별 방전 속도(텔레메트리 이력)로 작업 완료 + 충전 핀 이동 후 잔량 예측,
+#   reserve 미만이 될 작업은 배정하지 않음
+# - 충전: 작업 없는 로봇이 charge_at 이하면 빈 충전 핀 중 가장 오래 쉰 핀으로 보냄 (핀 순환),
+#   resume_at 이상이 되면 충전 해제 후 다시 배정 대상
+# - 다른 워커의 작업 등록 / 취소 / 완료 요청은 fleet 채널로 소유 워커에 전달,
+#   배정 상태는 fleet 채널로 복제 + fleet_status 브로드캐스트 (변경 시)
+class FleetDispatcher:
+    def __init__(self, interval: float, weights: dict, charge_at: float, resume_at: float, dock_prefix: str):
+        self.interval = interval
+        self.weights = weights
+        self.charge_at = charge_at
+        self.resume_at = resume_at
+        self.dock_prefix = dock_prefix
+        self.wait_coords = parse_coords(settings.WAIT_COORDS) or (0.0, 0.0)
+        self.battery = BatteryMonitor(settings.BATTERY_TREND_WINDOW, settings.BATTERY_DEFAULT_DRAIN / 3600)
+
+        self._lock = threading.RLock()
+        self._pending: dict[str, dict] = {}  # 등록 순서 유지
+        self._running: dict[str, dict] = {}  # 로봇 이름 → 진행 중 작업
+        self._plan: dict[str, list[str]] = {}  # 로봇 이름 → 배정 작업 id
+        self._charging: dict[str, str] = {}  # 로봇 이름 → 충전 핀 이름
+        self._dock_used: dict[str, float] = {}  # 충전 핀 → 마지막 배정 시각
+        self._released: set[str] = set()  # 마지막 작업이 배정기 작업이고 확인까지 끝난 로봇
+        self._commanding: str | None = None  # 이동 명령 전송 중인 로봇 (상태 기계 이벤트 구분용)
+        self._docks: list[dict] = []
+        self._docks_at = 0.0
+        self._status: dict = {"robots": {}, "pending": [], "charging": {}}
+        self._status_text = ""
+        self.last_tick_ms = 0.0
+
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # ─────────────────────────────────────────
+    # 조회 / 요청 (소유 워커가 아니면 전달)
+    # ─────────────────────────────────────────
+
+    def status(self) -> dict:
+        return {**self._status, "tick_ms": round(self.last_tick_ms, 2)}
+
+    # 해당 로봇이 배정기 작업 진행 중인지 (복제된 상태 기준)
+    def is_running(self, robot_name: str | None) -> bool:
+        robot = self._status["robots"].get(robot_name) or {}
+        return robot.get("running") is not None
+
+    def submit(self, jobs: list[dict]):
+        if not broker.is_owner:
+            broker.publish("fleet", {"op": "submit", "jobs": jobs}, local=False)
+            return
+        with self._lock:
+            for job in jobs:
+                self._pending[job["id"]] = job
+            self._tick()
+
+    def cancel(self, job_id: str):
+        if not broker.is_owner:
+            broker.publish("fleet", {"op": "cancel", "job_id": job_id}, local=False)
+            return
+        with self._lock:
+            if self._pending.pop(job_id, None):
+                self._tick()
+
+    # 확인 버튼 → 진행 중 작업 반영 (배정기 작업이 아니면 False)
+    def complete(self, robot_name: str | None) -> bool:
+        if not self.is_running(robot_name):
+            return False
+        if not broker.is_owner:
+            broker.publish("fleet", {"op": "complete", "robot_name": robot_name}, local=False)
+            return True
+
+        with self._lock:
+            job = self._running.pop(robot_name, None)
+            if job is None:
+                return False
+            try:
+                apply_stock_move(job["stock_id"], job["amount"], job["mode"], robot_name)
+            except Exception as e:
+                print(f"[FLEET] ⚠️ 재고 반영 실패 (stock_id={job['stock_id']}):", e)
+            self._released.add(robot_name)
+
+            # 다음 작업 또는 충전 바로 시작, 없으면 0.3초 후 복귀
+            self._tick()
+            if robot_name not in self._running and robot_name not in self._charging:
+                threading.Timer(0.3, start_return, args=(robot_name,)).start()
+        return True
+
+    # 상태 기계 이벤트: 배정기 외 이동 명령(수동 / 배치)을 받은 로봇은 배정기 소유 해제
+    def _on_fsm_event(self, event: dict):
+        if event["event"] == "move" and event["robot_name"] != self._commanding:
+            self._released.discard(event["robot_name"])
+
+    # 새 작업 / 충전 이동을 보낼 수 있는 로봇
+    # - 배정기 작업 진행 중이 아니고 대기중이거나,
+    # - 배정기가 마지막 작업을 확인 처리한 뒤 도착 / 복귀 중 (수동 작업 확인 대기 로봇 제외)
+    def _free(self, robot: dict) -> bool:
+        name = robot["name"]
+        if name in self._running:
+            return False
+        if robot["code"] == IDLE:
+            return True
+        return robot["code"] in RELEASED_STATES and name in self._released
+
+    def _on_message(self, message: dict, remote: bool):
+        if not remote:
+            return
+        op = message.get("op")
+        if op == "status":
+            self._status = message.get("status") or {"robots": {}, "pending": [], "charging": {}}
+        elif broker.is_owner and op == "submit":
+            self.submit(message.get("jobs") or [])
+        elif broker.is_owner and op == "cancel":
+            self.cancel(message.get("job_id"))
+        elif broker.is_owner and op == "complete":
+            self.complete(message.get("robot_name"))
+
+    # ─────────────────────────────────────────
+    # 주기 실행
+    # ─────────────────────────────────────────
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            if not broker.is_owner:
+                continue
+            try:
+                with self._lock:
+                    self._tick()
+            except Exception as e:
+                print("[FLEET] ⚠️ 작업 배정 오류:", e)
+
+    # 작업 핀 간 주행 거리 행렬 (거리 행렬에 없는 핀은 inf)
+    def _job_distances(self, jobs: list[dict]) -> np.ndarray | None:
+        nodes, matrix = travel_matrix.snapshot()
+        if not nodes:
+            return None
+        pos = {n["key"]: i for i, n in enumerate(nodes)}
+        idx = np.array([pos.get(job["pin_id"], -1) for job in jobs], dtype=np.int64)
+        if (idx < 0).all():
+            return None
+        safe = np.where(idx < 0, 0, idx)
+        dist = matrix[np.ix_(safe, safe)].astype(np.float64)
+        dist[idx < 0, :] = math.inf
+        dist[:, idx < 0] = math.inf
+        return dist
+
+    # 충전 핀 목록 (이름이 dock_prefix 로 시작하고 좌표 있는 핀, DOCK_REFRESH 초 캐시)
+    def _dock_list(self) -> list[dict]:
+        if time.time() - self._docks_at < DOCK_REFRESH:
+            return self._docks
+        db = SessionLocal()
+        try:
+            pins = (
+                db.query(Pin.name, Pin.x, Pin.y)
+                .filter(Pin.name.like(f"{self.dock_prefix}%"), Pin.x.isnot(None), Pin.y.isnot(None))
+                .order_by(Pin.name)
+                .all()
+            )
+        finally:
+            db.close()
+        self._docks = [{"name": name, "x": x, "y": y} for name, x, y in pins]
+        self._docks_at = time.time()
+        return self._docks
+
+    # 작업 핀 → 가장 가까운 충전 핀 이동 시간 (초, 충전 핀 없으면 0)
+    def _job_dock(self, job_xy: np.ndarray) -> np.ndarray:
+        docks = self._dock_list()
+        if not docks:
+            return np.zeros(len(job_xy), dtype=np.float64)
+        dock_xy = np.array([(d["x"], d["y"]) for d in docks], dtype=np.float64)
+        dist = np.hypot(job_xy[:, None, 0] - dock_xy[None, :, 0], job_xy[:, None, 1] - dock_xy[None, :, 1])
+        return dist.min(axis=1) * self.weights["detour"] / self.weights["speed"]
+
+    # 로봇 스냅샷 → 배정 입력 (진행 중 작업은 남은 이동 + 작업 시간만큼 늦게 배정 가능)
+    def _robots(self) -> list[dict]:
+        w = self.weights
+        robots = []
+        for name, robot in list(state_store.robots.items()):
+            # 배치 주문 실행 중인 로봇은 배정 / 충전 대상에서 제외
+            if name == batch_runner.robot_name:
+                continue
+
+            pose = robot.get("pose") or {}
+            x, y = pose.get("x"), pose.get("y")
+            if x is None or y is None:
+                x, y = self.wait_coords
+
+            ready, queue = 0.0, 0
+            job = self._running.get(name)
+            if job:
+                jx, jy = self._job_xy(job)
+                ready = math.hypot(jx - x, jy - y) * w["detour"] / w["speed"] + w["service"]
+                x, y, queue = jx, jy, 1
+
+            robots.append({
+                "name": name,
+                "connected": robot.get("connected"),
+                "state": LABELS[robot_fsm.state(name)],
+                "code": robot_fsm.state(name),
+                "battery": robot.get("battery"),
+                "drain": self.battery.rate(name)[0],
+                "charging": name in self._charging,
+                "x": x,
+                "y": y,
+                "ready": ready,
+                "queue": queue,
+            })
+        return robots
+
+    # 작업 좌표 (핀 좌표 없으면 대기 위치)
+    def _job_xy(self, job: dict) -> tuple[float, float]:
+        if job.get("x") is None or job.get("y") is None:
+            return self.wait_coords
+        return job["x"], job["y"]
+
+    # 재배정 + 대기 로봇 작업 시작 (lock 보유 상태에서 호출)
+    def _tick(self):
+        started = time.perf_counter()
+        jobs = list(self._pending.values())
+        robots = self._robots()
+        self._update_charging(robots)
+
+        # 배정 대상: 새 작업 가능 로봇 + 배정기 작업 진행 중 로봇 (수동 작업 확인 대기 로봇 제외)
+        robots = [r for r in robots if r["name"] in self._running or self._free(r)]
+
+        plan: dict[str, list[str]] = {}
+        if jobs and robots:
+            xy, ready, queue, base, level, drain = robot_arrays(robots, self.weights)
+            job_xy = np.array([self._job_xy(job) for job in jobs], dtype=np.float64)
+            owner = assign_jobs(
+                xy, ready, queue, base, job_xy, self._job_distances(jobs), self.weights,
+                level, drain, self._job_dock(job_xy),
+            )
+            for job, r in zip(jobs, owner):
+                if r >= 0:
+                    plan.setdefault(robots[r]["name"], []).append(job["id"])
+
+        for robot in robots:
+            name = robot["name"]
+            if not plan.get(name) or not self._free(robot):
+                continue
+            job = self._pending.pop(plan[name].pop(0))
+            self._start(name, job)
+
+        self._plan = plan
+        self.last_tick_ms = (time.perf_counter() - started) * 1000
+        self._publish()
+
+    # 충전 해제 (resume_at 이상) / 충전 핀 배정 (새 작업 가능 로봇 중 charge_at 이하, 배터리 낮은 순)
+    # - 수동 이동 / 배치 정차 확인 대기 로봇은 확인 후 대기중이 될 때까지 충전 이동 보류
+    def _update_charging(self, robots: list[dict]):
+        for robot in robots:
+            name = robot["name"]
+            if name in self._charging and (robot["battery"] or 0) >= self.resume_at:
+                dock = self._charging.pop(name)
+                robot["charging"] = False
+                robot["state"], robot["code"] = LABELS[IDLE], IDLE
+                robot_fsm.on_charged(name)
+                self._charge_log(name, dock, "충전 완료")
+
+        low = sorted(
+            (
+                r for r in robots
+                if r["connected"] and r["battery"] is not None and r["battery"] <= self.charge_at
+                and r["name"] not in self._charging and self._free(r)
+            ),
+            key=lambda r: r["battery"],
+        )
+        if not low:
+            return
+
+        busy = set(self._charging.values())
+        free = [d for d in self._dock_list() if d["name"] not in busy]
+        free.sort(key=lambda d: self._dock_used.get(d["name"], 0.0))
+        for robot, dock in zip(low, free):
+            self._charging[robot["name"]] = dock["name"]
+            self._dock_used[dock["name"]] = time.time()
+            robot["charging"] = True
+
+            from app.core.ros.ros_manager import ros_manager
+            ros_manager.send_ui_command(dock["name"], robot["name"])
+            self._charge_log(robot["name"], dock["name"], "충전 이동")
+
+    # 충전 로그 (상태 브로드캐스트는 상태 기계에서 처리)
+    def _charge_log(self, robot_name: str, dock: str, action: str):
+        print(f"[FLEET] 🔋 {action} → {robot_name} ({dock})")
+        db = SessionLocal()
+        try:
+            log_crud.create_log(db, LogCreate(
+                robot_name=robot_name,
+                pin_name=dock,
+                category_name="-",
+                stock_name="-",
+                stock_id=None,
+                quantity=0,
+                action=action,
+                timestamp=now(),
+            ))
+        finally:
+            db.close()
+
+    # 로봇별 배터리 / 방전 속도 / reserve 도달 예상 시간
+    def battery_report(self) -> dict:
+        reserve = self.weights["reserve"]
+        report = {}
+        for name, robot in list(state_store.robots.items()):
+            battery = robot.get("battery")
+            rate, estimated = self.battery.rate(name)
+            hours = None
+            if battery is not None and rate > 0:
+                hours = round(max(battery - reserve, 0.0) / rate / 3600, 2)
+            report[name] = {
+                "battery": battery,
+                "drain_per_hour": round(rate * 3600, 2),
+                "estimated": estimated,
+                "hours_to_reserve": hours,
+                "charging": self._status.get("charging", {}).get(name),
+            }
+        return report
+
+    # 로봇에 작업 시작 명령 (이동 명령 + 시작 로그)
+    def _start(self, robot_name: str, job: dict):
+        from app.core.ros.ros_manager import ros_manager
+
+        job = {**job, "robot_name": robot_name, "started": time.time()}
+        self._running[robot_name] = job
+
+        self._commanding = robot_name
+        try:
+            ros_manager.send_ui_command(job["pin_name"], robot_name)
+        finally:
+            self._commanding = None
+
+        db = SessionLocal()
+        try:
+            stock = db.query(Stock).filter(Stock.id == job["stock_id"]).first()
+            if stock:
+                log_move_start(db, stock, job["amount"], job["mode"], robot_name)
+        finally:
+            db.close()
+
+        print(f"[FLEET] 작업 시작 → {robot_name}: {job['stock_name']} {job['amount']}개 → {job['pin_name']}")
+
+    # 배정 상태 변경 시 복제 + 브로드캐스트
+    def _publish(self):
+        names = set(self._running) | set(self._plan)
+        status = {
+            "robots": {
+                name: {"running": self._running.get(name), "plan": self._plan.get(name, [])}
+                for name in sorted(names)
+            },
+            "pending": list(self._pending.values()),
+            "charging": dict(self._charging),
+        }
+        text = json.dumps(status, sort_keys=True, ensure_ascii=False)
+        if text == self._status_text:
+            return
+        self._status, self._status_text = status, text
+        broker.publish("fleet", {"op": "status", "status": status}, local=False)
+        ws_manager.broadcast({"type": "fleet_status", "payload": status})
+
+
+# 전역 작업 배정기
+fleet_dispatcher = FleetDispatcher(
+    settings.DISPATCH_INTERVAL,
+    {
+        **DEFAULT_WEIGHTS,
+        "min_battery": settings.DISPATCH_MIN_BATTERY,
+        "service": settings.DISPATCH_SERVICE_TIME,
+        "speed": settings.ROBOT_NOMINAL_SPEED,
+        "reserve": settings.BATTERY_RESERVE,
+    },
+    charge_at=settings.BATTERY_CHARGE_AT,
+    resume_at=settings.BATTERY_RESUME_AT,
+    dock_prefix=settings.CHARGE_PIN_PREFIX,
+)
+broker.subscribe("fleet", fleet_dispatcher._on_message)
+robot_fsm.on_event(fleet_dispatcher._on_fsm_event)
@@ -0,0 +1,136 @@
+import math
+
+import numpy as np
+
+# 로봇 작업 배정 (순수 함수, 다중 로봇 × 작업 대기열)
+#
+# 비용 (초) = 배정 가능 시각 + 이동 시간 + 대기 작업 수 × queue
+#            + (1 - 배터리) × battery + 상태 비용
+# - 작업은 대기열 순서(먼저 들어온 작업 우선)로 1건씩 최소 비용 로봇에 배정
+# - 배정된 로봇은 그 작업 핀 위치 / 작업 완료 예상 시각 기준으로 다음 작업 비용 계산
+#   (이어지는 작업 간 거리는 핀 간 주행 거리 행렬, 첫 이동은 직선 거리 × detour)
+# - 미연결 / 충전 중 / 배터리 부족 / 배정 불가 상태 로봇은 제외
+# - 배터리 예측: 작업 완료 + 가장 가까운 충전 핀 이동까지 방전량을 빼고도
+#   reserve(%) 이상 남는 로봇에만 배정 (방전 속도 = 로봇별 추정값, %/s)
+
+# 상태별 추가 비용 (초, 상태 기계 표시 문자열 기준), 목록에 없는 상태는 배정 불가
+STATE_COST = {
+    None: 0.0,
+    "대기중": 0.0,
+    "복귀중": 2.0,
+    "도착": 5.0,
+    "이동중": 5.0,
+}
+
+# 기본 가중치
+DEFAULT_WEIGHTS = {
+    "queue": 5.0,         # 대기 작업 1건당 (초)
+    "battery": 60.0,      # 배터리 0% 일 때 (초, 선형)
+    "min_battery": 20.0,  # 배정 최소 배터리 (%)
+    "reserve": 25.0,      # 작업 + 충전 핀 이동 후 남아야 할 배터리 (%)
+    "detour": 1.3,        # 직선 거리 → 주행 거리 보정
+    "service": 10.0,      # 정차 지점 작업 시간 (초)
+    "speed": 0.2,         # 주행 속도 (m/s)
+}
+
+
+# 로봇 목록 → 배정 입력 배열
+# robots: [{"connected", "state", "battery", "drain", "charging", "x", "y", "ready", "queue"}]
+# - ready: 진행 중 작업 완료까지 남은 시간 (초), queue: 이미 맡은 작업 수
+# - drain: 방전 속도 (%/s), charging: 충전 핀 배정 여부
+# - 배터리 / 방전 속도 / 좌표 없으면 100% / 0 / (0, 0)
+# → (좌표, ready, queue, 고정 비용, 배터리, 방전 속도)
+def robot_arrays(robots: list[dict], weights: dict = DEFAULT_WEIGHTS) -> tuple[np.ndarray, ...]:
+    n = len(robots)
+    xy = np.zeros((n, 2), dtype=np.float64)
+    ready = np.zeros(n, dtype=np.float64)
+    queue = np.zeros(n, dtype=np.float64)
+    base = np.zeros(n, dtype=np.float64)
+    level = np.zeros(n, dtype=np.float64)
+    drain = np.zeros(n, dtype=np.float64)
+
+    for i, r in enumerate(robots):
+        xy[i] = (r.get("x") or 0.0, r.get("y") or 0.0)
+        ready[i] = r.get("ready") or 0.0
+        queue[i] = r.get("queue") or 0
+        battery = r.get("battery")
+        battery = 100.0 if battery is None else float(battery)
+        level[i] = battery
+        drain[i] = r.get("drain") or 0.0
+
+        state_cost = STATE_COST.get(r.get("state"))
+        if not r.get("connected") or r.get("charging") or state_cost is None or battery < weights["min_battery"]:
+            base[i] = math.inf
+        else:
+            base[i] = state_cost + (1.0 - battery / 100.0) * weights["battery"]
+    return xy, ready, queue, base, level, drain
+
+
+# 작업별 배정 로봇 번호 (배정 불가 -1)
+# - job_xy: (J, 2) 작업 핀 좌표
+# - job_dist: (J, J) 작업 핀 간 주행 거리 (m, 모르면 inf → 직선 거리 × detour)
+# - robot_battery / robot_drain: 배터리 (%) / 방전 속도 (%/s), 없으면 배터리 예측 생략
+# - job_dock: (J,) 작업 핀 → 가장 가까운 충전 핀 이동 시간 (초)
+def assign_jobs(
+    robot_xy: np.ndarray,
+    robot_ready: np.ndarray,
+    robot_queue: np.ndarray,
+    robot_base: np.ndarray,
+    job_xy: np.ndarray,
+    job_dist: np.ndarray | None = None,
+    weights: dict = DEFAULT_WEIGHTS,
+    robot_battery: np.ndarray | None = None,
+    robot_drain: np.ndarray | None = None,
+    job_dock: np.ndarray | None = None,
+) -> np.ndarray:
+    jobs = len(job_xy)
+    out = np.full(jobs, -1, dtype=np.int64)
+    if len(robot_xy) == 0 or jobs == 0 or not np.isfinite(robot_base).any():
+        return out
+
+    pos = np.array(robot_xy, dtype=np.float64)
+    ready = np.array(robot_ready, dtype=np.float64)
+    fixed = robot_base + robot_queue * weights["queue"]
+    last = np.full(len(pos), -1, dtype=np.int64)
+
+    # 마지막 행 inf 추가 → 배정 작업 없는 로봇(last = -1)은 inf 조회
+    if job_dist is not None:
+        job_dist = np.vstack([job_dist, np.full((1, jobs), np.inf)])
+    detour, speed, service, per_job = weights["detour"], weights["speed"], weights["service"], weights["queue"]
+
+    # 배터리 예측: 남은 배터리 - reserve = 쓸 수 있는 시간 (초, 방전 없으면 inf)
+    budget = None
+    if robot_battery is not None and robot_drain is not None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            budget = np.where(
+                robot_drain > 0,
+                (robot_battery - weights["reserve"]) / robot_drain,
+                np.where(robot_battery >= weights["reserve"], math.inf, -math.inf),
+            )
+        if job_dock is None:
+            job_dock = np.zeros(jobs, dtype=np.float64)
+
+    for j in range(jobs):
+        jx, jy = job_xy[j]
+        dist = np.hypot(pos[:, 0] - jx, pos[:, 1] - jy) * detour
+
+        # 이미 작업을 배정받은 로봇: 직전 작업 핀 → 이번 작업 핀 주행 거리
+        if job_dist is not None:
+            known = job_dist[last, j]
+            dist = np.where(np.isfinite(known), known, dist)
+
+        eta = ready + dist / speed
+        cost = eta + fixed
+        if budget is not None:
+            cost = np.where(eta + service + job_dock[j] <= budget, cost, math.inf)
+        r = int(np.argmin(cost))
+        if not math.isfinite(cost[r]):
+            continue
+
+        out[j] = r
+        ready[r] = eta[r] + service
+        pos[r] = (jx, jy)
+        last[r] = j
+        fixed[r] += per_job
+
+    return out
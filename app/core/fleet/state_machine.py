@@ -0,0 +1,317 @@
+import queue
+import threading
+import time
+
+from app.core.broker import broker
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.metrics import robot_state_seconds, robot_events_total, robot_fsm_dropped_writes_total
+from app.schemas.log_schema import LogCreate
+from app.crud import log_crud
+from app.websocket.manager import ws_manager, now
+
+# 로봇 상태 코드
+IDLE = "IDLE"
+MOVING = "MOVING"
+ARRIVED = "ARRIVED"
+RETURNING = "RETURNING"
+CHARGING = "CHARGING"
+STALLED = "STALLED"
+ESTOP = "ESTOP"
+
+# 상태 코드 → UI 표시 문자열 (robot_status.state 기존 값 유지)
+LABELS = {
+    IDLE: "대기중",
+    MOVING: "이동중",
+    ARRIVED: "도착",
+    RETURNING: "복귀중",
+    CHARGING: "충전중",
+    STALLED: "정지 감지",
+    ESTOP: "비상정지",
+}
+
+# 정지 판단 각속도 (rad/s, 제자리 회전은 이동으로 간주)
+STALL_ANGULAR = 0.05
+
+# odom 수신이 끊긴 것으로 보는 시간 (초, 끊긴 로봇은 정지 감지 생략)
+ODOM_STALE = 2.0
+
+
+# 로봇별 서버 상태 기계 (ROS 소유 워커)
+# - 입력: 이동 명령(send_ui_command), /nav ARRIVED:<핀>, odom 속도, 충전 해제, 비상정지
+# - 전이마다 robot_status(표시 문자열 + 코드) / robot_event(이벤트, 이전·다음 상태, 체류 시간) 브로드캐스트
+# - 도착 / 복귀 완료 / 정지 감지 / 시간 초과는 서버에서 로그 기록 (브라우저 왕복 불필요)
+# - 이동·복귀 중 FSM_STALL_SECONDS 동안 odom 속도가 없으면 STALLED, 다시 움직이면 이전 상태로 복귀
+# - 상태별 제한 시간 초과 시 timeout 이벤트 1회 (상태 유지)
+# - 상태는 fsm 채널로 다른 워커에 복제, on_event 콜백으로 전이 이벤트 구독
+# - DB 기록(로그 / 콜백의 기록 작업)은 defer() 큐 → 전용 기록 스레드에서 순서대로 실행
+#   (ROS 콜백 스레드 / lock 보유 구간에서 DB 대기 없음)
+class RobotStateMachine:
+    def __init__(self, stall_seconds: float, stall_speed: float, timeouts: dict, dock_prefix: str, queue_size: int = 10_000):
+        self.stall_seconds = stall_seconds
+        self.stall_speed = stall_speed
+        self.timeouts = timeouts
+        self.dock_prefix = dock_prefix
+
+        self._lock = threading.RLock()
+        self._robots: dict[str, dict] = {}
+        self._callbacks = []
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._writes: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._writer: threading.Thread | None = None
+
+    # ─────────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────────
+
+    def state(self, robot_name: str) -> str:
+        return (self._robots.get(robot_name) or {}).get("state", IDLE)
+
+    def snapshot(self) -> dict:
+        t = time.time()
+        return {
+            name: {**r, "label": LABELS[r["state"]], "dwell": round(t - r["since"], 1)}
+            for name, r in list(self._robots.items())
+        }
+
+    # 전이 이벤트 구독 callback(event: dict)
+    # - lock 보유 상태에서 호출되므로 DB 기록 등 블로킹 작업은 defer() 로 넘길 것
+    def on_event(self, callback):
+        self._callbacks.append(callback)
+
+    # DB 기록 작업 예약 (블로킹 없음, 큐 포화 시 버림)
+    def defer(self, fn, *args):
+        try:
+            self._writes.put_nowait((fn, args))
+        except queue.Full:
+            robot_fsm_dropped_writes_total.inc()
+
+    # ─────────────────────────────────────────
+    # 입력 이벤트
+    # ─────────────────────────────────────────
+
+    # 이동 명령 (WAIT → 복귀, 충전 핀 → 충전, 그 외 핀 → 이동)
+    def on_command(self, robot_name: str, command: str):
+        target = command.split(" ", 1)[1] if command.startswith("MOVE_TO_PIN ") else command
+        if target == "WAIT":
+            state, event = RETURNING, "return"
+        elif target.startswith(self.dock_prefix):
+            state, event = CHARGING, "charge"
+        else:
+            state, event = MOVING, "move"
+        with self._lock:
+            self._transition(robot_name, state, event, target=target)
+
+    # /nav 도착 신호
+    def on_arrived(self, robot_name: str, pin: str):
+        with self._lock:
+            robot = self._robot(robot_name)
+            if pin == "WAIT":
+                self._transition(robot_name, IDLE, "home", target=None)
+                self._log(robot_name, "-", "복귀 완료")
+            elif robot["state"] == CHARGING:
+                self._emit(robot_name, "docked", CHARGING, CHARGING, 0.0, pin)
+            else:
+                self._transition(robot_name, ARRIVED, "arrived", target=pin)
+                self._log(robot_name, pin, "도착")
+
+    # odom 속도 (고빈도, 움직임 시각만 갱신 / 정지 감지 상태면 재개)
+    def on_odom(self, robot_name: str, v: float, w: float):
+        robot = self._robots.get(robot_name)
+        if robot is None:
+            return
+        t = time.time()
+        robot["last_odom"] = t
+        if abs(v) < self.stall_speed and abs(w) < STALL_ANGULAR:
+            return
+        robot["last_motion"] = t
+        if robot["state"] == STALLED:
+            with self._lock:
+                if robot["state"] == STALLED:
+                    self._transition(robot_name, robot.get("resume") or MOVING, "resume")
+
+    # 충전 해제 (작업 배정기)
+    def on_charged(self, robot_name: str):
+        with self._lock:
+            self._transition(robot_name, IDLE, "charged", target=None)
+
+    # 클라이언트 보고 상태 (비상정지만 반영, 나머지는 서버 이벤트 기준)
+    def on_client_status(self, robot_name: str, label: str):
+        if label != LABELS[ESTOP]:
+            return
+        if not broker.is_owner:
+            broker.publish("fsm", {"op": "estop", "robot_name": robot_name}, local=False)
+            return
+        with self._lock:
+            self._transition(robot_name, ESTOP, "estop", target=None)
+
+    def _on_message(self, message: dict, remote: bool):
+        if not remote:
+            return
+        op = message.get("op")
+        if op == "robot":
+            self._robots[message["name"]] = message["record"]
+        elif op == "estop" and broker.is_owner:
+            self.on_client_status(message.get("robot_name"), LABELS[ESTOP])
+
+    # ─────────────────────────────────────────
+    # 정지 감지 / 시간 초과 (1초 주기)
+    # ─────────────────────────────────────────
+
+    def start(self):
+        if self._thread:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    # 점검 중단 + 남은 기록 작업 처리 후 종료
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self._writes.put(None)
+        self._writer.join(timeout=5)
+        self._writer = None
+
+    # 기록 스레드 본체 (예약 순서대로 실행)
+    def _write_loop(self):
+        while True:
+            item = self._writes.get()
+            if item is None:
+                return
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception as e:
+                print("[FSM] ⚠️ 기록 작업 오류:", e)
+
+    def _run(self):
+        while not self._stop.wait(1.0):
+            if not broker.is_owner:
+                continue
+            try:
+                self.check()
+            except Exception as e:
+                print("[FSM] ⚠️ 상태 점검 오류:", e)
+
+    def check(self, t: float | None = None):
+        t = time.time() if t is None else t
+        with self._lock:
+            for name, robot in list(self._robots.items()):
+                state = robot["state"]
+
+                # 이동 / 복귀 중 odom 정지 지속 → 정지 감지
+                if state in (MOVING, RETURNING) and t - robot.get("last_odom", 0.0) < ODOM_STALE:
+                    moved = max(robot.get("last_motion", 0.0), robot["since"])
+                    if t - moved >= self.stall_seconds:
+                        self._transition(name, STALLED, "stall", resume=state)
+                        self._log(name, robot.get("target") or "-", "정지 감지")
+                        continue
+
+                limit = self.timeouts.get(state)
+                if limit and not robot["timed_out"] and t - robot["since"] >= limit:
+                    robot["timed_out"] = True
+                    self._emit(name, "timeout", state, state, t - robot["since"], robot.get("target"))
+                    self._log(name, robot.get("target") or "-", f"시간 초과 ({LABELS[state]})")
+
+    # ─────────────────────────────────────────
+    # 전이 (lock 보유 상태에서 호출)
+    # ─────────────────────────────────────────
+
+    def _robot(self, name: str) -> dict:
+        robot = self._robots.get(name)
+        if robot is None:
+            robot = self._robots[name] = {
+                "state": IDLE,
+                "since": time.time(),
+                "target": None,
+                "resume": None,
+                "timed_out": False,
+                "last_motion": 0.0,
+                "last_odom": 0.0,
+            }
+        return robot
+
+    def _transition(self, name: str, state: str, event: str, **changes):
+        robot = self._robot(name)
+        t = time.time()
+        prev, dwell = robot["state"], t - robot["since"]
+
+        robot.update(changes)
+        if state != prev:
+            robot_state_seconds.observe(dwell, prev)
+            robot["state"], robot["since"], robot["timed_out"] = state, t, False
+            if state != STALLED:
+                robot["resume"] = None
+        self._emit(name, event, prev, state, dwell, robot.get("target"))
+
+    def _emit(self, name: str, event: str, prev: str, state: str, dwell: float, pin: str | None):
+        robot_events_total.inc(event)
+        record = self._robots[name]
+        broker.publish("fsm", {"op": "robot", "name": name, "record": dict(record)}, local=False)
+
+        if state != prev:
+            ws_manager.broadcast({
+                "type": "robot_status",
+                "payload": {"state": LABELS[state], "name": name, "code": state},
+            })
+
+        payload = {
+            "robot_name": name,
+            "event": event,
+            "from": prev,
+            "to": state,
+            "pin": pin,
+            "dwell": round(dwell, 3),
+            "ts": time.time(),
+        }
+        ws_manager.broadcast({"type": "robot_event", "payload": payload})
+        print(f"[FSM] {name}: {event} ({prev} → {state}, {dwell:.1f}s)")
+
+        for callback in self._callbacks:
+            try:
+                callback(payload)
+            except Exception as e:
+                print("[FSM] ⚠️ 이벤트 콜백 오류:", e)
+
+    def _log(self, name: str, pin: str, action: str):
+        self.defer(self._write_log, name, pin, action, now())
+
+    def _write_log(self, name: str, pin: str, action: str, timestamp):
+        db = SessionLocal()
+        try:
+            log_crud.create_log(db, LogCreate(
+                robot_name=name,
+                pin_name=pin,
+                category_name="-",
+                stock_name="-",
+                stock_id=None,
+                quantity=0,
+                action=action,
+                timestamp=timestamp,
+            ))
+        except Exception as e:
+            print("[FSM] ⚠️ 로그 저장 실패:", e)
+        finally:
+            db.close()
+
+
+# 전역 로봇 상태 기계
+robot_fsm = RobotStateMachine(
+    stall_seconds=settings.FSM_STALL_SECONDS,
+    stall_speed=settings.FSM_STALL_SPEED,
+    timeouts={
+        MOVING: settings.FSM_MOVE_TIMEOUT,
+        RETURNING: settings.FSM_MOVE_TIMEOUT,
+        ARRIVED: settings.FSM_DWELL_TIMEOUT,
+        STALLED: settings.FSM_DWELL_TIMEOUT,
+    },
+    dock_prefix=settings.CHARGE_PIN_PREFIX,
+)
+broker.subscribe("fsm", robot_fsm._on_message)
@@ -0,0 +1,84 @@
+import json
+import hashlib
+import threading
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.broker import broker
+from app.core.metrics import list_cache_total
+
+# 목록 응답별 의존 리소스 (재고 목록은 카테고리/핀 이름을 포함하므로 함께 무효화)
+DEPENDS = {
+    "stocks": ("stocks", "categories", "pins"),
+    "categories": ("categories",),
+    "pins": ("pins",),
+}
+
+
+# 목록 GET 응답 캐시 (직렬화된 JSON 본문 + ETag)
+# - 리소스별 버전 번호를 쓰기 경로에서 올려 무효화
+# - 캐시 항목은 생성 시점의 의존 버전을 기록, 버전이 다르면 재조회
+# - ETag 는 본문 해시 → 워커가 달라도 같은 내용이면 같은 ETag
+# - 무효화는 브로커 "cache" 채널로 다른 워커에 복제
+class ListCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = {name: 0 for name in DEPENDS}
+        self._entries: dict[str, tuple] = {}  # name → (버전, 본문, ETag)
+
+    def _key(self, name: str) -> tuple:
+        return tuple(self._versions[dep] for dep in DEPENDS[name])
+
+    # 쓰기 경로에서 커밋 후 호출
+    def invalidate(self, *names: str, replicate: bool = True):
+        with self._lock:
+            for name in names:
+                self._versions[name] += 1
+        if replicate:
+            broker.publish("cache", {"names": list(names)}, local=False)
+
+    def _on_remote(self, message: dict, remote: bool):
+        if remote:
+            self.invalidate(*(n for n in message.get("names", ()) if n in DEPENDS), replicate=False)
+
+    # 캐시 조회, 없으면 await build() 결과를 직렬화해 저장 (build: 비동기 DB 조회)
+    async def get(self, name: str, build) -> tuple[bytes, str]:
+        # 조회 전 버전 기록 (조회 중 무효화되면 저장하지 않음)
+        key = self._key(name)
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            list_cache_total.inc(name, "hit")
+            return entry[1], entry[2]
+
+        list_cache_total.inc(name, "miss")
+        body = json.dumps(
+            jsonable_encoder(await build()),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+        with self._lock:
+            if self._key(name) == key:
+                self._entries[name] = (key, body, etag)
+        return body, etag
+
+    # ETag / If-None-Match 처리된 응답 (변경 없으면 304)
+    async def respond(self, request: Request, name: str, build) -> Response:
+        body, etag = await self.get(name, build)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+            if etag in tags or "*" in tags:
+                list_cache_total.inc(name, "not_modified")
+                return Response(status_code=304, headers=headers)
+
+        return Response(content=body, media_type="application/json", headers=headers)
+
+
+# 전역 목록 캐시
+list_cache = ListCache()
+broker.subscribe("cache", list_cache._on_remote)
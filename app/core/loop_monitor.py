@@ -0,0 +1,175 @@
+import os
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from collections import deque
+
+from app.core.config import settings
+from app.core.metrics import loop_lag_seconds, loop_blocked_total
+
+# 앱 소스 경로 (블로킹 호출 위치 판별용)
+_APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 표준 라이브러리 / 설치 패키지 경로 (호출 위치 후보에서 제외)
+_LIB_DIRS = tuple({
+    os.path.dirname(os.__file__),
+    sys.prefix,
+    sys.base_prefix,
+})
+
+
+# asyncio 이벤트 루프 지연 측정 + 블로킹 호출 위치 샘플링
+class LoopMonitor:
+    def __init__(
+        self,
+        interval: float = 0.1,
+        block_threshold: float = 0.25,
+        capture_stacks: bool = False,
+        max_samples: int = 50,
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.capture_stacks = capture_stacks
+
+        self._task: asyncio.Task | None = None
+        self._watchdog: threading.Thread | None = None
+        self._stop_flag = False
+
+        # 루프 스레드 정보 및 마지막 하트비트
+        self._loop_thread_id: int | None = None
+        self._last_beat = time.perf_counter()
+        self._beat_seq = 0
+        self._captured_seq = -1
+
+        # 최근 지연값 / 블로킹 샘플
+        self._recent = deque(maxlen=600)
+        self._max_lag = 0.0
+        self.samples = deque(maxlen=max_samples)
+
+    # 실행 중인 루프에서 모니터 시작
+    def start(self):
+        if self._task:
+            return
+
+        self._stop_flag = False
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+        # 스택 샘플링은 디버그 모드에서만 (루프 밖 감시 스레드)
+        if self.capture_stacks:
+            self._watchdog = threading.Thread(target=self._watch, daemon=True)
+            self._watchdog.start()
+
+        print(
+            f"[LOOP] 모니터 시작 (interval={self.interval}s, "
+            f"threshold={self.block_threshold}s, stacks={self.capture_stacks})"
+        )
+
+    # 모니터 중지
+    def stop(self):
+        self._stop_flag = True
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    # 주기적으로 잠들었다 깨어나며 지연 측정
+    async def _run(self):
+        while not self._stop_flag:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            now = time.perf_counter()
+
+            lag = max(now - start - self.interval, 0.0)
+            loop_lag_seconds.observe(lag)
+            self._recent.append(lag)
+            if lag > self._max_lag:
+                self._max_lag = lag
+
+            if lag > self.block_threshold:
+                loop_blocked_total.inc()
+
+            self._last_beat = now
+            self._beat_seq += 1
+
+    # 하트비트가 멈추면 루프 스레드의 현재 스택 캡처
+    def _watch(self):
+        period = max(self.block_threshold / 2, 0.01)
+        while not self._stop_flag:
+            time.sleep(period)
+
+            stalled = time.perf_counter() - self._last_beat - self.interval
+            seq = self._beat_seq
+            if stalled < self.block_threshold or seq == self._captured_seq:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+
+            self._captured_seq = seq
+            stack = traceback.extract_stack(frame)
+            site = self._find_call_site(stack)
+
+            self.samples.append({
+                "at": time.time(),
+                "blocked_for": round(stalled, 4),
+                "site": site,
+                "stack": [f"{f.filename}:{f.lineno} in {f.name}" for f in stack[-15:]],
+            })
+            print(f"[LOOP] ⚠️ 이벤트 루프 {stalled * 1000:.0f}ms 블로킹 → {site}")
+
+    # 라이브러리 밖 가장 안쪽 프레임을 블로킹 원인으로 지목
+    @staticmethod
+    def _find_call_site(stack) -> str:
+        for f in reversed(stack):
+            if f.filename.startswith(_LIB_DIRS) or f.filename.endswith("loop_monitor.py"):
+                continue
+            name = f.filename
+            if name.startswith(_APP_DIR):
+                name = os.path.relpath(name, os.path.dirname(_APP_DIR))
+            return f"{name}:{f.lineno} in {f.name}"
+
+        f = stack[-1]
+        return f"{f.filename}:{f.lineno} in {f.name}"
+
+    # /debug/loop 응답용 리포트
+    def report(self) -> dict:
+        recent = sorted(self._recent)
+
+        def pct(p):
+            if not recent:
+                return 0.0
+            return round(recent[min(int(len(recent) * p), len(recent) - 1)], 5)
+
+        buckets = {}
+        for _, (counts, total, count) in loop_lag_seconds.totals().items():
+            buckets = {
+                f"{b:g}": c for b, c in zip(loop_lag_seconds.buckets, counts)
+            }
+            buckets["+Inf"] = counts[-1]
+
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "block_threshold": self.block_threshold,
+            "capture_stacks": self.capture_stacks,
+            "lag": {
+                "recent_count": len(recent),
+                "p50": pct(0.50),
+                "p99": pct(0.99),
+                "max": round(self._max_lag, 5),
+                "histogram": buckets,
+            },
+            "blocked_samples": list(self.samples),
+        }
+
+
+# 전역 루프 모니터 (스택 샘플링은 DEBUG 모드에서만)
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD,
+    capture_stacks=settings.DEBUG,
+)
@@ -0,0 +1,181 @@
+import math
+
+import numpy as np
+
+# 셀 값 (ROS nav_msgs/OccupancyGrid 규약, int8)
+FREE = 0
+OCCUPIED = 100
+UNKNOWN = -1
+
+
+# 핀 좌표 문자열 "x,y" → (x, y) (형식 오류 시 None)
+def parse_coords(coords) -> tuple[float, float] | None:
+    try:
+        x, y = str(coords).split(",")[:2]
+        return float(x), float(y)
+    except (ValueError, TypeError):
+        return None
+
+
+# 열 방향 최근접 점유 셀까지 거리 (셀 단위, cap 으로 제한)
+def _column_distance(occupied: np.ndarray, cap: int) -> np.ndarray:
+    h, w = occupied.shape
+    dist = np.full((h, w), cap, dtype=np.int32)
+
+    # 위 → 아래 / 아래 → 위 두 번 훑기 (행 단위 벡터 연산)
+    run = np.full(w, cap, dtype=np.int32)
+    for y in range(h):
+        run = np.where(occupied[y], 0, np.minimum(run + 1, cap))
+        dist[y] = run
+
+    run = np.full(w, cap, dtype=np.int32)
+    for y in range(h - 1, -1, -1):
+        run = np.where(occupied[y], 0, np.minimum(run + 1, cap))
+        np.minimum(dist[y], run, out=dist[y])
+
+    return dist
+
+
+# 유클리드 거리 변환 (셀 단위, cap 이하 거리는 정확, 초과는 cap)
+# - 1단계: 열 방향 최근접 거리 g
+# - 2단계: 가로 이동량 dx 별로 dx² + g² 최솟값 (|dx| ≤ cap 만 확인하면 충분)
+def distance_transform(occupied: np.ndarray, cap: int) -> np.ndarray:
+    h, w = occupied.shape
+    g2 = _column_distance(occupied, cap).astype(np.float32) ** 2
+
+    d2 = g2.copy()
+    for dx in range(1, min(cap, w - 1) + 1):
+        dx2 = np.float32(dx * dx)
+        np.minimum(d2[:, dx:], g2[:, :-dx] + dx2, out=d2[:, dx:])
+        np.minimum(d2[:, :-dx], g2[:, dx:] + dx2, out=d2[:, :-dx])
+
+    return np.minimum(np.sqrt(d2), np.float32(cap))
+
+
+# 점유 격자 지도 (ROS map_server YAML + 이미지 → NumPy 배열)
+# - cells[gy, gx]: FREE / OCCUPIED / UNKNOWN, gy = 0 이 지도 아래쪽 (원점 기준)
+# - clearance[gy, gx]: 최근접 점유 셀까지 거리 (m, max_distance 로 제한)
+# - 좌표 변환 / 조회 함수는 스칼라와 배열 모두 지원
+class OccupancyGrid:
+    def __init__(
+        self,
+        cells: np.ndarray,
+        resolution: float,
+        origin,
+        max_distance: float = 3.0,
+    ):
+        self.cells = cells
+        self.resolution = float(resolution)
+        self.origin_x = float(origin[0])
+        self.origin_y = float(origin[1])
+        self.origin_yaw = float(origin[2]) if len(origin) > 2 else 0.0
+        self._cos = math.cos(self.origin_yaw)
+        self._sin = math.sin(self.origin_yaw)
+        self.height, self.width = cells.shape
+
+        # 거리 변환 (점유 셀 기준, 1회 계산)
+        self.max_distance = float(max_distance)
+        cap = max(1, int(math.ceil(self.max_distance / self.resolution)))
+        self.clearance = distance_transform(cells == OCCUPIED, cap) * np.float32(self.resolution)
+
+    # map_server 규약으로 이미지 → 격자 변환
+    #   p = (255 - 픽셀) / 255 (negate=1 이면 픽셀 / 255)
+    #   p > occupied_thresh → 점유, p < free_thresh → 빈 공간, 그 외 미탐색
+    @classmethod
+    def from_image(
+        cls,
+        img: np.ndarray,
+        resolution: float,
+        origin,
+        negate: int = 0,
+        occupied_thresh: float = 0.65,
+        free_thresh: float = 0.196,
+        max_distance: float = 3.0,
+    ) -> "OccupancyGrid":
+        pixels = img.astype(np.float32) / 255.0
+        p = pixels if negate else 1.0 - pixels
+
+        cells = np.full(img.shape, UNKNOWN, dtype=np.int8)
+        cells[p > occupied_thresh] = OCCUPIED
+        cells[p < free_thresh] = FREE
+
+        # 이미지 첫 행 = 지도 위쪽 → 원점 기준 행 순서로 뒤집기
+        return cls(np.ascontiguousarray(np.flipud(cells)), resolution, origin, max_distance)
+
+    # ─────────────────────────────────────────
+    # 좌표 변환
+    # ─────────────────────────────────────────
+
+    # 월드 좌표 (m) → 격자 인덱스 (gx, gy)
+    def world_to_grid(self, x, y):
+        dx = np.asarray(x, dtype=np.float64) - self.origin_x
+        dy = np.asarray(y, dtype=np.float64) - self.origin_y
+        lx = self._cos * dx + self._sin * dy
+        ly = -self._sin * dx + self._cos * dy
+        gx = np.floor(lx / self.resolution).astype(np.int64)
+        gy = np.floor(ly / self.resolution).astype(np.int64)
+        return gx, gy
+
+    # 격자 인덱스 → 셀 중심 월드 좌표 (m)
+    def grid_to_world(self, gx, gy):
+        lx = (np.asarray(gx, dtype=np.float64) + 0.5) * self.resolution
+        ly = (np.asarray(gy, dtype=np.float64) + 0.5) * self.resolution
+        x = self.origin_x + self._cos * lx - self._sin * ly
+        y = self.origin_y + self._sin * lx + self._cos * ly
+        return x, y
+
+    def in_bounds(self, gx, gy):
+        return (gx >= 0) & (gx < self.width) & (gy >= 0) & (gy < self.height)
+
+    # ─────────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────────
+
+    # 셀 값 (지도 밖은 UNKNOWN)
+    def cell(self, x, y):
+        gx, gy = self.world_to_grid(x, y)
+        inside = self.in_bounds(gx, gy)
+        values = np.full(np.shape(gx), UNKNOWN, dtype=np.int8)
+        values[inside] = self.cells[gy[inside], gx[inside]]
+        return values
+
+    # 빈 공간 여부 (지도 밖 / 미탐색 / 점유 → False)
+    def is_free(self, x, y):
+        return self.cell(x, y) == FREE
+
+    # 최근접 장애물까지 거리 (m, 지도 밖은 0)
+    def distance(self, x, y):
+        gx, gy = self.world_to_grid(x, y)
+        inside = self.in_bounds(gx, gy)
+        values = np.zeros(np.shape(gx), dtype=np.float32)
+        values[inside] = self.clearance[gy[inside], gx[inside]]
+        return values
+
+    # 좌표 일괄 검증 → 항목별 결과
+    #   ok: 빈 공간이고 장애물과 min_clearance(m) 이상 떨어짐
+    def validate(self, xs, ys, min_clearance: float = 0.0) -> list[dict]:
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        gx, gy = self.world_to_grid(xs, ys)
+        inside = self.in_bounds(gx, gy)
+        free = self.is_free(xs, ys)
+        dist = self.distance(xs, ys)
+        ok = free & (dist >= min_clearance)
+
+        results = []
+        for i in range(len(xs)):
+            if not inside[i]:
+                reason = "out_of_map"
+            elif not free[i]:
+                reason = "occupied" if self.cells[gy[i], gx[i]] == OCCUPIED else "unknown"
+            elif not ok[i]:
+                reason = "too_close"
+            else:
+                reason = None
+            results.append({
+                "ok": bool(ok[i]),
+                "reason": reason,
+                "cell": [int(gx[i]), int(gy[i])],
+                "clearance": round(float(dist[i]), 3),
+            })
+        return results
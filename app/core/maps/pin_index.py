@@ -0,0 +1,127 @@
+import math
+import threading
+
+import numpy as np
+
+from app.core.broker import broker
+from app.core.database import SessionLocal
+from app.models.pin_model import Pin
+
+
+# 핀 좌표 공간 인덱스 (균일 격자 버킷)
+# - 좌표를 cell(m) 크기 격자 칸으로 나눠 칸별 핀 행 번호 보관
+# - 최근접 k개 조회: 조회 좌표 칸부터 링 단위로 확장,
+#   k번째 거리가 다음 링 최소 거리(r × cell) 이하가 되면 종료
+# - 핀 변경 시 invalidate → 다음 조회 때 DB에서 1회 재구성 (다른 워커 변경은 cache 채널)
+class PinIndex:
+    def __init__(self, cell: float = 2.0):
+        self.cell = cell
+        self._dirty = True
+        self._lock = threading.Lock()
+        self._snapshot = self._build([])
+
+    def invalidate(self):
+        self._dirty = True
+
+    def _on_cache(self, message: dict, remote: bool):
+        if remote and "pins" in message.get("names", ()):
+            self.invalidate()
+
+    # 핀 목록 → (id, 이름, 좌표 (N, 2), yaw, 버킷, 칸 범위)
+    def _build(self, pins: list) -> tuple:
+        ids = np.array([p[0] for p in pins], dtype=np.int64)
+        names = [p[1] for p in pins]
+        xy = np.array([(p[2], p[3]) for p in pins], dtype=np.float64).reshape(-1, 2)
+        yaw = [p[4] for p in pins]
+
+        buckets: dict[tuple[int, int], np.ndarray] = {}
+        bounds = None
+        if len(pins):
+            keys = np.floor(xy / self.cell).astype(np.int64)
+            order = np.lexsort((keys[:, 1], keys[:, 0]))
+            sorted_keys = keys[order]
+            starts = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0) != 0, axis=1)) + 1
+            for group in np.split(order, starts):
+                kx, ky = keys[group[0]]
+                buckets[(int(kx), int(ky))] = group
+            bounds = (*keys.min(axis=0).tolist(), *keys.max(axis=0).tolist())
+
+        return ids, names, xy, yaw, buckets, bounds
+
+    def _load(self):
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Pin.id, Pin.name, Pin.x, Pin.y, Pin.yaw)
+                .filter(Pin.x.isnot(None), Pin.y.isnot(None))
+                .all()
+            )
+        finally:
+            db.close()
+        return [tuple(r) for r in rows]
+
+    def _current(self) -> tuple:
+        if self._dirty:
+            with self._lock:
+                if self._dirty:
+                    self._dirty = False
+                    self._snapshot = self._build(self._load())
+        return self._snapshot
+
+    # 최근접 핀 k개 (거리 오름차순, max_distance(m) 초과 제외)
+    def nearest(self, x: float, y: float, k: int = 1, max_distance: float | None = None) -> list[dict]:
+        ids, names, xy, yaw, buckets, bounds = self._current()
+        if bounds is None or k <= 0:
+            return []
+
+        cx, cy = math.floor(x / self.cell), math.floor(y / self.cell)
+        r_max = max(cx - bounds[0], bounds[2] - cx, cy - bounds[1], bounds[3] - cy, 0)
+        limit = math.inf if max_distance is None else max_distance
+
+        found = []
+        r = 0
+        while r <= r_max:
+            # 링 r 의 칸들 (r = 0 이면 조회 칸 자신)
+            if r == 0:
+                ring = [(cx, cy)]
+            else:
+                ring = [(cx + dx, cy + dy) for dx in (-r, r) for dy in range(-r, r + 1)]
+                ring += [(cx + dx, cy + dy) for dy in (-r, r) for dx in range(-r + 1, r)]
+            for key in ring:
+                rows = buckets.get(key)
+                if rows is not None:
+                    found.append(rows)
+
+            # 링 밖 핀은 최소 r × cell 거리 → 이미 k개가 그 이내면 종료
+            if found:
+                rows = np.concatenate(found)
+                dist = np.hypot(xy[rows, 0] - x, xy[rows, 1] - y)
+                if len(rows) >= k and np.partition(dist, k - 1)[k - 1] <= r * self.cell:
+                    break
+            if r * self.cell > limit:
+                break
+            r += 1
+
+        if not found:
+            return []
+
+        rows = np.concatenate(found)
+        dist = np.hypot(xy[rows, 0] - x, xy[rows, 1] - y)
+        order = np.argsort(dist, kind="stable")[:k]
+        return [
+            {
+                "id": int(ids[rows[i]]),
+                "name": names[rows[i]],
+                "x": float(xy[rows[i], 0]),
+                "y": float(xy[rows[i], 1]),
+                "yaw": yaw[rows[i]],
+                "distance": round(float(dist[i]), 4),
+            }
+            for i in order
+            if dist[i] <= limit
+        ]
+
+
+# 전역 핀 인덱스
+pin_index = PinIndex()
+broker.subscribe("cache", pin_index._on_cache)
@@ -0,0 +1,172 @@
+import math
+import heapq
+
+import numpy as np
+
+from app.core.maps.occupancy import FREE, OccupancyGrid
+
+SQRT2 = math.sqrt(2.0)
+
+
+# 점유 격자 경로 계획기 (8방향, 장애물 팽창)
+# - 계획 격자: 점유 격자를 factor 배 축소 (축소 셀 안에 막힌 셀이 하나라도 있으면 막힘)
+# - 막힘: 빈 공간이 아니거나 장애물까지 거리 < inflation (로봇 반경 + 여유)
+# - 테두리를 막힌 셀로 둘러싼 1차원 인덱스 사용 (이웃 계산 시 경계 검사 불필요)
+# - 대각 이동은 양쪽 직교 셀이 모두 비어 있을 때만 허용 (모서리 통과 방지)
+class GridPlanner:
+    def __init__(self, grid: OccupancyGrid, inflation: float = 0.15, resolution: float = 0.1):
+        self.grid = grid
+        self.inflation = inflation
+        self.factor = max(1, int(round(resolution / grid.resolution)))
+        self.resolution = grid.resolution * self.factor
+
+        fine = (grid.cells != FREE) | (grid.clearance < inflation)
+
+        # factor × factor 블록 단위 축소 (테두리 여백은 막힘으로 채움)
+        f = self.factor
+        h = -(-grid.height // f)
+        w = -(-grid.width // f)
+        padded = np.ones((h * f, w * f), dtype=bool)
+        padded[:grid.height, :grid.width] = fine
+        coarse = padded.reshape(h, f, w, f).any(axis=(1, 3))
+
+        # 막힌 셀 테두리 추가
+        self.height, self.width = h, w
+        self.stride = w + 2
+        bordered = np.ones((h + 2, w + 2), dtype=bool)
+        bordered[1:-1, 1:-1] = coarse
+        self.blocked_mask = bordered
+        self.blocked = bytes(bordered.ravel().astype(np.uint8))
+
+        s = self.stride
+        # (이웃 오프셋, 비용, 대각 시 확인할 직교 오프셋 2개)
+        self.neighbors = (
+            (1, 1.0, 0, 0), (-1, 1.0, 0, 0), (s, 1.0, 0, 0), (-s, 1.0, 0, 0),
+            (s + 1, SQRT2, s, 1), (s - 1, SQRT2, s, -1),
+            (-s + 1, SQRT2, -s, 1), (-s - 1, SQRT2, -s, -1),
+        )
+
+    # ─────────────────────────────────────────
+    # 좌표 변환
+    # ─────────────────────────────────────────
+
+    # 월드 좌표 → 계획 격자 인덱스 (막힌 셀이면 snap 반경 내 가장 가까운 빈 셀, 없으면 None)
+    def to_index(self, x: float, y: float, snap: float = 0.5) -> int | None:
+        gx, gy = self.grid.world_to_grid(x, y)
+        cx, cy = int(gx) // self.factor + 1, int(gy) // self.factor + 1
+
+        r = max(1, int(math.ceil(snap / self.resolution)))
+        x0, x1 = max(cx - r, 1), min(cx + r, self.width)
+        y0, y1 = max(cy - r, 1), min(cy + r, self.height)
+        if x0 > x1 or y0 > y1:
+            return None
+
+        window = self.blocked_mask[y0:y1 + 1, x0:x1 + 1]
+        if 0 <= cy - y0 < window.shape[0] and 0 <= cx - x0 < window.shape[1] and not window[cy - y0, cx - x0]:
+            return cy * self.stride + cx
+
+        free_y, free_x = np.nonzero(~window)
+        if not len(free_y):
+            return None
+        d2 = (free_y + y0 - cy) ** 2 + (free_x + x0 - cx) ** 2
+        k = int(np.argmin(d2))
+        if d2[k] > r * r:
+            return None
+        return int(free_y[k] + y0) * self.stride + int(free_x[k] + x0)
+
+    # 계획 격자 인덱스 → 셀 중심 월드 좌표
+    def to_world(self, indices) -> np.ndarray:
+        idx = np.asarray(indices, dtype=np.int64)
+        cy, cx = np.divmod(idx, self.stride)
+        f = self.factor
+        gx = (cx - 1) * f + (f - 1) / 2.0
+        gy = (cy - 1) * f + (f - 1) / 2.0
+        x, y = self.grid.grid_to_world(gx, gy)
+        return np.column_stack([x, y])
+
+    # ─────────────────────────────────────────
+    # 탐색
+    # ─────────────────────────────────────────
+
+    # 단일 출발 Dijkstra → 목표 셀별 경로 길이 (m, 도달 불가 시 inf)
+    # - 모든 목표가 확정되면 조기 종료
+    def distances(self, start: int, targets) -> dict:
+        blocked = self.blocked
+        neighbors = self.neighbors
+        remaining = set(targets)
+        dist = {start: 0.0}
+        heap = [(0.0, start)]
+
+        while heap and remaining:
+            d, i = heapq.heappop(heap)
+            if d > dist[i]:
+                continue
+            remaining.discard(i)
+
+            for off, cost, o1, o2 in neighbors:
+                j = i + off
+                if blocked[j] or (o1 and (blocked[i + o1] or blocked[i + o2])):
+                    continue
+                nd = d + cost
+                if nd < dist.get(j, math.inf):
+                    dist[j] = nd
+                    heapq.heappush(heap, (nd, j))
+
+        res = self.resolution
+        return {t: dist[t] * res if t in dist and t not in remaining else math.inf for t in targets}
+
+    # A* 최단 경로 → 셀 인덱스 목록 (도달 불가 시 None)
+    def astar(self, start: int, goal: int) -> list[int] | None:
+        blocked = self.blocked
+        neighbors = self.neighbors
+        s = self.stride
+        gy, gx = divmod(goal, s)
+
+        # 8방향 옥타일 거리 휴리스틱
+        def h(i):
+            dy, dx = divmod(i, s)
+            dx, dy = abs(dx - gx), abs(dy - gy)
+            return (dx + dy) + (SQRT2 - 2.0) * min(dx, dy)
+
+        g = {start: 0.0}
+        came = {start: -1}
+        heap = [(h(start), 0.0, start)]
+
+        while heap:
+            _, d, i = heapq.heappop(heap)
+            if i == goal:
+                path = [i]
+                while came[path[-1]] >= 0:
+                    path.append(came[path[-1]])
+                return path[::-1]
+            if d > g[i]:
+                continue
+
+            for off, cost, o1, o2 in neighbors:
+                j = i + off
+                if blocked[j] or (o1 and (blocked[i + o1] or blocked[i + o2])):
+                    continue
+                nd = d + cost
+                if nd < g.get(j, math.inf):
+                    g[j] = nd
+                    came[j] = i
+                    heapq.heappush(heap, (nd + h(j), nd, j))
+
+        return None
+
+    # 월드 좌표 간 경로 → ((N, 2) 좌표 배열, 길이 m) / 도달 불가 시 None
+    def plan(self, sx: float, sy: float, tx: float, ty: float):
+        start = self.to_index(sx, sy)
+        goal = self.to_index(tx, ty)
+        if start is None or goal is None:
+            return None
+
+        cells = self.astar(start, goal)
+        if cells is None:
+            return None
+
+        points = self.to_world(cells)
+        points[0] = (sx, sy)
+        points[-1] = (tx, ty)
+        length = float(np.hypot(*np.diff(points, axis=0).T).sum()) if len(points) > 1 else 0.0
+        return points, length
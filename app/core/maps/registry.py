@@ -0,0 +1,350 @@
+import os
+import json
+import glob
+import queue
+import shutil
+import hashlib
+import threading
+from email.utils import formatdate
+
+import yaml
+import numpy as np
+import imageio.v2 as imageio
+from PIL import Image
+
+from app.core.config import settings
+from app.core.maps.occupancy import OccupancyGrid
+from app.core.maps.planner import GridPlanner
+
+# ROS map_server 미탐색 영역 회색값 (타일 여백 채움)
+UNKNOWN_GRAY = 205
+
+# 타일 생성 완료 표시 파일
+TILES_DONE = ".done"
+
+
+# 원자적 파일 쓰기 (다중 워커가 같은 파일을 써도 부분 파일 노출 없음)
+def _write_png(path: str, img: np.ndarray, optimize: bool = False):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    Image.fromarray(img).save(tmp, format="PNG", optimize=optimize)
+    os.replace(tmp, path)
+
+
+# 파일 수정 시각 (없으면 None)
+def _mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+# 2×2 최솟값 축소 (어두운 점유 셀 유지 → 축소해도 얇은 벽이 사라지지 않음)
+def _downsample(img: np.ndarray) -> np.ndarray:
+    h, w = img.shape
+    padded = np.full((h + h % 2, w + w % 2), UNKNOWN_GRAY, dtype=img.dtype)
+    padded[:h, :w] = img
+    return padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2).min(axis=(1, 3))
+
+
+# 지도 레지스트리
+# - MAP_DIR 의 *.yaml (ROS map_server 형식) 을 지도 1개로 등록 (이름 = 파일명)
+# - 백그라운드 스레드가 PGM → PNG 변환(최적화) + 점유 격자 로드 + 타일 피라미드 생성
+# - YAML / 원본 이미지 수정 시각을 주기적으로 확인해 변경 시 재생성
+# - 타일: z = 0 (지도 전체가 타일 1장) ~ max_zoom (원본 해상도), XYZ 순서 (좌상단 기준)
+class MapRegistry:
+    def __init__(
+        self,
+        directory: str,
+        tile_dir: str,
+        tile_size: int = 256,
+        watch_interval: float = 5.0,
+        max_distance: float = 3.0,
+        inflation: float = 0.15,
+        plan_resolution: float = 0.1,
+    ):
+        self.directory = directory
+        self.tile_dir = tile_dir
+        self.tile_size = tile_size
+        self.watch_interval = watch_interval
+        self.max_distance = max_distance
+        self.inflation = inflation
+        self.plan_resolution = plan_resolution
+
+        self._maps: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+        # 점유 격자 로드 완료 콜백 callback(name, grid)
+        self._grid_listeners: list = []
+
+    # ─────────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────────
+
+    def names(self) -> list[str]:
+        return sorted(self._maps)
+
+    def get(self, name: str) -> dict | None:
+        return self._maps.get(name)
+
+    # 점유 격자 (로드 전이면 None)
+    def grid(self, name: str) -> OccupancyGrid | None:
+        entry = self._maps.get(name)
+        return entry["grid"] if entry is not None else None
+
+    # 경로 계획기 (격자 로드 후 최초 요청 시 생성)
+    def planner(self, name: str) -> GridPlanner | None:
+        entry = self._maps.get(name)
+        if entry is None or entry["grid"] is None:
+            return None
+        planner = entry["planner"]
+        if planner is None or planner.grid is not entry["grid"]:
+            planner = GridPlanner(entry["grid"], self.inflation, self.plan_resolution)
+            entry["planner"] = planner
+        return planner
+
+    def on_grid(self, callback):
+        self._grid_listeners.append(callback)
+
+    # 목록 응답용 요약
+    def describe(self, name: str) -> dict | None:
+        entry = self._maps.get(name)
+        if entry is None:
+            return None
+
+        result = {
+            "name": name,
+            "status": entry["status"],
+            "width": entry["width"],
+            "height": entry["height"],
+            "resolution": entry["resolution"],
+            "origin": entry["origin"],
+            "image": None,
+            "tiles": None,
+            "grid": entry["grid"] is not None,
+        }
+        if entry["digest"]:
+            result["image"] = f"/maps/{name}/image.png?v={entry['digest']}"
+        if entry["tiles_ready"]:
+            result["tiles"] = {
+                "url": f"/maps/{name}/tiles/{{z}}/{{x}}/{{y}}.png?v={entry['digest']}",
+                "size": self.tile_size,
+                "max_zoom": entry["max_zoom"],
+            }
+        if entry["error"]:
+            result["error"] = entry["error"]
+        return result
+
+    # 타일 파일 경로 (없으면 None)
+    def tile_path(self, name: str, z: int, x: int, y: int) -> str | None:
+        entry = self._maps.get(name)
+        if entry is None or not entry["tiles_ready"] or not 0 <= z <= entry["max_zoom"]:
+            return None
+        path = os.path.join(entry["tile_root"], str(z), f"{x}_{y}.png")
+        return path if os.path.exists(path) else None
+
+    # ─────────────────────────────────────────
+    # 스캔 / 변경 감지
+    # ─────────────────────────────────────────
+
+    # YAML 목록 확인 → 신규/변경 지도 등록 후 작업 큐 적재, 삭제된 지도 제거
+    def scan(self):
+        found = set()
+        for yaml_path in sorted(glob.glob(os.path.join(self.directory, "*.yaml"))):
+            name = os.path.splitext(os.path.basename(yaml_path))[0]
+            found.add(name)
+            try:
+                self._register(name, yaml_path)
+            except Exception as e:
+                print(f"[MAP] ⚠️ {name} 등록 실패:", e)
+
+        with self._lock:
+            for name in set(self._maps) - found:
+                del self._maps[name]
+                shutil.rmtree(os.path.join(self.tile_dir, name), ignore_errors=True)
+                print(f"[MAP] 🗑️ 지도 제거: {name}")
+
+    def _register(self, name: str, yaml_path: str):
+        yaml_mtime = _mtime(yaml_path)
+        entry = self._maps.get(name)
+        if entry is not None and entry["yaml_mtime"] == yaml_mtime and _mtime(entry["source"]) == entry["source_mtime"]:
+            return
+
+        with open(yaml_path, "r") as f:
+            data = yaml.safe_load(f)
+
+        source = os.path.join(os.path.dirname(yaml_path), data["image"])
+        entry = {
+            "name": name,
+            "yaml_mtime": yaml_mtime,
+            "source": source,
+            "source_mtime": _mtime(source),
+            "png": os.path.splitext(source)[0] + ".png",
+            "resolution": float(data["resolution"]),
+            "origin": list(data["origin"]),
+            "negate": int(data.get("negate", 0)),
+            "occupied_thresh": float(data.get("occupied_thresh", 0.65)),
+            "free_thresh": float(data.get("free_thresh", 0.196)),
+            "mode": data.get("mode", "trinary"),
+            "status": "pending",
+            "error": None,
+            "width": None,
+            "height": None,
+            "digest": None,
+            "last_modified": None,
+            "max_zoom": 0,
+            "tile_root": None,
+            "tiles_ready": False,
+            "grid": None,
+            "planner": None,
+        }
+
+        # 변환된 PNG가 원본보다 최신이면 즉시 이미지 제공 가능 (타일만 백그라운드 생성)
+        if self._png_fresh(entry):
+            self._load_png_info(entry)
+
+        with self._lock:
+            self._maps[name] = entry
+        self._queue.put(name)
+
+    @staticmethod
+    def _png_fresh(entry: dict) -> bool:
+        png_mtime = _mtime(entry["png"])
+        if png_mtime is None:
+            return False
+        return entry["png"] == entry["source"] or png_mtime >= (entry["source_mtime"] or 0)
+
+    def _load_png_info(self, entry: dict):
+        with open(entry["png"], "rb") as f:
+            raw = f.read()
+        with Image.open(entry["png"]) as img:
+            entry["width"], entry["height"] = img.size
+        entry["digest"] = hashlib.blake2b(raw, digest_size=8).hexdigest()
+        entry["last_modified"] = formatdate(
+            max(entry["yaml_mtime"], _mtime(entry["png"])) / 1e9, usegmt=True
+        )
+
+    # ─────────────────────────────────────────
+    # 백그라운드 변환 / 타일 생성
+    # ─────────────────────────────────────────
+
+    def start(self):
+        if self._thread:
+            return
+        os.makedirs(self.tile_dir, exist_ok=True)
+        self._stop.clear()
+        self.scan()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"[MAP] 지도 레지스트리 시작 ({len(self._maps)}개, {self.directory})")
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop.set()
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                name = self._queue.get(timeout=self.watch_interval)
+            except queue.Empty:
+                self.scan()
+                continue
+            if name is None:
+                return
+
+            entry = self._maps.get(name)
+            if entry is None:
+                continue
+            try:
+                self._build(entry)
+            except Exception as e:
+                entry["status"] = "error"
+                entry["error"] = str(e)
+                print(f"[MAP] ❌ {name} 처리 실패:", e)
+
+    def _build(self, entry: dict):
+        name = entry["name"]
+
+        # 원본 이미지 로드 (그레이스케일)
+        img = np.asarray(imageio.imread(entry["source"]))
+        if img.ndim == 3:
+            img = img[..., :3].mean(axis=2).astype(np.uint8)
+        elif img.dtype != np.uint8:
+            img = (img.astype(np.float64) * 255 / max(int(img.max()), 1)).astype(np.uint8)
+
+        # PGM → PNG 변환 (원본이 PNG면 생략)
+        if not self._png_fresh(entry):
+            _write_png(entry["png"], img, optimize=True)
+            print(f"🟢 PGM → PNG 변환 완료: {os.path.basename(entry['png'])}")
+        self._load_png_info(entry)
+        entry["status"] = "image_ready"
+
+        # 점유 격자 + 거리 변환 (1회 계산)
+        entry["grid"] = OccupancyGrid.from_image(
+            img,
+            entry["resolution"],
+            entry["origin"],
+            negate=entry["negate"],
+            occupied_thresh=entry["occupied_thresh"],
+            free_thresh=entry["free_thresh"],
+            max_distance=self.max_distance,
+        )
+        for callback in self._grid_listeners:
+            try:
+                callback(name, entry["grid"])
+            except Exception as e:
+                print("[MAP] ⚠️ 격자 콜백 오류:", e)
+
+        # 타일 피라미드 (지도 내용 해시별 디렉터리 → 내용이 같으면 재사용)
+        root = os.path.join(self.tile_dir, name, entry["digest"])
+        max_zoom = max(0, int(np.ceil(np.log2(max(img.shape) / self.tile_size))))
+        if not os.path.exists(os.path.join(root, TILES_DONE)):
+            self._write_tiles(img, root, max_zoom)
+            count = sum(len(files) for _, _, files in os.walk(root)) - 1
+            print(f"🧩 {name} 타일 생성 완료 (z=0~{max_zoom}, {count}장)")
+
+        # 이전 내용의 타일 정리
+        for old in glob.glob(os.path.join(self.tile_dir, name, "*")):
+            if old != root:
+                shutil.rmtree(old, ignore_errors=True)
+
+        entry["max_zoom"] = max_zoom
+        entry["tile_root"] = root
+        entry["tiles_ready"] = True
+        entry["status"] = "ready"
+
+    def _write_tiles(self, img: np.ndarray, root: str, max_zoom: int):
+        size = self.tile_size
+        level = img
+        for z in range(max_zoom, -1, -1):
+            zdir = os.path.join(root, str(z))
+            os.makedirs(zdir, exist_ok=True)
+            h, w = level.shape
+            for ty in range(0, (h + size - 1) // size):
+                for tx in range(0, (w + size - 1) // size):
+                    tile = np.full((size, size), UNKNOWN_GRAY, dtype=np.uint8)
+                    block = level[ty * size:(ty + 1) * size, tx * size:(tx + 1) * size]
+                    tile[:block.shape[0], :block.shape[1]] = block
+                    _write_png(os.path.join(zdir, f"{tx}_{ty}.png"), tile)
+            level = _downsample(level)
+
+        with open(os.path.join(root, TILES_DONE), "w") as f:
+            json.dump({"max_zoom": max_zoom, "tile_size": size, "shape": list(img.shape)}, f)
+
+
+# 전역 지도 레지스트리
+map_registry = MapRegistry(
+    settings.MAP_DIR,
+    settings.MAP_TILE_DIR,
+    tile_size=settings.MAP_TILE_SIZE,
+    watch_interval=settings.MAP_WATCH_INTERVAL,
+    max_distance=settings.MAP_CLEARANCE_MAX,
+    inflation=settings.PLANNER_INFLATION,
+    plan_resolution=settings.PLANNER_RESOLUTION,
+)
@@ -0,0 +1,73 @@
+import numpy as np
+
+# 경로 최적화 (순수 함수)
+# - D: (n, n) 거리 행렬, 0번 노드 = 대기 위치(WAIT), 1..n-1 = 방문 지점
+# - 투어: 0 으로 시작/끝나는 노드 번호 목록
+
+
+# 투어 총 거리
+def tour_length(D: np.ndarray, tour: list[int]) -> float:
+    return float(sum(D[a, b] for a, b in zip(tour, tour[1:])))
+
+
+# 최근접 이웃 투어 (WAIT 출발 → 가장 가까운 미방문 지점 → ... → WAIT)
+def nearest_neighbour(D: np.ndarray, stops: list[int]) -> list[int]:
+    tour = [0]
+    remaining = list(stops)
+    while remaining:
+        last = tour[-1]
+        nxt = min(remaining, key=lambda s: D[last, s])
+        remaining.remove(nxt)
+        tour.append(nxt)
+    tour.append(0)
+    return tour
+
+
+# 2-opt 개선 (구간 뒤집기로 거리가 줄어드는 동안 반복, 시작/끝 WAIT 고정)
+def two_opt(D: np.ndarray, tour: list[int], max_rounds: int = 50) -> list[int]:
+    tour = list(tour)
+    n = len(tour)
+    for _ in range(max_rounds):
+        improved = False
+        for i in range(1, n - 2):
+            for j in range(i + 1, n - 1):
+                a, b = tour[i - 1], tour[i]
+                c, d = tour[j], tour[j + 1]
+                delta = D[a, c] + D[b, d] - D[a, b] - D[c, d]
+                if delta < -1e-9:
+                    tour[i:j + 1] = tour[i:j + 1][::-1]
+                    improved = True
+        if not improved:
+            break
+    return tour
+
+
+# 용량 기준 트립 분할 (WAIT 출발, 남은 용량에 들어가는 가장 가까운 지점부터 채움)
+# - 용량 초과 단일 지점은 단독 트립
+def group_by_capacity(D: np.ndarray, demands: list[float], capacity: float) -> list[list[int]]:
+    remaining = set(range(1, len(demands) + 1))
+    trips = []
+    while remaining:
+        trip, load, last = [], 0.0, 0
+        while True:
+            fits = [s for s in remaining if load + demands[s - 1] <= capacity]
+            if not fits:
+                if not trip:
+                    # 용량보다 큰 지점 → 단독 트립
+                    fits = list(remaining)
+                else:
+                    break
+            nxt = min(fits, key=lambda s: (D[last, s], s))
+            remaining.remove(nxt)
+            trip.append(nxt)
+            load += demands[nxt - 1]
+            last = nxt
+            if load >= capacity or not remaining:
+                break
+        trips.append(trip)
+    return trips
+
+
+# 트립 분할 + 트립별 방문 순서 (최근접 이웃 → 2-opt)
+def plan_routes(D: np.ndarray, demands: list[float], capacity: float) -> list[list[int]]:
+    return [two_opt(D, nearest_neighbour(D, trip)) for trip in group_by_capacity(D, demands, capacity)]
@@ -0,0 +1,178 @@
+import math
+import queue
+import threading
+import time
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.broker import broker
+from app.core.database import SessionLocal
+from app.core.maps.occupancy import parse_coords
+from app.core.maps.registry import map_registry
+from app.models.pin_model import Pin
+
+# 대기 위치 노드 키 (DB에 "WAIT" 핀이 있으면 그 좌표 사용)
+WAIT = "WAIT"
+
+
+# 핀 + 대기 위치 간 주행 거리 행렬 (기본 지도 경로 계획 기준, m)
+# - 노드 추가: 새 노드에서 Dijkstra 1회 → 행/열 추가 (격자 비용이 대칭이므로 열 = 행)
+# - 노드 삭제: 행/열 제거, 좌표 변경: 삭제 후 추가
+# - 동기화는 전용 스레드에서 DB 핀 목록과 비교해 차이만 반영
+#   (핀 등록/삭제, 다른 워커의 핀 변경(cache 채널), 지도 격자 재로드 시)
+# - 도달 불가 / 지도 밖 노드는 inf
+class TravelMatrix:
+    def __init__(self, map_name: str, wait_coords: str, speed: float):
+        self.map_name = map_name
+        self.wait_coords = parse_coords(wait_coords) or (0.0, 0.0)
+        self.speed = speed
+
+        self._nodes: list[dict] = []  # {"key", "name", "x", "y", "index"}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._planner = None
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    # ─────────────────────────────────────────
+    # 조회
+    # ─────────────────────────────────────────
+
+    @property
+    def ready(self) -> bool:
+        return self._planner is not None
+
+    # (노드 목록, 거리 행렬) 일관된 스냅샷
+    def snapshot(self) -> tuple[list[dict], np.ndarray]:
+        with self._lock:
+            return self._nodes, self._matrix
+
+    # 노드 키(핀 id / "WAIT") 간 거리 (m, 모르면 inf)
+    def distance(self, a, b) -> float:
+        nodes, matrix = self.snapshot()
+        pos = {n["key"]: i for i, n in enumerate(nodes)}
+        if a not in pos or b not in pos:
+            return math.inf
+        return float(matrix[pos[a], pos[b]])
+
+    # ─────────────────────────────────────────
+    # 동기화
+    # ─────────────────────────────────────────
+
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.refresh()
+
+    def stop(self):
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    # 핀 변경 후 호출 (비동기 반영)
+    def refresh(self):
+        self._queue.put("sync")
+
+    def _on_grid(self, name: str, grid):
+        if name == self.map_name:
+            self.refresh()
+
+    def _on_cache(self, message: dict, remote: bool):
+        if remote and "pins" in message.get("names", ()):
+            self.refresh()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            # 연속 요청은 1회로 병합
+            while not self._queue.empty():
+                if self._queue.get_nowait() is None:
+                    return
+            try:
+                self._sync()
+            except Exception as e:
+                print("[PLAN] ⚠️ 거리 행렬 갱신 실패:", e)
+
+    # DB 핀 + 대기 위치 → 노드 목록
+    def _load_nodes(self) -> list[dict]:
+        db = SessionLocal()
+        try:
+            pins = db.query(Pin).filter(Pin.x.isnot(None), Pin.y.isnot(None)).all()
+            nodes = [
+                {"key": WAIT if pin.name == WAIT else pin.id, "name": pin.name, "x": pin.x, "y": pin.y}
+                for pin in pins
+            ]
+        finally:
+            db.close()
+
+        if not any(n["key"] == WAIT for n in nodes):
+            nodes.append({"key": WAIT, "name": WAIT, "x": self.wait_coords[0], "y": self.wait_coords[1]})
+        return nodes
+
+    def _sync(self):
+        planner = map_registry.planner(self.map_name)
+        if planner is None:
+            return
+
+        started = time.perf_counter()
+        desired = self._load_nodes()
+
+        # 지도 격자가 바뀌면 전체 재계산
+        if planner is not self._planner:
+            nodes, matrix = [], np.zeros((0, 0), dtype=np.float32)
+        else:
+            nodes, matrix = self.snapshot()
+
+        # 삭제 / 좌표 변경 노드 제거
+        wanted = {(n["key"], n["x"], n["y"]) for n in desired}
+        keep = [i for i, n in enumerate(nodes) if (n["key"], n["x"], n["y"]) in wanted]
+        removed = len(nodes) - len(keep)
+        nodes = [nodes[i] for i in keep]
+        matrix = matrix[np.ix_(keep, keep)]
+
+        # 이름 변경 반영 (좌표 동일)
+        names = {n["key"]: n["name"] for n in desired}
+        nodes = [{**n, "name": names[n["key"]]} for n in nodes]
+
+        # 신규 노드 추가 (노드당 Dijkstra 1회)
+        existing = {n["key"] for n in nodes}
+        added = [n for n in desired if n["key"] not in existing]
+        for node in added:
+            node = {**node, "index": planner.to_index(node["x"], node["y"])}
+            row = np.full(len(nodes) + 1, np.inf, dtype=np.float32)
+            if node["index"] is not None:
+                targets = [n["index"] for n in nodes if n["index"] is not None] + [node["index"]]
+                dist = planner.distances(node["index"], targets)
+                for i, n in enumerate(nodes):
+                    if n["index"] is not None:
+                        row[i] = dist[n["index"]]
+                row[-1] = 0.0
+
+            grown = np.full((len(nodes) + 1, len(nodes) + 1), np.inf, dtype=np.float32)
+            grown[:-1, :-1] = matrix
+            grown[-1, :] = row
+            grown[:, -1] = row
+            matrix = grown
+            nodes.append(node)
+
+        with self._lock:
+            self._nodes, self._matrix = nodes, matrix
+            self._planner = planner
+
+        if added or removed:
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"[PLAN] 거리 행렬 갱신 (노드 {len(nodes)}개, +{len(added)} / -{removed}, {elapsed:.0f}ms)")
+
+
+# 전역 거리 행렬
+travel_matrix = TravelMatrix(settings.MAP_DEFAULT, settings.WAIT_COORDS, settings.ROBOT_NOMINAL_SPEED)
+map_registry.on_grid(travel_matrix._on_grid)
+broker.subscribe("cache", travel_matrix._on_cache)
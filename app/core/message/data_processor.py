@@ -1,5 +1,10 @@
 import time
 import math
+from app.core.message.path_utils import extract_path, simplify_path, flatten_path
+
+# /nav 경로 단순화 (전송 점 개수 예산 / 허용 오차, m)
+NAV_PATH_BUDGET = 100
+NAV_PATH_TOLERANCE = 0.01
 
 
 # Quaternion -> yaw(rad) 변환
@@ -14,6 +19,16 @@ def quaternion_to_yaw(q):
     return math.atan2(siny, cosy)
 
 
+# ROS header.stamp -> epoch 초 (ROS1 secs/nsecs, ROS2 sec/nanosec 모두 지원)
+def header_stamp(msg):
+    stamp = (msg.get('header') or {}).get('stamp')
+    if not stamp:
+        return None
+    sec = stamp.get('sec', stamp.get('secs', 0))
+    nsec = stamp.get('nanosec', stamp.get('nsecs', 0))
+    return sec + nsec * 1e-9
+
+
 # ROS 토픽 데이터를 WebSocket 전송용 JSON으로 변환
 def process_ros_data(topic_name, msg, robot_name="unknown"):
     timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
@@ -39,7 +54,8 @@ def process_ros_data(topic_name, msg, robot_name="unknown"):
                 "orientation": ori,
                 "theta": theta,
                 "linear": twist['linear'],
-                "angular": twist['angular']
+                "angular": twist['angular'],
+                "stamp": header_stamp(msg)
             }
         }
 
@@ -57,7 +73,8 @@ def process_ros_data(topic_name, msg, robot_name="unknown"):
                 "x": round(pose['position']['x'], 3),
                 "y": round(pose['position']['y'], 3),
                 "theta": theta,
-                "orientation": ori
+                "orientation": ori,
+                "stamp": header_stamp(msg)
             }
         }
 
@@ -135,20 +152,18 @@ def process_ros_data(topic_name, msg, robot_name="unknown"):
             }
         }
 
-    # NAV: 경로 포인트
+    # NAV: 경로 포인트 (전체 경로를 예산 내로 단순화, [x0, y0, x1, y1, ...])
     elif topic_name == '/nav':
-        path = msg.get('poses', [])
-        simplified = [
-            {"x": p['pose']['position']['x'], "y": p['pose']['position']['y']}
-            for p in path
-        ]
+        points = extract_path(msg.get('poses', []))
+        simplified = simplify_path(points, NAV_PATH_BUDGET, NAV_PATH_TOLERANCE)
 
         return {
             "type": "nav",
             "payload": {
                 "robot_name": robot_name,
                 "timestamp": timestamp,
-                "path_points": simplified[:50]
+                "path": flatten_path(simplified),
+                "source_points": len(points)
             }
         }
 
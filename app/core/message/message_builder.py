@@ -42,7 +42,8 @@ def build_message(topic_type: str, data: dict) -> dict:
             "orientation": ori,
             "linear": data.get("linear", {}),
             "angular": data.get("angular", {}),
-            "theta": theta
+            "theta": theta,
+            "stamp": data.get("stamp"),
         }
 
     # AMCL 전역 위치
@@ -53,7 +54,8 @@ def build_message(topic_type: str, data: dict) -> dict:
             "x": data.get("x"),
             "y": data.get("y"),
             "theta": data.get("theta"),
-            "orientation": data.get("orientation", {})
+            "orientation": data.get("orientation", {}),
+            "stamp": data.get("stamp"),
         }
 
     # 속도 명령
@@ -80,7 +82,8 @@ def build_message(topic_type: str, data: dict) -> dict:
         payload = {
             "robot_name": robot_name,
             "timestamp": timestamp,
-            "path_points": data.get("path_points", []),
+            "path": data.get("path", []),
+            "source_points": data.get("source_points", 0),
         }
 
     # 텔레옵 키 입력
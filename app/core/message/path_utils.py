@@ -0,0 +1,76 @@
+import math
+import heapq
+import numpy as np
+
+
+# nav_msgs/Path poses → (N, 2) 좌표 배열 (중간 dict/tuple 생성 없이 추출)
+def extract_path(poses: list) -> np.ndarray:
+    n = len(poses)
+    points = np.empty((n, 2), dtype=np.float64)
+    if not n:
+        return points
+
+    positions = [p['pose']['position'] for p in poses]
+    points[:, 0] = np.fromiter((pos['x'] for pos in positions), dtype=np.float64, count=n)
+    points[:, 1] = np.fromiter((pos['y'] for pos in positions), dtype=np.float64, count=n)
+    return points
+
+
+# 구간 [i, j] 내부 점 중 현(chord)에서 가장 먼 점 → (거리, 인덱스)
+def _farthest(xs: np.ndarray, ys: np.ndarray, i: int, j: int) -> tuple[float, int]:
+    if j - i < 2:
+        return 0.0, -1
+
+    ax, ay = float(xs[i]), float(ys[i])
+    sx, sy = float(xs[j]) - ax, float(ys[j]) - ay
+    length = math.hypot(sx, sy)
+
+    if length == 0.0:
+        # 시작 = 끝 (왕복 경로): 시작점과의 거리
+        dist = np.hypot(xs[i + 1:j] - ax, ys[i + 1:j] - ay)
+        k = int(np.argmax(dist))
+        return float(dist[k]), i + 1 + k
+
+    # 2D 외적 크기 (argmax 후 해당 값만 길이로 나눠 수직 거리 산출)
+    cross = np.abs((xs[i + 1:j] - ax) * sy - (ys[i + 1:j] - ay) * sx)
+    k = int(np.argmax(cross))
+    return float(cross[k]) / length, i + 1 + k
+
+
+# Ramer–Douglas–Peucker 단순화 (점 개수 예산 + 허용 오차)
+# - 오차가 큰 구간부터 분할하므로 예산 내에서 형태 보존이 최대인 점을 우선 선택
+# - 항상 시작/끝 점 포함, 원래 순서 유지
+def simplify_path(points: np.ndarray, budget: int = 100, tolerance: float = 0.0) -> np.ndarray:
+    n = len(points)
+    if n <= max(budget, 2):
+        return points
+
+    xs = np.ascontiguousarray(points[:, 0])
+    ys = np.ascontiguousarray(points[:, 1])
+
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    kept = 2
+
+    dist, k = _farthest(xs, ys, 0, n - 1)
+    heap = [(-dist, 0, n - 1, k)]
+
+    while heap and kept < budget:
+        neg, i, j, k = heapq.heappop(heap)
+        if k < 0 or -neg <= tolerance:
+            break
+
+        keep[k] = True
+        kept += 1
+
+        for a, b in ((i, k), (k, j)):
+            d, m = _farthest(xs, ys, a, b)
+            if m >= 0:
+                heapq.heappush(heap, (-d, a, b, m))
+
+    return points[keep]
+
+
+# 좌표 배열 → [x0, y0, x1, y1, ...] (소수점 3자리, mm 단위)
+def flatten_path(points: np.ndarray, decimals: int = 3) -> list:
+    return np.round(points, decimals).ravel().tolist()
@@ -0,0 +1,330 @@
+import time
+import bisect
+import threading
+
+# 기본 지연 시간 히스토그램 버킷 (초)
+DEFAULT_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+)
+
+# 등록된 전체 수집기 목록
+_registry = []
+
+
+# 라벨 값 → Prometheus 라벨 문자열 변환
+def _format_labels(names, values, extra=None):
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+# 라벨 값 이스케이프
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# 스레드별 샤드 기반 수집기 공통 베이스
+# - 각 스레드는 자기 샤드 dict만 갱신하므로 락 없이 안전
+# - 수집 시점에만 샤드를 합산
+class _ShardedCollector:
+    def __init__(self, name: str, doc: str, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labels)
+        self._local = threading.local()
+        self._shards = []
+        _registry.append(self)
+
+    # 현재 스레드 전용 샤드 반환 (최초 호출 시 생성)
+    def _shard(self) -> dict:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = {}
+            self._local.shard = shard
+            self._shards.append(shard)
+            return shard
+
+    # 샤드 스냅샷 (dict 복사는 GIL 안에서 원자적으로 수행)
+    def _snapshots(self):
+        return [dict(s) for s in list(self._shards)]
+
+
+# 단조 증가 카운터
+class Counter(_ShardedCollector):
+    kind = "counter"
+
+    def inc(self, *labels, amount: float = 1.0):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def collect(self):
+        total = {}
+        for snap in self._snapshots():
+            for key, value in snap.items():
+                total[key] = total.get(key, 0.0) + value
+
+        for key, value in sorted(total.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value:g}"
+
+
+# 누적 버킷 히스토그램
+class Histogram(_ShardedCollector):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # [버킷별 카운트..., +Inf 카운트, 합계]
+            state = [0] * (len(self.buckets) + 1) + [0.0]
+            shard[labels] = state
+
+        state[bisect.bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    # with 블록 실행 시간 측정
+    def time(self, *labels):
+        return _Timer(self, labels)
+
+    # 라벨별 합산 결과 (버킷 카운트 리스트, 합계, 전체 개수)
+    def totals(self) -> dict:
+        merged = {}
+        for snap in self._snapshots():
+            for key, state in snap.items():
+                state = list(state)
+                acc = merged.get(key)
+                if acc is None:
+                    merged[key] = state
+                else:
+                    for i, v in enumerate(state):
+                        acc[i] += v
+
+        return {
+            key: (state[:-1], state[-1], sum(state[:-1]))
+            for key, state in merged.items()
+        }
+
+    def collect(self):
+        for key, (counts, total, count) in sorted(self.totals().items()):
+            cumulative = 0
+            for bound, c in zip(self.buckets, counts):
+                cumulative += c
+                le = _format_labels(self.labelnames, key, f'le="{bound:g}"')
+                yield f"{self.name}_bucket{le} {cumulative}"
+
+            le = _format_labels(self.labelnames, key, 'le="+Inf"')
+            yield f"{self.name}_bucket{le} {count}"
+
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {total:.6f}"
+            yield f"{self.name}_count{labels} {count}"
+
+
+# Histogram.time() 컨텍스트 매니저
+class _Timer:
+    __slots__ = ("_hist", "_labels", "_start")
+
+    def __init__(self, hist: Histogram, labels: tuple):
+        self._hist = hist
+        self._labels = labels
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.observe(time.perf_counter() - self._start, *self._labels)
+        return False
+
+
+# 현재 값 게이지 (set 또는 수집 시점 콜백)
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, doc: str, labels=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labels)
+        self._values = {}
+        self._func = None
+        _registry.append(self)
+
+    def set(self, value: float, *labels):
+        self._values[labels] = value
+
+    # 수집 시 호출할 함수 지정 (라벨 없는 게이지 전용)
+    def set_function(self, func):
+        self._func = func
+
+    def collect(self):
+        if self._func is not None:
+            yield f"{self.name} {float(self._func()):g}"
+            return
+
+        for key, value in sorted(dict(self._values).items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {value:g}"
+
+
+# Prometheus text format(0.0.4) 렌더링
+def render() -> str:
+    lines = []
+    for c in list(_registry):
+        lines.append(f"# HELP {c.name} {c.doc}")
+        lines.append(f"# TYPE {c.name} {c.kind}")
+        lines.extend(c.collect())
+    return "\n".join(lines) + "\n"
+
+
+# ─────────────────────────────────────────
+# 서버 전역 수집기
+# ─────────────────────────────────────────
+
+# ROS 수신 메시지 수 (로봇/토픽별)
+ros_messages_total = Counter(
+    "wms_ros_messages_total",
+    "ROS messages received from rosbridge",
+    labels=("robot", "topic"),
+)
+
+# ROS 수신 → WS 브로드캐스트 완료까지 지연
+ros_ingest_to_broadcast_seconds = Histogram(
+    "wms_ros_ingest_to_broadcast_seconds",
+    "Latency from ROS callback to WebSocket fan-out completion",
+    labels=("type",),
+)
+
+# 브로드캐스트 1회 팬아웃 소요 시간
+ws_broadcast_seconds = Histogram(
+    "wms_ws_broadcast_seconds",
+    "Time spent fanning out one broadcast to all WebSocket clients",
+)
+
+# 전송 실패로 버려진 프레임 수
+ws_dropped_frames_total = Counter(
+    "wms_ws_dropped_frames_total",
+    "Broadcast frames dropped because a client send failed",
+)
+
+# 전송 형식별 WS 송신 바이트 (json / compact / binary)
+ws_sent_bytes_total = Counter(
+    "wms_ws_sent_bytes_total",
+    "Bytes sent to WebSocket clients per wire format",
+    labels=("format",),
+)
+
+# 목록 GET 캐시 결과 (리소스별 hit / miss / not_modified)
+list_cache_total = Counter(
+    "wms_list_cache_total",
+    "List endpoint cache lookups per resource and result",
+    labels=("resource", "result"),
+)
+
+# 현재 WS 클라이언트 수
+ws_clients = Gauge(
+    "wms_ws_clients",
+    "Currently connected WebSocket clients",
+)
+
+# DB 쿼리 실행 시간
+db_query_seconds = Histogram(
+    "wms_db_query_seconds",
+    "SQL statement execution latency",
+)
+
+# DB 커밋 시간
+db_commit_seconds = Histogram(
+    "wms_db_commit_seconds",
+    "Session commit latency",
+)
+
+# HTTP 핸들러 처리 시간 (라우터/메서드별)
+http_request_seconds = Histogram(
+    "wms_http_request_seconds",
+    "HTTP handler latency per router",
+    labels=("router", "method"),
+)
+
+# asyncio 이벤트 루프 지연 (예정 시각 대비 깨어난 시각 차이)
+loop_lag_seconds = Histogram(
+    "wms_event_loop_lag_seconds",
+    "Asyncio event loop scheduling lag",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+# 임계치 이상 루프 블로킹 발생 횟수
+loop_blocked_total = Counter(
+    "wms_event_loop_blocked_total",
+    "Times the event loop was blocked beyond the configured threshold",
+)
+
+# 로봇 상태별 체류 시간 (서버 상태 기계 기준)
+robot_state_seconds = Histogram(
+    "wms_robot_state_seconds",
+    "Time robots spent in each state before leaving it",
+    labels=("state",),
+    buckets=(1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+
+# 로봇 상태 기계 이벤트 수 (이동 / 도착 / 정지 감지 / 시간 초과 등)
+robot_events_total = Counter(
+    "wms_robot_events_total",
+    "Robot state machine events by kind",
+    labels=("event",),
+)
+
+# 로봇 상태 기계 기록 큐 포화로 버려진 DB 기록 작업 수
+robot_fsm_dropped_writes_total = Counter(
+    "wms_robot_fsm_dropped_writes_total",
+    "State machine DB writes dropped because the writer queue was full",
+)
+
+
+# SQLAlchemy 엔진에 쿼리 시간 측정 이벤트 등록
+def instrument_engine(engine):
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("_query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get("_query_start")
+        if stack:
+            db_query_seconds.observe(time.perf_counter() - stack.pop())
+
+
+# 라우터 라벨 추출 (엔드포인트 모듈명, 마운트는 경로)
+def _router_label(scope) -> str:
+    endpoint = scope.get("endpoint")
+    if endpoint is not None:
+        return endpoint.__module__.rsplit(".", 1)[-1]
+    return scope.get("root_path") or "unmatched"
+
+
+# HTTP 지연 측정용 순수 ASGI 미들웨어
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            http_request_seconds.observe(
+                time.perf_counter() - start,
+                _router_label(scope),
+                scope["method"],
+            )
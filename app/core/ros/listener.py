@@ -1,9 +1,14 @@
 import roslibpy
 import json
-import math
+import time
+from app.core.metrics import ros_messages_total
 from app.core.message.data_processor import process_ros_data
 from app.core.message.message_builder import build_message
+from app.core.telemetry.ring_buffer import telemetry_store
+from app.core.telemetry.recorder import telemetry_recorder
+from app.core.telemetry.replay import ros_capture
 from app.websocket.manager import ws_manager
+from app.core.fleet.state_machine import robot_fsm
 
 
 class RosListener:
@@ -40,7 +45,17 @@ class RosListener:
         self.topics.append(topic)
         print(f"[ROS] Subscribe → {topic_name} ({msg_type})")
 
+    # 재생 메시지(ros 없음)는 브로드캐스트 / 최근 이력만 반영
+    # - 캡처 / 영구 기록 / 상태 기계 / 배치 진행은 실시간 수신만 반영 (재기록 방지, 실제 로봇 작업 보호)
     def _handle_message(self, topic_name, msg):
+        ingest_ts = time.perf_counter()
+        ros_messages_total.inc(self.robot_name, topic_name)
+        live = self.ros is not None
+
+        # 실시간 수신 원본 캡처 (재생 입력용, 재생 중 메시지는 제외)
+        if ros_capture and live:
+            ros_capture.write(self.robot_name, topic_name, msg)
+
         try:
             # /nav 도착 이벤트(ARRIVED:PIN) 처리
             if topic_name == "/nav":
@@ -49,12 +64,9 @@ class RosListener:
                     pin_name = text.replace("ARRIVED:", "")
                     print(f"[ROS] 🏁 도착 신호 → {pin_name}")
 
-                    # WAIT 도착이면 대기중 상태 브로드캐스트
-                    if pin_name == "WAIT":
-                        ws_manager.broadcast({
-                            "type": "robot_status",
-                            "payload": {"state": "대기중"}
-                        })
+                    # 서버 상태 기계 반영 (도착 / 복귀 완료 상태 + 로그)
+                    if live:
+                        robot_fsm.on_arrived(self.robot_name, pin_name)
 
                     # 도착 이벤트 브로드캐스트
                     ws_manager.broadcast({
@@ -64,6 +76,11 @@ class RosListener:
                             "robot_name": self.robot_name
                         }
                     })
+
+                    # 배치 작업 진행 반영 (다음 트립 시작 등)
+                    if live:
+                        from app.services.batch_order_service import batch_runner
+                        batch_runner.on_arrived(self.robot_name, pin_name)
                     return
 
             # ROS 메시지 -> 전송용 데이터 변환
@@ -79,32 +96,21 @@ class RosListener:
             if "payload" in data:
                 data["payload"]["robot_name"] = self.robot_name
 
+            # 최근 이력 링 버퍼 기록 (pose / odom / battery)
+            telemetry_store.record_message(self.robot_name, data)
+
+            # odom 속도 → 상태 기계 정지 감지
+            if data["type"] == "odom" and live:
+                p = data["payload"]
+                robot_fsm.on_odom(self.robot_name, p["linear"].get("x", 0.0), p["angular"].get("z", 0.0))
+
+            # 영구 기록기 큐 적재 (활성화된 경우)
+            if telemetry_recorder and live:
+                telemetry_recorder.submit(self.robot_name, data)
+
             # 최종 WS 메시지 생성 후 브로드캐스트
             ws_msg = build_message(data["type"], data["payload"])
-            ws_manager.broadcast(ws_msg)
-
-            # /amcl_pose 최신 좌표 캐시 저장
-            if topic_name == "/amcl_pose":
-                try:
-                    from app.core.ros.ros_manager import ros_manager
-
-                    px = msg["pose"]["pose"]["position"]["x"]
-                    py = msg["pose"]["pose"]["position"]["y"]
-
-                    q = msg["pose"]["pose"]["orientation"]
-                    theta = math.atan2(
-                        2 * (q["w"] * q["z"] + q["x"] * q["y"]),
-                        1 - 2 * (q["y"]**2 + q["z"]**2)
-                    )
-
-                    ros_manager.last_pose[self.robot_name] = {
-                        "x": px,
-                        "y": py,
-                        "theta": theta
-                    }
-
-                except Exception as e:
-                    print("[ROS] 좌표 저장 오류:", e)
+            ws_manager.broadcast(ws_msg, ingest_ts=ingest_ts)
 
         except Exception as e:
             print(f"[ROS] ⚠️ {topic_name} 처리 오류:", e)
@@ -1,7 +1,12 @@
 import threading
 import time
+import functools
 import roslibpy
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+from app.core.broker import broker
 from app.websocket.manager import ws_manager
+from app.websocket.state_store import state_store
 from app.core.ros.listener import RosListener
 from app.core.ros.publisher import RosPublisher
 
@@ -15,6 +20,30 @@ AUTO_SPEED = {
 # UI 명령 토픽 메시지 타입
 UI_CMD_TYPE = "std_msgs/String"
 
+# 다른 워커에서 ROS 소유 워커로 전달 가능한 명령
+ROS_COMMANDS = (
+    "connect_robot",
+    "disconnect_robot",
+    "send_cmd_vel",
+    "send_ui_command",
+    "set_auto_speed_level",
+)
+
+
+# ROS 소유 워커가 아니면 브로커로 명령 전달 (응답 없음)
+def owner_only(method):
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not broker.is_owner:
+            broker.publish("ros_command", {
+                "method": method.__name__,
+                "args": list(args),
+                "kwargs": kwargs,
+            }, local=False)
+            return None
+        return method(self, *args, **kwargs)
+    return wrapper
+
 
 class ROSRobotConnection:
     # 단일 로봇 rosbridge 연결/구독/퍼블리시 관리
@@ -112,6 +141,9 @@ class ROSRobotConnection:
 
     # 웹소켓으로 연결 상태 브로드캐스트
     def _broadcast_status(self, connected: bool):
+        # 상태 저장소는 전송 제한과 무관하게 항상 반영
+        state_store.set_connection(self.name, connected, self.ip)
+
         now = time.time()
         if now - self._last_broadcast < 3:
             return
@@ -166,13 +198,13 @@ class ROSRobotConnection:
             return
         self.publisher.publish_command(cmd)
 
-    # /wasd_ui_command 퍼블리시
-    def send_ui_command(self, command: str):
+    # /wasd_ui_command 퍼블리시 (실제 전송 여부 반환)
+    def send_ui_command(self, command: str) -> bool:
         print(f"[DEBUG] send_ui_command() 호출됨 → {command}")
 
         if not self.ros or not self.ros.is_connected:
             print(f"[ROS] UI 명령 무시 ({self.name}): ros 연결 없음")
-            return
+            return False
 
         try:
             if not self.ui_topic:
@@ -190,6 +222,7 @@ class ROSRobotConnection:
             self.ui_topic.publish(msg)
 
             print(f"[ROS] 📤 /wasd_ui_command → {command}")
+            return True
 
         except Exception as e:
             print("\n🔥🔥🔥 FATAL ERROR IN UI COMMAND 🔥🔥🔥")
@@ -198,6 +231,7 @@ class ROSRobotConnection:
             import traceback
             traceback.print_exc()
             print("🔥🔥🔥 END OF TRACEBACK 🔥🔥🔥\n")
+            return False
 
     # 자동 모드 속도 레벨 설정
     def set_nav2_speed(self, gear: int):
@@ -217,13 +251,26 @@ class ROSRobotConnection:
 class ROSConnectionManager:
     # 여러 로봇 연결 관리 + 활성 로봇 제어
     def __init__(self):
-        self.active_robot: str | None = None
+        self._active_robot: str | None = None
         self.clients: dict[str, ROSRobotConnection] = {}
 
-        # 마지막 로봇 좌표 캐시
-        self.last_pose = {}
+        # 다른 워커가 전달한 명령 실행 (수신 순서 유지)
+        self._command_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ros-command")
+
+    # 활성 로봇 (변경 시 상태 저장소 동기화, 비소유 워커는 복제된 상태 사용)
+    @property
+    def active_robot(self) -> str | None:
+        if not broker.is_owner:
+            return state_store.active_robot
+        return self._active_robot
+
+    @active_robot.setter
+    def active_robot(self, name: str | None):
+        self._active_robot = name
+        state_store.set_active(name)
 
     # 로봇 연결/활성화
+    @owner_only
     def connect_robot(self, name: str, ip: str):
         existing = self.clients.get(name)
 
@@ -242,7 +289,13 @@ class ROSConnectionManager:
                 print(f"[ROS] ❌ {name} 재연결 실패")
             return
 
-        if self.active_robot and self.active_robot in self.clients and self.active_robot != name:
+        # 단일 로봇 모드: 기존 활성 로봇 연결 해제 후 전환
+        if (
+            not settings.ROS_MULTI_ROBOT
+            and self.active_robot
+            and self.active_robot in self.clients
+            and self.active_robot != name
+        ):
             self.clients[self.active_robot].disconnect()
 
         client = ROSRobotConnection(name, ip)
@@ -255,23 +308,39 @@ class ROSConnectionManager:
             print(f"[ROS] ❌ {name} 연결 실패")
 
     # 로봇 연결 해제
+    @owner_only
     def disconnect_robot(self, name: str):
         if name in self.clients:
             self.clients[name].disconnect()
             del self.clients[name]
+            state_store.set_connection(name, False)
             print(f"[ROS] 🔴 {name} 연결 해제 완료")
 
         if self.active_robot == name:
             self.active_robot = None
 
+    # ROS 소유권 상실 시 보유 연결 전체 해제 (로컬 전용, 활성 로봇은 새 소유 워커가 지정)
+    def release_all(self):
+        for name, client in list(self.clients.items()):
+            client.disconnect()
+            print(f"[ROS] 🔴 {name} 연결 반납 (소유권 상실)")
+        self.clients.clear()
+        self._active_robot = None
+
     # 로봇 상태 조회
     def get_status(self, name: str):
+        if not broker.is_owner:
+            robot = state_store.robots.get(name) or {}
+            connected = bool(robot.get("connected"))
+            return {"connected": connected, "ip": robot.get("ip") if connected else None}
+
         if name not in self.clients:
             return {"connected": False, "ip": None}
         c = self.clients[name]
         return {"connected": c.connected, "ip": c.ip}
 
     # cmd_vel 전송
+    @owner_only
     def send_cmd_vel(self, payload: dict):
         if not self.active_robot or self.active_robot not in self.clients:
             print("[ROS] cmd_vel 무시: 활성 로봇 없음")
@@ -279,16 +348,24 @@ class ROSConnectionManager:
         client = self.clients[self.active_robot]
         client.send_cmd_vel(payload)
 
-    # UI 명령 전송
-    def send_ui_command(self, command: str):
+    # UI 명령 전송 (robot_name 미지정 시 활성 로봇)
+    @owner_only
+    def send_ui_command(self, command: str, robot_name: str | None = None):
         print(f"[DEBUG] send_ui_command() 호출됨 → {command}")
-        if not self.active_robot or self.active_robot not in self.clients:
-            print("[ROS] UI 명령 무시: 활성 로봇 없음")
+        name = robot_name or self.active_robot
+        if not name or name not in self.clients:
+            print(f"[ROS] UI 명령 무시: 연결된 로봇 없음 ({name})")
             return
-        client = self.clients[self.active_robot]
-        client.send_ui_command(command)
+        client = self.clients[name]
+        if not client.send_ui_command(command):
+            return
+
+        # 서버 상태 기계 반영 (이동 / 복귀 / 충전 시작, 실제 전송된 명령만)
+        from app.core.fleet.state_machine import robot_fsm
+        robot_fsm.on_command(name, command)
 
     # 자동 모드 속도 설정
+    @owner_only
     def set_auto_speed_level(self, gear: int):
         if not self.active_robot or self.active_robot not in self.clients:
             print("[NAV2] auto_speed 무시: 활성 로봇 없음")
@@ -296,6 +373,25 @@ class ROSConnectionManager:
         client = self.clients[self.active_robot]
         client.set_nav2_speed(gear)
 
+    # 다른 워커가 전달한 ROS 명령 수신 (소유 워커만 실행)
+    def handle_remote_command(self, message: dict, remote: bool):
+        if not remote or not broker.is_owner:
+            return
+        method = message.get("method")
+        if method not in ROS_COMMANDS:
+            print(f"[ROS] 알 수 없는 원격 명령 무시: {method}")
+            return
+        self._command_executor.submit(
+            self._run_command, method, message.get("args") or [], message.get("kwargs") or {}
+        )
+
+    def _run_command(self, method: str, args: list, kwargs: dict):
+        try:
+            getattr(self, method)(*args, **kwargs)
+        except Exception as e:
+            print(f"[ROS] 원격 명령 {method} 실행 오류:", e)
+
 
 # 전역 인스턴스
-ros_manager = ROSConnectionManager()
\ No newline at end of file
+ros_manager = ROSConnectionManager()
+broker.subscribe("ros_command", ros_manager.handle_remote_command)
\ No newline at end of file
@@ -0,0 +1,110 @@
+import os
+import gzip
+import threading
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 (없으면 gzip 만 제공)
+    brotli = None
+
+# 사전 압축 대상 확장자
+COMPRESSIBLE = (".js", ".css")
+
+
+# Accept-Encoding 에서 사용할 인코딩 선택 (br > gzip, q=0 제외)
+def _negotiate(accept_encoding: str, variants: dict):
+    accepted = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token.strip().lower()] = q
+
+    for encoding in ("br", "gzip"):
+        if encoding in variants and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+# 정적 파일 + JS/CSS 사전 압축 (gzip / brotli)
+# - 마운트 시 대상 파일 전체를 압축해 메모리에 보관, 파일 수정 시각이 바뀌면 다시 압축
+# - 인코딩별 ETag 구분 (원본 ETag + "-br" / "-gzip"), Vary: Accept-Encoding
+# - Cache-Control: no-cache → 매 방문 재검증, 변경 없으면 304 (본문 재전송 없음)
+class PrecompressedStaticFiles(StaticFiles):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._variants: dict[str, tuple] = {}  # 경로 → ((mtime, size), {인코딩: 본문})
+        self._lock = threading.Lock()
+        self.warm()
+
+    # 대상 파일 일괄 사전 압축
+    def warm(self):
+        if not self.directory or not os.path.isdir(self.directory):
+            return
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(COMPRESSIBLE):
+                    path = os.path.join(root, name)
+                    self._compressed(path, os.stat(path))
+
+    def _compressed(self, full_path, stat_result) -> dict:
+        key = (stat_result.st_mtime_ns, stat_result.st_size)
+        entry = self._variants.get(str(full_path))
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        with open(full_path, "rb") as f:
+            raw = f.read()
+
+        variants = {"gzip": gzip.compress(raw, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants["br"] = brotli.compress(raw, quality=11)
+
+        # 압축 이득이 없는 인코딩 제외
+        variants = {enc: body for enc, body in variants.items() if len(body) < len(raw)}
+
+        with self._lock:
+            self._variants[str(full_path)] = (key, variants)
+        return variants
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        if status_code != 200 or not str(full_path).endswith(COMPRESSIBLE):
+            response = super().file_response(full_path, stat_result, scope, status_code)
+            response.headers.setdefault("Cache-Control", "no-cache")
+            return response
+
+        request_headers = Headers(scope=scope)
+        variants = self._compressed(full_path, stat_result)
+        encoding = _negotiate(request_headers.get("accept-encoding", ""), variants)
+
+        # 원본 응답 헤더 (ETag / Last-Modified / Content-Type) 기준
+        response = FileResponse(full_path, stat_result=stat_result)
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["Vary"] = "Accept-Encoding"
+
+        if encoding is not None:
+            headers = {
+                "ETag": response.headers["etag"][:-1] + f'-{encoding}"',
+                "Last-Modified": response.headers["last-modified"],
+                "Cache-Control": "no-cache",
+                "Vary": "Accept-Encoding",
+                "Content-Encoding": encoding,
+            }
+            response = Response(
+                content=variants[encoding],
+                media_type=response.media_type,
+                headers=headers,
+            )
+
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,382 @@
+import os
+import glob
+import bisect
+import json
+import mmap
+import queue
+import struct
+import threading
+import time
+import numpy as np
+
+from app.core.config import settings
+from app.core.metrics import Counter
+
+# 고정 폭 레코드 (36 bytes, little-endian, 패딩 없음)
+RECORD_DTYPE = np.dtype([
+    ("t", "<f8"),
+    ("robot", "<u4"),
+    ("x", "<f4"),
+    ("y", "<f4"),
+    ("theta", "<f4"),
+    ("v", "<f4"),
+    ("w", "<f4"),
+    ("battery", "<f4"),
+])
+
+# 세그먼트 헤더: magic, record_size, capacity, count, start_t
+HEADER_FMT = "<8sIIQd"
+HEADER_SIZE = 64
+MAGIC = b"WMSTLM01"
+_COUNT_OFFSET = struct.calcsize("<8sII")
+
+# 로봇 이름 ↔ 번호 매핑 파일
+ROBOT_INDEX_FILE = "robots.json"
+
+# 큐 포화로 버려진 레코드 수
+recorder_dropped_total = Counter(
+    "wms_telemetry_recorder_dropped_total",
+    "Telemetry records dropped because the recorder queue was full",
+)
+
+
+# 세그먼트 파일 경로 (시작 시각 ms 기준 정렬 가능)
+def _segment_path(directory: str, start_t: float) -> str:
+    return os.path.join(directory, f"seg_{int(start_t * 1000):013d}.tlm")
+
+
+# 세그먼트 헤더 읽기 → (capacity, count, start_t)
+def _read_header(buf) -> tuple[int, int, float]:
+    magic, rec_size, capacity, count, start_t = struct.unpack_from(HEADER_FMT, buf, 0)
+    if magic != MAGIC or rec_size != RECORD_DTYPE.itemsize:
+        raise ValueError("잘못된 텔레메트리 세그먼트 형식")
+    return capacity, count, start_t
+
+
+# 메모리 매핑 세그먼트 파일 (사전 할당 후 순차 기록)
+class _Segment:
+    def __init__(self, path: str, capacity: int, start_t: float):
+        self.path = path
+        self.capacity = capacity
+        self.count = 0
+
+        size = HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+        with open(path, "wb") as f:
+            f.truncate(size)
+
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), size)
+        struct.pack_into(HEADER_FMT, self._mm, 0, MAGIC, RECORD_DTYPE.itemsize, capacity, 0, start_t)
+
+        self.records = np.ndarray(
+            shape=(capacity,), dtype=RECORD_DTYPE, buffer=self._mm, offset=HEADER_SIZE
+        )
+
+    @property
+    def full(self) -> bool:
+        return self.count >= self.capacity
+
+    def append(self, rec: tuple):
+        self.records[self.count] = rec
+        self.count += 1
+
+    # 기록 개수 헤더 반영 (reader는 count까지만 읽음)
+    def commit(self):
+        struct.pack_into("<Q", self._mm, _COUNT_OFFSET, self.count)
+
+    def close(self):
+        self.commit()
+        self.records = None
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+
+
+# ROS 수신 스레드와 분리된 텔레메트리 기록기
+# - submit()은 로봇별 최신 상태 병합 + 큐 적재만 수행 (블로킹 없음)
+# - 전용 스레드가 mmap 세그먼트에 순차 기록, 용량 초과 시 회전
+class TelemetryRecorder:
+    def __init__(
+        self,
+        directory: str,
+        segment_records: int = 100_000,
+        retention_hours: float = 72.0,
+        min_interval: float = 0.1,
+        queue_size: int = 10_000,
+    ):
+        self.directory = directory
+        self.segment_records = segment_records
+        self.retention_hours = retention_hours
+        self.min_interval = min_interval
+
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._segment: _Segment | None = None
+
+        # 로봇별 병합 상태 / 번호 매핑
+        self._state: dict[str, dict] = {}
+        self._robot_ids: dict[str, int] = {}
+        self._ids_lock = threading.Lock()
+        self._ids_dirty = False  # 새 로봇 번호 발급 후 robots.json 미반영 (기록 스레드에서 저장)
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_robot_ids()
+
+    def _load_robot_ids(self):
+        path = os.path.join(self.directory, ROBOT_INDEX_FILE)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._robot_ids = {k: int(v) for k, v in json.load(f).items()}
+
+    # 변경된 번호 매핑 저장 (기록 스레드 전용, 파일 쓰기는 lock 밖에서)
+    def _save_robot_ids(self):
+        with self._ids_lock:
+            if not self._ids_dirty:
+                return
+            ids = dict(self._robot_ids)
+            self._ids_dirty = False
+
+        path = os.path.join(self.directory, ROBOT_INDEX_FILE)
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(ids, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print("[REC] ⚠️ 로봇 번호 매핑 저장 실패:", e)
+            with self._ids_lock:
+                self._ids_dirty = True
+
+    # 로봇 번호 (새 로봇은 메모리에서만 발급, 파일 저장은 기록 스레드)
+    def _robot_id(self, name: str) -> int:
+        rid = self._robot_ids.get(name)
+        if rid is None:
+            with self._ids_lock:
+                rid = self._robot_ids.get(name)
+                if rid is None:
+                    rid = len(self._robot_ids) + 1
+                    self._robot_ids[name] = rid
+                    self._ids_dirty = True
+        return rid
+
+    # 기록 스레드 시작
+    def start(self):
+        if self._thread:
+            return
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        print(f"[REC] 텔레메트리 기록 시작 → {self.directory}")
+
+    # 남은 큐를 기록하고 종료
+    def stop(self):
+        if not self._thread:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    # ROS 변환 데이터 제출 (ROS 콜백 스레드에서 호출)
+    def submit(self, robot: str, data: dict, t: float | None = None):
+        msg_type = data.get("type")
+        if msg_type not in ("amcl_pose", "odom", "battery"):
+            return
+
+        p = data.get("payload") or {}
+        state = self._state.get(robot)
+        if state is None:
+            state = self._state.setdefault(robot, {
+                "x": 0.0, "y": 0.0, "theta": 0.0, "v": 0.0, "w": 0.0,
+                "battery": float("nan"), "has_amcl": False, "last_t": 0.0,
+            })
+
+        try:
+            if msg_type == "battery":
+                state["battery"] = float(p["percentage"])
+                return
+
+            if msg_type == "amcl_pose":
+                state["x"], state["y"], state["theta"] = p["x"], p["y"], p["theta"]
+                state["has_amcl"] = True
+            else:
+                # 전역 좌표(amcl)가 없을 때만 odom 좌표 사용
+                if not state["has_amcl"]:
+                    pos = p["position"]
+                    state["x"], state["y"], state["theta"] = pos["x"], pos["y"], p["theta"]
+                state["v"] = p["linear"].get("x", 0.0)
+                state["w"] = p["angular"].get("z", 0.0)
+        except (KeyError, TypeError) as e:
+            print(f"[REC] {msg_type} 상태 병합 실패:", e)
+            return
+
+        t = time.time() if t is None else t
+        if t - state["last_t"] < self.min_interval:
+            return
+        state["last_t"] = t
+
+        rec = (
+            t, self._robot_id(robot),
+            state["x"], state["y"], state["theta"],
+            state["v"], state["w"], state["battery"],
+        )
+        try:
+            self._queue.put_nowait(rec)
+        except queue.Full:
+            recorder_dropped_total.inc()
+
+    # 기록 스레드 본체 (큐 배치 처리)
+    def _run(self):
+        running = True
+        while running:
+            item = self._queue.get()
+            batch = [item]
+            while len(batch) < 1024:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            # 레코드보다 번호 매핑을 먼저 저장 (조회 시 이름 없는 번호 방지)
+            self._save_robot_ids()
+
+            for rec in batch:
+                if rec is None:
+                    running = False
+                    continue
+                try:
+                    self._write(rec)
+                except Exception as e:
+                    print("[REC] ⚠️ 레코드 기록 실패:", e)
+
+            if self._segment:
+                self._segment.commit()
+
+        if self._segment:
+            self._segment.close()
+            self._segment = None
+
+    def _write(self, rec: tuple):
+        if self._segment is None or self._segment.full:
+            self._rotate(rec[0])
+        self._segment.append(rec)
+
+    # 새 세그먼트 생성 + 보존 기간 지난 세그먼트 삭제
+    def _rotate(self, start_t: float):
+        if self._segment:
+            self._segment.close()
+
+        path = _segment_path(self.directory, start_t)
+        self._segment = _Segment(path, self.segment_records, start_t)
+        print(f"[REC] 새 세그먼트 → {os.path.basename(path)}")
+        self._apply_retention(start_t)
+
+    def _apply_retention(self, now: float):
+        cutoff = now - self.retention_hours * 3600
+        paths = sorted(glob.glob(os.path.join(self.directory, "seg_*.tlm")))
+
+        # 다음 세그먼트 시작 시각이 cutoff 이전이면 전체가 보존 기간 밖
+        for path, nxt in zip(paths, paths[1:]):
+            if _segment_start(nxt) >= cutoff:
+                break
+            try:
+                os.remove(path)
+                print(f"[REC] 보존 기간 만료 세그먼트 삭제 → {os.path.basename(path)}")
+            except OSError as e:
+                print("[REC] 세그먼트 삭제 실패:", e)
+
+
+# 파일명에서 세그먼트 시작 시각 추출
+def _segment_start(path: str) -> float:
+    return int(os.path.basename(path)[4:-4]) / 1000
+
+
+# 세그먼트 내 timestamp 이진 탐색용 시퀀스 (필요한 페이지만 접근)
+class _TimeColumn:
+    def __init__(self, records: np.ndarray):
+        self._records = records
+
+    def __len__(self):
+        return len(self._records)
+
+    def __getitem__(self, i):
+        return self._records[i]["t"]
+
+
+# 세그먼트 파일 시간 범위 조회기
+class TelemetryReader:
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    # 로봇 번호 → 이름 매핑
+    def robot_names(self) -> dict[int, str]:
+        path = os.path.join(self.directory, ROBOT_INDEX_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            return {int(v): k for k, v in json.load(f).items()}
+
+    def robot_id(self, name: str) -> int | None:
+        for rid, n in self.robot_names().items():
+            if n == name:
+                return rid
+        return None
+
+    # [start, end] 구간 레코드 반환 (구조화 배열 복사본)
+    def read(self, start: float, end: float, robot: str | None = None) -> np.ndarray:
+        rid = None
+        if robot is not None:
+            rid = self.robot_id(robot)
+            if rid is None:
+                return np.empty(0, dtype=RECORD_DTYPE)
+
+        paths = sorted(glob.glob(os.path.join(self.directory, "seg_*.tlm")))
+        chunks = []
+        for i, path in enumerate(paths):
+            # 구간과 겹치지 않는 세그먼트는 열지 않음
+            if _segment_start(path) > end:
+                break
+            if i + 1 < len(paths) and _segment_start(paths[i + 1]) < start:
+                continue
+
+            with open(path, "rb") as f:
+                _, count, _ = _read_header(f.read(HEADER_SIZE))
+            if not count:
+                continue
+
+            records = np.memmap(
+                path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,)
+            )
+            col = _TimeColumn(records)
+            lo = bisect.bisect_left(col, start)
+            hi = bisect.bisect_right(col, end)
+            if hi > lo:
+                part = np.array(records[lo:hi])
+                if rid is not None:
+                    part = part[part["robot"] == rid]
+                chunks.append(part)
+            del records
+
+        if not chunks:
+            return np.empty(0, dtype=RECORD_DTYPE)
+        return np.concatenate(chunks)
+
+
+# 구조화 배열 → 컬럼형 dict (NaN은 None으로 변환)
+def to_columns(rows: np.ndarray) -> dict:
+    result = {"count": int(len(rows)), "t": np.round(rows["t"], 3).tolist()}
+    for name in ("x", "y", "theta", "v", "w", "battery"):
+        col = np.round(rows[name].astype(np.float64), 4)
+        result[name] = [None if v != v else v for v in col.tolist()]
+    return result
+
+
+# 전역 기록기 (TELEMETRY_RECORD_DIR 미설정 시 비활성)
+telemetry_recorder = (
+    TelemetryRecorder(
+        settings.TELEMETRY_RECORD_DIR,
+        segment_records=settings.TELEMETRY_SEGMENT_RECORDS,
+        retention_hours=settings.TELEMETRY_RETENTION_HOURS,
+        min_interval=settings.TELEMETRY_RECORD_INTERVAL,
+    )
+    if settings.TELEMETRY_RECORD_DIR
+    else None
+)
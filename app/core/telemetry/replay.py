@@ -0,0 +1,240 @@
+import os
+import json
+import math
+import threading
+import time
+
+from app.core.config import settings
+from app.core.telemetry.recorder import TelemetryReader
+
+# 배터리 보정 구간 (data_processor와 동일, 기록값 → 원시값 역변환용)
+_BATTERY_MIN_REAL = 27.0
+_BATTERY_MAX_REAL = 100.0
+
+
+# 수신 원본 ROS 메시지를 JSONL로 저장 (재생 입력 생성용)
+# 한 줄 형식: {"t": epoch초, "robot": 이름, "topic": 토픽, "msg": 원본 메시지}
+class MessageCapture:
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, robot: str, topic: str, msg: dict):
+        line = json.dumps(
+            {"t": time.time(), "robot": robot, "topic": topic, "msg": msg},
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+# JSONL 캡처 파일 → (t, robot, topic, msg)
+def read_jsonl(path: str, robot: str | None = None):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                item = json.loads(line)
+            except json.JSONDecodeError as e:
+                print("[REPLAY] 잘못된 JSONL 라인 건너뜀:", e)
+                continue
+            if robot and item.get("robot") != robot:
+                continue
+            yield float(item["t"]), item["robot"], item["topic"], item["msg"]
+
+
+# yaw → quaternion dict
+def _yaw_to_quaternion(theta: float) -> dict:
+    return {"x": 0.0, "y": 0.0, "z": math.sin(theta / 2), "w": math.cos(theta / 2)}
+
+
+# 바이너리 기록 세그먼트 → ROS 메시지 재구성
+# (기록된 병합 상태를 /amcl_pose, /odom, /battery_state 로 되돌림)
+def read_recording(
+    directory: str,
+    start: float = 0.0,
+    end: float = float("inf"),
+    robot: str | None = None,
+):
+    reader = TelemetryReader(directory)
+    names = reader.robot_names()
+    rows = reader.read(start, end, robot=robot)
+
+    last_battery = {}
+    for row in rows:
+        t = float(row["t"])
+        name = names.get(int(row["robot"]), f"robot{int(row['robot'])}")
+        ori = _yaw_to_quaternion(float(row["theta"]))
+        position = {"x": float(row["x"]), "y": float(row["y"]), "z": 0.0}
+
+        yield t, name, "/amcl_pose", {"pose": {"pose": {
+            "position": position, "orientation": ori,
+        }}}
+        yield t, name, "/odom", {
+            "pose": {"pose": {"position": position, "orientation": ori}},
+            "twist": {"twist": {
+                "linear": {"x": float(row["v"]), "y": 0.0, "z": 0.0},
+                "angular": {"x": 0.0, "y": 0.0, "z": float(row["w"])},
+            }},
+        }
+
+        # 배터리는 값이 바뀐 경우만 (NaN = 미수신)
+        pct = float(row["battery"])
+        if pct == pct and last_battery.get(name) != pct:
+            last_battery[name] = pct
+            raw = _BATTERY_MIN_REAL + pct / 100 * (_BATTERY_MAX_REAL - _BATTERY_MIN_REAL)
+            yield t, name, "/battery_state", {"percentage": raw, "power_supply_status": 2}
+
+
+# 소스 경로 → 메시지 이터레이터 (디렉터리는 바이너리 기록, 파일은 JSONL)
+def open_source(path: str, start: float = 0.0, end: float = float("inf"), robot: str | None = None):
+    if os.path.isdir(path):
+        return read_recording(path, start, end, robot)
+    if not os.path.isfile(path):
+        raise FileNotFoundError(path)
+    return (
+        item for item in read_jsonl(path, robot)
+        if start <= item[0] <= end
+    )
+
+
+# 기록된 메시지를 RosListener._handle_message 로 재주입하는 재생기
+# - speed: 1 = 실시간, N = N배속, 0 = 최대 속도 (대기 없음)
+# - 실제 rosbridge 연결 없이 ingest → process → broadcast 경로 전체를 통과
+class ReplayEngine:
+    def __init__(self):
+        self._thread: threading.Thread | None = None
+        self._stop_event = threading.Event()
+        self._listeners = {}
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.source = None
+        self.speed = 1.0
+        self.loop = False
+        self.sent = 0
+        self.by_topic = {}
+        self.started_at = None
+        self.finished_at = None
+        self.max_behind = 0.0
+        self.error = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    # 재생 시작 (이미 실행 중이면 중지 후 재시작)
+    def start(
+        self,
+        source: str,
+        speed: float = 1.0,
+        loop: bool = False,
+        start: float = 0.0,
+        end: float = float("inf"),
+        robot: str | None = None,
+    ):
+        if speed < 0:
+            raise ValueError("speed는 0 이상이어야 합니다 (0 = 최대 속도)")
+        if not os.path.exists(source):
+            raise FileNotFoundError(source)
+
+        self.stop()
+        self._reset_stats()
+        self.source = source
+        self.speed = speed
+        self.loop = loop
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(source, start, end, robot), daemon=True
+        )
+        self._thread.start()
+        print(f"[REPLAY] 재생 시작 → {source} (speed={speed or 'max'}, loop={loop})")
+
+    # 재생 중지
+    def stop(self):
+        if not self._thread:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    def _listener(self, robot: str):
+        listener = self._listeners.get(robot)
+        if listener is None:
+            from app.core.ros.listener import RosListener
+            listener = RosListener(None, robot)
+            self._listeners[robot] = listener
+        return listener
+
+    def _run(self, source, start, end, robot):
+        self.started_at = time.time()
+        try:
+            while True:
+                self._play_once(open_source(source, start, end, robot))
+                if not self.loop or self._stop_event.is_set():
+                    break
+        except Exception as e:
+            self.error = str(e)
+            print("[REPLAY] ⚠️ 재생 오류:", e)
+        finally:
+            self.finished_at = time.time()
+            print(f"[REPLAY] 재생 종료 (sent={self.sent})")
+
+    def _play_once(self, items):
+        first_t = None
+        wall_start = time.perf_counter()
+
+        for t, robot, topic, msg in items:
+            if self._stop_event.is_set():
+                return
+
+            # 기록 시각 간격을 speed 배율로 재현
+            if self.speed > 0:
+                if first_t is None:
+                    first_t = t
+                due = wall_start + (t - first_t) / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    if self._stop_event.wait(delay):
+                        return
+                elif -delay > self.max_behind:
+                    self.max_behind = -delay
+
+            self._listener(robot)._handle_message(topic, msg)
+            self.sent += 1
+            self.by_topic[topic] = self.by_topic.get(topic, 0) + 1
+
+    # /debug/replay 응답용 상태
+    def status(self) -> dict:
+        elapsed = None
+        rate = None
+        if self.started_at:
+            elapsed = (self.finished_at or time.time()) - self.started_at
+            rate = round(self.sent / elapsed, 1) if elapsed > 0 else None
+
+        return {
+            "running": self.running,
+            "source": self.source,
+            "speed": self.speed,
+            "loop": self.loop,
+            "sent": self.sent,
+            "by_topic": dict(self.by_topic),
+            "elapsed": round(elapsed, 3) if elapsed is not None else None,
+            "messages_per_sec": rate,
+            "max_behind": round(self.max_behind, 4),
+            "error": self.error,
+        }
+
+
+# 전역 재생기 / 원본 캡처 (ROS_CAPTURE_PATH 미설정 시 비활성)
+replay_engine = ReplayEngine()
+ros_capture = MessageCapture(settings.ROS_CAPTURE_PATH) if settings.ROS_CAPTURE_PATH else None
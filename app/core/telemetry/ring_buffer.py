@@ -0,0 +1,130 @@
+import time
+import threading
+import numpy as np
+
+from app.core.config import settings
+
+# 토픽별 저장 필드 (0번 컬럼은 항상 timestamp)
+TOPIC_FIELDS = {
+    "pose": ("x", "y", "theta"),
+    "odom": ("x", "y", "theta", "v", "w"),
+    "battery": ("percentage", "voltage"),
+}
+
+# 응답 시 필드별 반올림 자릿수
+_ROUND = {"theta": 4, "v": 3, "w": 3, "percentage": 1, "voltage": 2}
+
+
+# 고정 크기 배열 기반 링 버퍼 (메모리 = capacity × 컬럼 수 × 8 bytes)
+class RingBuffer:
+    def __init__(self, fields: tuple, capacity: int):
+        self.fields = fields
+        self.capacity = capacity
+        self._data = np.zeros((capacity, len(fields) + 1), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    # 마지막 샘플 timestamp
+    @property
+    def last_time(self) -> float:
+        if not self._size:
+            return 0.0
+        return float(self._data[(self._head - 1) % self.capacity, 0])
+
+    # 샘플 추가 (가득 차면 가장 오래된 샘플 덮어쓰기)
+    def append(self, t: float, values):
+        with self._lock:
+            row = self._data[self._head]
+            row[0] = t
+            row[1:] = values
+            self._head = (self._head + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+
+    # since 이후 샘플을 시간순 배열로 복사 반환
+    def since(self, t0: float = 0.0) -> np.ndarray:
+        with self._lock:
+            if self._size < self.capacity:
+                ordered = self._data[:self._size].copy()
+            else:
+                ordered = np.concatenate((self._data[self._head:], self._data[:self._head]))
+
+        start = np.searchsorted(ordered[:, 0], t0, side="right")
+        return ordered[start:]
+
+
+# 로봇 × 토픽별 링 버퍼 저장소
+class TelemetryStore:
+    def __init__(self, capacity: int, min_interval: float):
+        self.capacity = capacity
+        self.min_interval = min_interval
+        self._buffers: dict[tuple[str, str], RingBuffer] = {}
+
+    def _buffer(self, robot: str, topic: str) -> RingBuffer:
+        key = (robot, topic)
+        buf = self._buffers.get(key)
+        if buf is None:
+            buf = self._buffers.setdefault(key, RingBuffer(TOPIC_FIELDS[topic], self.capacity))
+        return buf
+
+    # 샘플 기록 (min_interval보다 촘촘한 샘플은 생략)
+    def record(self, robot: str, topic: str, values, t: float | None = None):
+        t = time.time() if t is None else t
+        buf = self._buffer(robot, topic)
+        if t - buf.last_time < self.min_interval:
+            return
+        buf.append(t, values)
+
+    # ROS 변환 데이터(process_ros_data 결과)에서 샘플 추출
+    def record_message(self, robot: str, data: dict, t: float | None = None):
+        msg_type = data.get("type")
+        p = data.get("payload") or {}
+
+        try:
+            if msg_type == "amcl_pose":
+                self.record(robot, "pose", (p["x"], p["y"], p["theta"]), t)
+            elif msg_type == "odom":
+                pos = p["position"]
+                self.record(robot, "odom", (
+                    pos["x"], pos["y"], p["theta"],
+                    p["linear"].get("x", 0.0), p["angular"].get("z", 0.0),
+                ), t)
+            elif msg_type == "battery":
+                self.record(robot, "battery", (p["percentage"], p["voltage"]), t)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[TELEMETRY] {msg_type} 샘플 기록 실패:", e)
+
+    # 시간순 원본 배열 조회 (없으면 빈 배열)
+    def array(self, robot: str, topic: str, since: float = 0.0) -> np.ndarray:
+        buf = self._buffers.get((robot, topic))
+        if buf is None:
+            return np.empty((0, len(TOPIC_FIELDS[topic]) + 1))
+        return buf.since(since)
+
+    # 컬럼형 응답 (t0 기준 ms 오프셋 + 필드별 값 배열)
+    def query(self, robot: str, topic: str, since: float = 0.0) -> dict:
+        rows = self.array(robot, topic, since)
+        fields = TOPIC_FIELDS[topic]
+
+        t0 = float(rows[0, 0]) if len(rows) else 0.0
+        result = {
+            "robot": robot,
+            "topic": topic,
+            "count": int(len(rows)),
+            "t0": round(t0, 3),
+            "t": np.rint((rows[:, 0] - t0) * 1000).astype(np.int64).tolist(),
+        }
+        for i, name in enumerate(fields, start=1):
+            result[name] = np.round(rows[:, i], _ROUND.get(name, 3)).tolist()
+        return result
+
+
+# 전역 텔레메트리 저장소
+telemetry_store = TelemetryStore(
+    capacity=settings.TELEMETRY_CAPACITY,
+    min_interval=settings.TELEMETRY_MIN_INTERVAL,
+)
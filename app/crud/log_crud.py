@@ -1,3 +1,4 @@
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from app.models.log_model import Log
 from app.schemas.log_schema import LogCreate, LogUpdate
@@ -14,6 +15,16 @@ def get_log_by_id(db: Session, log_id: int):
     return db.query(Log).filter(Log.id == log_id).first()
 
 
+# READ-ALL 전체 로그 조회 (비동기 세션)
+async def get_logs_async(db):
+    return (await db.execute(select(Log))).scalars().all()
+
+
+# READ 단일 로그 조회 (비동기 세션)
+async def get_log_by_id_async(db, log_id: int):
+    return (await db.execute(select(Log).where(Log.id == log_id))).scalars().first()
+
+
 # CREATE 새로운 로그 데이터 추가
 def create_log(db, log_data):
     new_log = Log(**log_data.dict())
@@ -1,10 +1,11 @@
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.templating import Jinja2Templates
-from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import HTMLResponse
 
 from app.core.config import settings
+from app.core.metrics import MetricsMiddleware
+from app.core.static_files import PrecompressedStaticFiles
 
 from app.routers.stock_router import router as stock_router
 from app.routers.robot_router import router as robot_router
@@ -14,12 +15,27 @@ from app.routers.pin_router import router as pin_router
 from app.routers.page_router import router as page_router
 from app.routers.map_router import router as map_router
 from app.routers.stock_csv_router import router as stock_csv_router
-
-from app.websocket.manager import register, unregister, handle_message
-from app.core.database import Base, engine
+from app.routers.metrics_router import router as metrics_router
+from app.routers.debug_router import router as debug_router
+from app.routers.order_router import router as order_router
+from app.routers.fleet_router import router as fleet_router
+from app.routers.analytics_router import router as analytics_router
+
+from app.websocket.manager import register, unregister, handle_message, ws_manager
+from app.core.database import Base, engine, async_engine
+from app.core.broker import broker
 from app.core.ros.ros_manager import ros_manager
-
+from app.core.loop_monitor import loop_monitor
+from app.core.maps.registry import map_registry
+from app.core.maps.travel import travel_matrix
+from app.core.fleet.dispatcher import fleet_dispatcher
+from app.core.fleet.state_machine import robot_fsm
+from app.core.telemetry.recorder import telemetry_recorder
+from app.core.telemetry.replay import replay_engine, ros_capture
+
+import os
 import json
+import asyncio
 
 # FastAPI 앱 생성
 app = FastAPI(title="WMS FastAPI Server", debug=settings.DEBUG)
@@ -33,8 +49,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 정적 파일 마운트
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# HTTP 핸들러 지연 계측
+app.add_middleware(MetricsMiddleware)
+
+# 정적 파일 마운트 (JS/CSS 사전 압축 + 재검증 캐시)
+app.mount("/static", PrecompressedStaticFiles(directory="app/static"), name="static")
 
 # 템플릿 설정
 templates = Jinja2Templates(directory="app/templates")
@@ -47,6 +66,11 @@ app.include_router(log_router)
 app.include_router(category_router)
 app.include_router(pin_router)
 app.include_router(map_router)
+app.include_router(metrics_router)
+app.include_router(debug_router)
+app.include_router(order_router)
+app.include_router(fleet_router)
+app.include_router(analytics_router)
 
 # CSV 라우터 등록 (/stock/csv/*)
 app.include_router(stock_csv_router, prefix="/stock")
@@ -60,7 +84,14 @@ async def root(request: Request):
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     await websocket.accept()
-    await register(websocket)
+
+    # 재접속 복구 기준 (마지막 수신 순번 / 서버 기동 식별자)
+    last_seq = websocket.query_params.get("last_seq")
+    await register(
+        websocket,
+        last_seq=int(last_seq) if last_seq and last_seq.isdigit() else None,
+        epoch=websocket.query_params.get("epoch"),
+    )
     print("[WS] 클라이언트 연결됨 ✅")
 
     try:
@@ -85,12 +116,78 @@ async def websocket_endpoint(websocket: WebSocket):
 def on_startup():
     Base.metadata.create_all(bind=engine)
     print("✅ DB 테이블 자동 생성 완료")
+
+    # 지도 레지스트리 (PGM → PNG 변환 / 타일 생성은 백그라운드) + 핀 간 거리 행렬
+    map_registry.start()
+    travel_matrix.start()
     print("🚀 서버 시작 중... (ROS 연결은 요청 시 활성화)")
 
+# 이벤트 루프 모니터 시작 + WS 브로드캐스트 루프 지정 (실행 중인 루프 필요)
+@app.on_event("startup")
+async def start_loop_monitor():
+    ws_manager.bind_loop(asyncio.get_running_loop())
+    loop_monitor.start()
+
+# 워커 간 브로커 시작 (루프 지정 이후) + ROS 소유 워커 전용 작업 시작
+@app.on_event("startup")
+async def start_broker():
+    broker.start()
+
+    # 작업 배정 / 상태 기계 점검 주기 실행 (소유 워커일 때만 배정, 소유권 이전 대비 전 워커 실행)
+    fleet_dispatcher.start()
+    robot_fsm.start()
+    if broker.is_owner:
+        start_owner_tasks()
+
+# ROS 소유 워커 전용 작업 시작 (기동 시 / 소유권 승계 시)
+def start_owner_tasks():
+    # 텔레메트리 기록 스레드 시작 (설정된 경우)
+    if telemetry_recorder:
+        telemetry_recorder.start()
+
+    # 설정된 경우 기록 데이터 자동 재생
+    if settings.REPLAY_SOURCE:
+        try:
+            replay_engine.start(
+                os.path.join(settings.REPLAY_DIR, settings.REPLAY_SOURCE),
+                speed=settings.REPLAY_SPEED,
+            )
+        except Exception as e:
+            print("[REPLAY] ⚠️ 자동 재생 시작 실패:", e)
+
+# 기동 이후 소유권 변경 (승계: 소유 워커 작업 시작 / 상실: 작업 중지 + 로봇 연결 해제, 새 소유 워커가 재연결)
+def on_owner_change(owner: bool):
+    if owner:
+        start_owner_tasks()
+        return
+    replay_engine.stop()
+    if telemetry_recorder:
+        telemetry_recorder.stop()
+    ros_manager.release_all()
+
+broker.on_owner_change(on_owner_change)
+
+# 비동기 DB 엔진 연결 정리 (이벤트 루프 종료 전)
+@app.on_event("shutdown")
+async def close_async_engine():
+    if async_engine is not None:
+        await async_engine.dispose()
+
 # 서버 종료 이벤트
 @app.on_event("shutdown")
 def on_shutdown():
     print("🛑 서버 종료 중…")
-    if ros_manager.active_robot:
+    loop_monitor.stop()
+    map_registry.stop()
+    travel_matrix.stop()
+    fleet_dispatcher.stop()
+    robot_fsm.stop()
+    replay_engine.stop()
+    if telemetry_recorder:
+        telemetry_recorder.stop()
+    if ros_capture:
+        ros_capture.close()
+    if broker.is_owner and ros_manager.active_robot:
         ros_manager.disconnect_robot(ros_manager.active_robot)
+    broker.stop()
     print("🧹 모든 ROS 연결 종료 완료")
\ No newline at end of file
@@ -3,5 +3,6 @@ from app.models.category_model import Category
 from app.models.pin_model import Pin
 from app.models.robot_model import Robot
 from app.models.stock_model import Stock
+from app.models.move_cycle_model import MoveCycle
 
-__all__ = ["Log", "Category", "Pin", "Robot", "Stock"]
\ No newline at end of file
+__all__ = ["Log", "Category", "Pin", "Robot", "Stock", "MoveCycle"]
\ No newline at end of file
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, BigInteger, Double, Index
+from app.core.database import Base  # SQLAlchemy Base 클래스, 모든 모델은 이 클래스를 상속해야 함
+
+class MoveCycle(Base):
+    __tablename__ = "move_cycle"  # DB 테이블명 지정
+
+    # 로봇별 최근 구간 조회 / 기간 조회용 인덱스
+    __table_args__ = (
+        Index("ix_move_cycle_robot", "robot_name", "id"),
+        Index("ix_move_cycle_dispatched", "dispatched_at"),
+    )
+
+    # 고유 ID, 자동 증가
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    # 로봇 / 목적지 핀
+    robot_name = Column(String(100), nullable=False)
+    pin_name = Column(String(100), nullable=False)
+
+    # 확인된 작업 정보 (확인 전 / 재고 없는 단순 이동은 NULL)
+    stock_id = Column(BigInteger, nullable=True)
+    stock_name = Column(String(100), nullable=True)
+    mode = Column(String(20), nullable=True)       # INBOUND / OUTBOUND
+    quantity = Column(Integer, nullable=True)
+
+    # 단계별 시각 (epoch 초, 도달하지 않은 단계는 NULL)
+    dispatched_at = Column(Double, nullable=False)         # 이동 명령
+    arrived_at = Column(Double, nullable=True)             # 핀 도착
+    confirmed_at = Column(Double, nullable=True)           # 작업 확인
+    return_started_at = Column(Double, nullable=True)      # 복귀 시작 (이 구간 이후 바로 복귀한 경우)
+    returned_at = Column(Double, nullable=True)            # 복귀 완료
\ No newline at end of file
@@ -1,18 +1,30 @@
-from sqlalchemy import Column, String, BigInteger
+from sqlalchemy import Column, String, BigInteger, Float, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base  # SQLAlchemy Base 클래스, 모든 모델은 이 클래스를 상속해야 함
 
 class Pin(Base):
     __tablename__ = "pin"  # DB 테이블명 지정
 
+    # 좌표 범위 조회용 인덱스
+    __table_args__ = (Index("ix_pin_xy", "x", "y"),)
+
     # 고유 ID, 자동 증가
     id = Column(BigInteger, primary_key=True, autoincrement=True)
 
     # 핀 이름
     name = Column(String(100), nullable=False, unique=True)  # 필수, 중복 불가
 
-    # 핀 좌표
-    coords = Column(String(255), nullable=True)  # "x,y" 형태, 옵션 필드
+    # 핀 좌표 (지도 좌표계, m / 방향 rad), 옵션 필드
+    x = Column(Float, nullable=True)
+    y = Column(Float, nullable=True)
+    yaw = Column(Float, nullable=True)
 
     # 역참조 (Stock.pin 연결)
-    stocks = relationship("Stock", back_populates="pin")
\ No newline at end of file
+    stocks = relationship("Stock", back_populates="pin")
+
+    # 기존 "x,y" 문자열 형식 (응답 호환용)
+    @property
+    def coords(self):
+        if self.x is None or self.y is None:
+            return None
+        return f"{self.x},{self.y}"
\ No newline at end of file
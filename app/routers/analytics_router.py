@@ -0,0 +1,40 @@
+import time
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.services.cycle_service import CycleAnalyticsService
+
+# 작업 분석 API 라우터
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+GROUPS = ("pin", "robot", "hour")
+
+
+# DB 세션 의존성
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# 이동 구간 단계별 시간 백분위수 (travel / dwell / return / cycle, 초)
+# - group_by: pin / robot / hour (KST 시간대)
+# - since / until: epoch 초 (기본 최근 7일)
+@router.get("/cycles")
+def read_cycles(
+    group_by: str = "pin",
+    since: float | None = None,
+    until: float | None = None,
+    robot: str | None = None,
+    pin: str | None = None,
+    db: Session = Depends(get_db),
+):
+    if group_by not in GROUPS:
+        raise HTTPException(status_code=400, detail=f"group_by 는 {', '.join(GROUPS)} 중 하나여야 합니다.")
+    until = time.time() if until is None else until
+    since = until - 7 * 86400 if since is None else since
+    return CycleAnalyticsService(db).summary(group_by, since, until, robot, pin)
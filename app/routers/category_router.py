@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select, text
 from typing import List
 from datetime import datetime, timezone, timedelta
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, get_async_db
+from app.core.list_cache import list_cache
 from app.models.category_model import Category
 from app.models.stock_model import Stock
 from app.schemas.category_schema import CategoryResponse, CategoryCreate
@@ -25,10 +26,14 @@ def get_db():
         db.close()
 
 
-# 카테고리 전체 조회
+# 카테고리 전체 조회 (목록 캐시 + ETag, 비동기 세션)
 @router.get("/", response_model=List[CategoryResponse])
-def read_categories(db: Session = Depends(get_db)):
-    return db.query(Category).all()
+async def read_categories(request: Request, db=Depends(get_async_db)):
+    async def build():
+        rows = (await db.execute(select(Category))).scalars().all()
+        return [CategoryResponse.from_orm(row) for row in rows]
+
+    return await list_cache.respond(request, "categories", build)
 
 
 # 카테고리 생성
@@ -39,6 +44,7 @@ def create_category(category: CategoryCreate, db: Session = Depends(get_db)):
     db.add(new_category)
     db.commit()
     db.refresh(new_category)
+    list_cache.invalidate("categories")
 
     # 카테고리 등록 로그 기록
     log_crud.create_log(
@@ -96,6 +102,7 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
     # 카테고리 삭제 처리
     db.delete(category)
     db.commit()
+    list_cache.invalidate("categories")
 
     # 카테고리 테이블 비어있을 경우 AUTO_INCREMENT 초기화
     remaining = db.execute(text("SELECT COUNT(*) FROM category")).scalar()
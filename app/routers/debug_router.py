@@ -0,0 +1,58 @@
+import os
+from fastapi import APIRouter, HTTPException
+
+from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+from app.core.telemetry.replay import replay_engine
+from app.schemas.replay_schema import ReplayRequest
+
+# 진단용 디버그 라우터
+router = APIRouter(prefix="/debug", tags=["Debug"])
+
+
+# 이벤트 루프 지연 / 블로킹 샘플 조회
+@router.get("/loop")
+async def read_loop_status():
+    return loop_monitor.report()
+
+
+# 재생 소스 경로 확인 (REPLAY_DIR 밖 접근 차단)
+def _resolve_source(source: str) -> str:
+    root = os.path.realpath(settings.REPLAY_DIR)
+    path = os.path.realpath(os.path.join(root, source))
+    if os.path.commonpath([root, path]) != root:
+        raise HTTPException(status_code=400, detail="REPLAY_DIR 밖의 경로는 사용할 수 없습니다.")
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail=f"재생 소스 없음: {source}")
+    return path
+
+
+# 텔레메트리 재생 시작
+@router.post("/replay")
+def start_replay(req: ReplayRequest):
+    path = _resolve_source(req.source)
+    try:
+        replay_engine.start(
+            path,
+            speed=req.speed,
+            loop=req.loop,
+            start=req.start if req.start is not None else 0.0,
+            end=req.end if req.end is not None else float("inf"),
+            robot=req.robot,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return replay_engine.status()
+
+
+# 텔레메트리 재생 상태 조회
+@router.get("/replay")
+def read_replay_status():
+    return replay_engine.status()
+
+
+# 텔레메트리 재생 중지
+@router.delete("/replay")
+def stop_replay():
+    replay_engine.stop()
+    return replay_engine.status()
@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.fleet.dispatcher import build_jobs, fleet_dispatcher
+from app.core.fleet.state_machine import robot_fsm
+from app.schemas.order_schema import FleetJobCreate
+
+# 다중 로봇 작업 배정 API 라우터
+router = APIRouter(prefix="/fleet", tags=["Fleet"])
+
+
+# DB 세션 의존성
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# 작업 등록 (배정기가 로봇 상태 / 배터리 / 거리 / 대기 작업 수 기준으로 배정)
+@router.post("/jobs")
+def create_jobs(order: FleetJobCreate, db: Session = Depends(get_db)):
+    if not order.moves:
+        raise HTTPException(status_code=400, detail="이동할 재고가 없습니다.")
+    try:
+        jobs = build_jobs(db, order.moves)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    fleet_dispatcher.submit(jobs)
+    print(f"[API] 작업 {len(jobs)}건 등록")
+    return {"queued": [job["id"] for job in jobs]}
+
+
+# 배정 상태 (로봇별 진행 중 작업 / 배정 작업, 대기 작업)
+@router.get("/")
+def read_fleet():
+    return fleet_dispatcher.status()
+
+
+# 대기 작업 취소
+@router.delete("/jobs/{job_id}")
+def cancel_job(job_id: str):
+    if not any(job["id"] == job_id for job in fleet_dispatcher.status()["pending"]):
+        raise HTTPException(status_code=404, detail="대기 중인 작업이 아닙니다.")
+    fleet_dispatcher.cancel(job_id)
+    return {"message": "작업 취소"}
+
+
+# 로봇별 배터리 / 방전 속도 (%/h) / reserve 도달 예상 시간 / 충전 핀
+@router.get("/battery")
+def read_battery():
+    return fleet_dispatcher.battery_report()
+
+
+# 로봇별 서버 상태 기계 상태 (상태 코드 / 표시 문자열 / 체류 시간 / 목표 핀)
+@router.get("/states")
+def read_states():
+    return robot_fsm.snapshot()
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy import select
 from typing import List
 from datetime import datetime, timezone, timedelta
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, get_async_db
 from app.models.log_model import Log
 from app.schemas.log_schema import LogResponse, LogCreate, LogUpdate
 from app.crud import log_crud
@@ -21,20 +22,20 @@ def get_db():
         db.close()
 
 
-# 전체 로그 조회
+# 전체 로그 조회 (비동기 세션)
 @router.get("/", response_model=List[LogResponse])
-def read_logs(db: Session = Depends(get_db)):
-    return log_crud.get_logs(db)
+async def read_logs(db=Depends(get_async_db)):
+    return await log_crud.get_logs_async(db)
 
 
-# 오늘 입고/출고/상품등록 요약 조회
+# 오늘 입고/출고/상품등록 요약 조회 (비동기 세션)
 @router.get("/today-summary")
-def get_today_summary(db: Session = Depends(get_db)):
+async def get_today_summary(db=Depends(get_async_db)):
     # 한국 시간 기준 현재 날짜
     now_kst = datetime.now(timezone(timedelta(hours=9)))
     today = now_kst.date()
 
-    logs = db.query(Log).all()
+    logs = (await db.execute(select(Log))).scalars().all()
 
     inbound = 0
     outbound = 0
@@ -63,19 +64,18 @@ def get_today_summary(db: Session = Depends(get_db)):
     }
 
 
-# 최근 입고/출고 작업 5개 조회
+# 최근 입고/출고 작업 5개 조회 (비동기 세션)
 @router.get("/recent-tasks")
-def get_recent_tasks(db: Session = Depends(get_db)):
-    logs = (
-        db.query(Log)
-        .filter(
+async def get_recent_tasks(db=Depends(get_async_db)):
+    logs = (await db.execute(
+        select(Log)
+        .where(
             Log.action.like("입고 완료%") |
             Log.action.like("출고 완료%")
         )
         .order_by(Log.timestamp.desc())
         .limit(5)
-        .all()
-    )
+    )).scalars().all()
 
     result = []
     for log in logs:
@@ -96,10 +96,10 @@ def get_recent_tasks(db: Session = Depends(get_db)):
     return result
 
 
-# 단일 로그 조회
+# 단일 로그 조회 (비동기 세션)
 @router.get("/{log_id}", response_model=LogResponse)
-def read_log(log_id: int, db: Session = Depends(get_db)):
-    log = log_crud.get_log_by_id(db, log_id)
+async def read_log(log_id: int, db=Depends(get_async_db)):
+    log = await log_crud.get_log_by_id_async(db, log_id)
     if not log:
         raise HTTPException(status_code=404, detail="Log not found")
     return log
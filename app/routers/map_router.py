@@ -1,62 +1,175 @@
-import yaml
-from fastapi import APIRouter
-import imageio
-import os
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse
+from email.utils import parsedate_to_datetime
+import hashlib
+import json
 
-# 지도 관련 API 라우터
-router = APIRouter()
+from app.core.message.path_utils import flatten_path, simplify_path
 
-# 지도 파일 디렉토리 경로
-MAP_DIR = "app/static/map"
+from app.core.config import settings
+from app.core.maps.registry import map_registry
 
+# 지도 관련 API 라우터
+router = APIRouter()
 
-# PGM 파일을 PNG로 변환하고 PNG 파일명 반환
-def ensure_png_exists(pgm_filename: str) -> str:
-    # PGM 파일 전체 경로
-    pgm_path = os.path.join(MAP_DIR, pgm_filename)
+# 내용 해시 URL 장기 캐시 (내용이 바뀌면 URL 도 바뀜)
+IMMUTABLE = "public, max-age=31536000, immutable"
 
-    # PNG 파일명 및 경로
-    png_filename = pgm_filename.replace(".pgm", ".png")
-    png_path = os.path.join(MAP_DIR, png_filename)
 
-    # PNG가 이미 존재하면 변환 생략
-    if os.path.exists(png_path):
-        return png_filename
+# If-None-Match / If-Modified-Since 확인
+def _not_modified(request: Request, etag: str, last_modified: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+        return etag in tags or "*" in tags
 
-    # PGM이 존재할 경우 PNG 생성
-    if os.path.exists(pgm_path):
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
         try:
-            # 원본 크기 그대로 이미지 로드
-            img = imageio.imread(pgm_path)
+            return parsedate_to_datetime(if_modified_since) >= parsedate_to_datetime(last_modified)
+        except (TypeError, ValueError):
+            return False
 
-            # PNG 파일로 저장
-            imageio.imwrite(png_path, img)
-            print(f"🟢 PGM → PNG 변환 완료: {png_filename}")
-        except Exception as e:
-            print(f"❌ PNG 변환 실패: {e}")
+    return False
 
-    return png_filename
 
+# 이미지 변환이 끝난 지도 조회 (없으면 404, 변환 중이면 503)
+def _ready_map(name: str) -> dict:
+    entry = map_registry.get(name)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    if not entry["digest"]:
+        raise HTTPException(
+            status_code=503,
+            detail="Map image is being prepared",
+            headers={"Retry-After": "1"},
+        )
+    return entry
 
-# 지도 이미지 및 메타데이터 제공
+
+# 기본 지도 이미지 및 메타데이터 제공 (ETag / Last-Modified, 변경 없으면 304)
 @router.get("/map/info")
-def get_map_info():
-    # 지도 YAML 파일 경로
-    yaml_path = os.path.join(MAP_DIR, "wasd_map3.yaml")
+def get_map_info(request: Request):
+    entry = _ready_map(settings.MAP_DEFAULT)
+
+    # 응답 본문 (이미지 해시 기준 캐시)
+    if entry.get("info_digest") != entry["digest"]:
+        body = json.dumps(
+            {
+                "image": f"/map/image/{entry['digest']}.png",
+                "resolution": entry["resolution"],
+                "origin": entry["origin"],
+            },
+            separators=(",", ":"),
+        ).encode("utf-8")
+        entry["info_body"] = body
+        entry["info_etag"] = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+        entry["info_digest"] = entry["digest"]
+
+    headers = {
+        "ETag": entry["info_etag"],
+        "Last-Modified": entry["last_modified"],
+        "Cache-Control": "no-cache",
+    }
+
+    if _not_modified(request, entry["info_etag"], entry["last_modified"]):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=entry["info_body"], media_type="application/json", headers=headers)
+
+
+# 내용 해시 URL 기본 지도 이미지 (장기 캐시)
+@router.get("/map/image/{digest}.png")
+def get_map_image(digest: str):
+    entry = _ready_map(settings.MAP_DEFAULT)
+
+    # 이전 버전 해시 → 현재 이미지 URL 은 /map/info 로 다시 받아야 함
+    if digest != entry["digest"]:
+        raise HTTPException(status_code=404, detail="Map image not found")
+
+    return FileResponse(entry["png"], media_type="image/png", headers={"Cache-Control": IMMUTABLE})
 
-    # YAML 파일 로드
-    with open(yaml_path, "r") as f:
-        data = yaml.safe_load(f)
 
-    # YAML에 지정된 PGM 파일명
-    pgm_file = data["image"]
+# 등록된 지도 목록 (변환 / 타일 생성 상태 포함)
+@router.get("/maps")
+def list_maps():
+    return [map_registry.describe(name) for name in map_registry.names()]
 
-    # PNG 파일 생성 또는 확인
-    png_file = ensure_png_exists(pgm_file)
 
-    # 클라이언트에 전달할 지도 정보 반환
+# 지도 1개 정보
+@router.get("/maps/{name}")
+def get_map(name: str):
+    info = map_registry.describe(name)
+    if info is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    return info
+
+
+# 월드 좌표 점유 / 장애물 거리 조회
+@router.get("/maps/{name}/query")
+def query_map(name: str, x: float, y: float):
+    if map_registry.get(name) is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    grid = map_registry.grid(name)
+    if grid is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Occupancy grid is being loaded",
+            headers={"Retry-After": "1"},
+        )
+    return grid.validate([x], [y])[0]
+
+
+# 두 좌표 간 경로 계획 (A*, 장애물 팽창 격자 기준)
+@router.get("/maps/{name}/plan")
+def plan_path(name: str, sx: float, sy: float, tx: float, ty: float):
+    if map_registry.get(name) is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    planner = map_registry.planner(name)
+    if planner is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Occupancy grid is being loaded",
+            headers={"Retry-After": "1"},
+        )
+
+    result = planner.plan(sx, sy, tx, ty)
+    if result is None:
+        raise HTTPException(status_code=422, detail="No path between the given points")
+
+    # 격자 계단 형태 제거 (계획 격자 절반 이내 오차, 최대 100점)
+    points, length = result
+    budget = min(100, len(points) - 1)
     return {
-        "image": f"/static/map/{png_file}",
-        "resolution": data["resolution"],
-        "origin": data["origin"],
-    }
\ No newline at end of file
+        "length": round(length, 3),
+        "path": flatten_path(simplify_path(points, budget=budget, tolerance=planner.resolution / 2)),
+    }
+
+
+# 지도 전체 이미지 (?v=해시 일치 시 장기 캐시)
+@router.get("/maps/{name}/image.png")
+def get_map_png(name: str, v: str | None = None):
+    entry = _ready_map(name)
+    cache = IMMUTABLE if v == entry["digest"] else "no-cache"
+    return FileResponse(entry["png"], media_type="image/png", headers={"Cache-Control": cache})
+
+
+# 타일 피라미드 (z = 0 전체 ~ max_zoom 원본 해상도, ?v=해시 일치 시 장기 캐시)
+@router.get("/maps/{name}/tiles/{z}/{x}/{y}.png")
+def get_map_tile(name: str, z: int, x: int, y: int, v: str | None = None):
+    entry = map_registry.get(name)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    if not entry["tiles_ready"]:
+        raise HTTPException(
+            status_code=503,
+            detail="Map tiles are being generated",
+            headers={"Retry-After": "1"},
+        )
+
+    path = map_registry.tile_path(name, z, x, y)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Tile not found")
+
+    cache = IMMUTABLE if v == entry["digest"] else "no-cache"
+    return FileResponse(path, media_type="image/png", headers={"Cache-Control": cache})
@@ -0,0 +1,13 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import render
+
+# 모니터링 지표 라우터
+router = APIRouter(tags=["Metrics"])
+
+
+# Prometheus text format 지표 조회
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
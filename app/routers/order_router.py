@@ -0,0 +1,60 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.schemas.order_schema import BatchOrderCreate
+from app.services.batch_order_service import BatchOrderService, BatchRejected, batch_runner
+
+# 배치 주문 API 라우터
+router = APIRouter(prefix="/orders", tags=["Orders"])
+
+
+# DB 세션 의존성
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# 배치 주문 생성 (경로 계획 + 로봇 순차 이동 시작)
+@router.post("/batch")
+def create_batch(order: BatchOrderCreate, db: Session = Depends(get_db)):
+    if not order.moves:
+        raise HTTPException(status_code=400, detail="이동할 재고가 없습니다.")
+
+    capacity = order.capacity or settings.ROBOT_CAPACITY
+    if capacity <= 0:
+        raise HTTPException(status_code=400, detail="capacity 는 1 이상이어야 합니다.")
+
+    try:
+        plan = BatchOrderService.plan(db, order.moves, capacity)
+    except ValueError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    if order.dry_run:
+        return {"started": False, "plan": plan}
+
+    try:
+        batch_runner.start(plan)
+    except BatchRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    print(f"[API] 배치 주문 시작 → 트립 {len(plan['trips'])}개, {plan['distance']}m (단건 {plan['naive_distance']}m)")
+    return {"started": True, "plan": plan}
+
+
+# 배치 작업 진행 상태
+@router.get("/batch")
+def read_batch():
+    return batch_runner.status()
+
+
+# 배치 작업 취소 (로봇 WAIT 복귀)
+@router.delete("/batch")
+def cancel_batch():
+    if not batch_runner.active:
+        raise HTTPException(status_code=404, detail="진행 중인 배치 작업이 없습니다.")
+    batch_runner.cancel()
+    return {"message": "배치 작업 취소"}
@@ -1,10 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import select, text
 from typing import List
 from datetime import datetime, timezone, timedelta
-
-from app.core.database import SessionLocal
+import numpy as np
+
+from app.core.config import settings
+from app.core.database import SessionLocal, get_async_db
+from app.core.list_cache import list_cache
+from app.core.maps.pin_index import pin_index
+from app.core.maps.registry import map_registry
+from app.core.maps.travel import travel_matrix
 from app.models.pin_model import Pin
 from app.models.stock_model import Stock
 from app.schemas.pin_schema import PinResponse, PinCreate
@@ -25,20 +31,113 @@ def get_db():
         db.close()
 
 
-# 핀 전체 조회
+# 핀 전체 조회 (목록 캐시 + ETag, 비동기 세션)
 @router.get("/", response_model=List[PinResponse])
-def read_pins(db: Session = Depends(get_db)):
-    return db.query(Pin).all()
+async def read_pins(request: Request, db=Depends(get_async_db)):
+    async def build():
+        rows = (await db.execute(select(Pin))).scalars().all()
+        return [PinResponse.from_orm(row) for row in rows]
+
+    return await list_cache.respond(request, "pins", build)
+
+
+# 전체 핀 좌표 일괄 검증 (점유 격자 기준, 빈 공간 + 장애물 최소 거리)
+@router.get("/validate")
+async def validate_pins(
+    map: str | None = None,
+    min_clearance: float | None = None,
+    db=Depends(get_async_db),
+):
+    name = map or settings.MAP_DEFAULT
+    grid = map_registry.grid(name)
+    if grid is None:
+        raise HTTPException(status_code=503, detail=f"Occupancy grid not loaded: {name}")
+    if min_clearance is None:
+        min_clearance = settings.PIN_MIN_CLEARANCE
+
+    # 좌표 없는 핀은 별도 표시
+    pins = (await db.execute(select(Pin))).scalars().all()
+    valid = [p for p in pins if p.x is not None and p.y is not None]
+
+    checks = grid.validate([p.x for p in valid], [p.y for p in valid], min_clearance)
+    results = {p.id: {"id": p.id, "name": p.name, "x": p.x, "y": p.y, **c} for p, c in zip(valid, checks)}
+    for p in pins:
+        if p.id not in results:
+            results[p.id] = {"id": p.id, "name": p.name, "x": p.x, "y": p.y, "ok": False, "reason": "no_coords"}
+
+    items = [results[p.id] for p in pins]
+    return {
+        "map": name,
+        "min_clearance": min_clearance,
+        "invalid": sum(1 for r in items if not r["ok"]),
+        "pins": items,
+    }
+
+
+# 핀 + 대기 위치(WAIT) 간 주행 거리 (m) / 이동 시간 (초, ROBOT_NOMINAL_SPEED 기준) 행렬
+@router.get("/distances")
+def read_distances():
+    nodes, matrix = travel_matrix.snapshot()
+    distance = [[round(float(d), 3) if np.isfinite(d) else None for d in row] for row in matrix]
+    return {
+        "map": travel_matrix.map_name,
+        "ready": travel_matrix.ready,
+        "speed": travel_matrix.speed,
+        "nodes": [
+            {"key": n["key"], "name": n["name"], "x": n["x"], "y": n["y"], "reachable": n["index"] is not None}
+            for n in nodes
+        ],
+        "distance": distance,
+        "time": [[round(d / travel_matrix.speed, 1) if d is not None else None for d in row] for row in distance],
+    }
+
+
+# 좌표 기준 최근접 핀 k개 (amcl 위치 → 현재 핀 판별 등)
+@router.get("/nearest")
+def read_nearest(x: float, y: float, k: int = 1, max_distance: float | None = None):
+    if k < 1:
+        raise HTTPException(status_code=400, detail="k must be >= 1")
+    return pin_index.nearest(x, y, k=min(k, 100), max_distance=max_distance)
+
+
+# 핀 좌표 검증 (기본 지도 점유 격자 로드 전이면 생략)
+def _check_coords(x: float | None, y: float | None):
+    if x is None and y is None:
+        return
+    if x is None or y is None:
+        raise HTTPException(status_code=400, detail="좌표 형식 오류: X, Y를 모두 입력하세요.")
+
+    grid = map_registry.grid(settings.MAP_DEFAULT)
+    if grid is None:
+        return
+
+    result = grid.validate([x], [y], settings.PIN_MIN_CLEARANCE)[0]
+    if result["ok"]:
+        return
+
+    reasons = {
+        "out_of_map": "지도 범위 밖 좌표입니다.",
+        "occupied": "장애물 위치입니다.",
+        "unknown": "미탐색 영역입니다.",
+        "too_close": f"장애물과 너무 가깝습니다 ({result['clearance']}m < {settings.PIN_MIN_CLEARANCE}m).",
+    }
+    raise HTTPException(status_code=400, detail=f"등록 불가: {reasons[result['reason']]}")
 
 
 # 핀 생성
 @router.post("/", response_model=PinResponse)
 def create_pin(pin: PinCreate, db: Session = Depends(get_db)):
+    # 지도 기준 좌표 검증
+    _check_coords(pin.x, pin.y)
+
     # 새 핀 생성
-    new_pin = Pin(**pin.dict())
+    new_pin = Pin(name=pin.name, x=pin.x, y=pin.y, yaw=pin.yaw)
     db.add(new_pin)
     db.commit()
     db.refresh(new_pin)
+    list_cache.invalidate("pins")
+    pin_index.invalidate()
+    travel_matrix.refresh()
 
     # 핀 등록 로그 기록
     log_crud.create_log(
@@ -47,7 +146,7 @@ def create_pin(pin: PinCreate, db: Session = Depends(get_db)):
             robot_name="-",
             robot_ip=None,
             pin_name=new_pin.name,
-            pin_coords=None,
+            pin_coords=new_pin.coords,
             category_name="-",
             stock_name="-",
             stock_id=None,
@@ -96,6 +195,9 @@ def delete_pin(pin_id: int, db: Session = Depends(get_db)):
     # 핀 삭제 처리
     db.delete(pin)
     db.commit()
+    list_cache.invalidate("pins")
+    pin_index.invalidate()
+    travel_matrix.refresh()
 
     # 핀 테이블 비어있을 경우 AUTO_INCREMENT 초기화
     remaining = db.execute(text("SELECT COUNT(*) FROM pin")).scalar()
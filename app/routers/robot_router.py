@@ -6,6 +6,9 @@ from app.core.database import SessionLocal
 from app.models.robot_model import Robot
 from app.schemas.robot_schema import RobotResponse, RobotCreate, RobotUpdate
 from app.core.ros.ros_manager import ros_manager
+from app.core.telemetry.ring_buffer import telemetry_store, TOPIC_FIELDS
+from app.core.telemetry.recorder import TelemetryReader, to_columns
+from app.core.config import settings
 
 # 로봇 관련 API 라우터
 router = APIRouter(prefix="/robots", tags=["Robots"])
@@ -108,6 +111,46 @@ def get_robot_status(robot_id: int, db: Session = Depends(get_db)):
     }
 
 
+# 로봇 최근 텔레메트리 이력 조회 (컬럼형)
+@router.get("/{robot_id}/telemetry")
+def get_robot_telemetry(
+    robot_id: int,
+    topic: str = "pose",
+    since: float = 0.0,
+    db: Session = Depends(get_db),
+):
+    if topic not in TOPIC_FIELDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"topic은 {', '.join(TOPIC_FIELDS)} 중 하나여야 합니다.",
+        )
+
+    robot = db.query(Robot).filter(Robot.id == robot_id).first()
+    if not robot:
+        raise HTTPException(status_code=404, detail="Robot not found")
+
+    return telemetry_store.query(robot.name, topic, since)
+
+
+# 로봇 기록 텔레메트리 구간 조회 (컬럼형)
+@router.get("/{robot_id}/recording")
+def get_robot_recording(
+    robot_id: int,
+    start: float,
+    end: float,
+    db: Session = Depends(get_db),
+):
+    if not settings.TELEMETRY_RECORD_DIR:
+        raise HTTPException(status_code=404, detail="텔레메트리 기록이 비활성화되어 있습니다.")
+
+    robot = db.query(Robot).filter(Robot.id == robot_id).first()
+    if not robot:
+        raise HTTPException(status_code=404, detail="Robot not found")
+
+    rows = TelemetryReader(settings.TELEMETRY_RECORD_DIR).read(start, end, robot=robot.name)
+    return {"robot": robot.name, **to_columns(rows)}
+
+
 # 로봇 정보 수정
 @router.put("/{robot_id}", response_model=RobotResponse)
 def update_robot(robot_id: int, update_data: RobotUpdate, db: Session = Depends(get_db)):
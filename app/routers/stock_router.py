@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import text
+from sqlalchemy import select, text
 from typing import List
 from datetime import datetime, timezone, timedelta
 
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, get_async_db
+from app.core.list_cache import list_cache
 from app.models.stock_model import Stock
 from app.models.category_model import Category
 from app.models.pin_model import Pin
@@ -26,23 +27,28 @@ def get_db():
         db.close()
 
 
-# 전체 재고 조회
+# 전체 재고 조회 (목록 캐시 + ETag, 비동기 세션)
 @router.get("/", response_model=List[StockResponse])
-def read_stocks(db: Session = Depends(get_db)):
-    # 카테고리/핀 조인 로드
-    stocks = db.query(Stock).options(joinedload(Stock.category), joinedload(Stock.pin)).all()
-
-    # 응답 스키마 변환
-    return [
-        StockResponse(
-            id=s.id,
-            name=s.name,
-            quantity=s.quantity,
-            category_name=s.category.name if s.category else "",
-            pin_name=s.pin.name if s.pin else "",
-        )
-        for s in stocks
-    ]
+async def read_stocks(request: Request, db=Depends(get_async_db)):
+    async def build():
+        # 카테고리/핀 조인 로드 (비동기 세션은 지연 로딩 불가)
+        stocks = (await db.execute(
+            select(Stock).options(joinedload(Stock.category), joinedload(Stock.pin))
+        )).scalars().all()
+
+        # 응답 스키마 변환
+        return [
+            StockResponse(
+                id=s.id,
+                name=s.name,
+                quantity=s.quantity,
+                category_name=s.category.name if s.category else "",
+                pin_name=s.pin.name if s.pin else "",
+            )
+            for s in stocks
+        ]
+
+    return await list_cache.respond(request, "stocks", build)
 
 
 # 재고 생성
@@ -64,6 +70,7 @@ def create_stock(stock: StockCreate, db: Session = Depends(get_db)):
     db.add(new)
     db.commit()
     db.refresh(new)
+    list_cache.invalidate("stocks")
 
     # 상품 등록 로그 기록
     log_crud.create_log(
@@ -111,6 +118,7 @@ def update_stock(stock_id: int, update_data: StockUpdate, db: Session = Depends(
 
     db.commit()
     db.refresh(s)
+    list_cache.invalidate("stocks")
 
     # 최신 값 조인 로드
     s = (
@@ -221,6 +229,7 @@ def delete_stock(stock_id: int, db: Session = Depends(get_db)):
     # 재고 삭제 처리
     db.delete(s)
     db.commit()
+    list_cache.invalidate("stocks")
 
     # 재고 테이블 비어있을 경우 AUTO_INCREMENT 초기화
     remaining = db.execute(text("SELECT COUNT(*) FROM stock")).scalar()
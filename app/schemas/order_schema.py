@@ -0,0 +1,35 @@
+from pydantic import BaseModel, validator
+from typing import List, Optional
+
+
+# 배치 주문 개별 재고 이동
+class StockMove(BaseModel):
+    stock_id: int
+    amount: int
+    mode: str
+
+    @validator("mode")
+    def _mode(cls, v):
+        if v not in ("INBOUND", "OUTBOUND"):
+            raise ValueError("mode must be INBOUND or OUTBOUND")
+        return v
+
+    @validator("amount")
+    def _amount(cls, v):
+        if v <= 0:
+            raise ValueError("amount must be positive")
+        return v
+
+
+# 배치 주문 생성 스키마
+# - capacity: 로봇 1회 운반 수량 (없으면 설정값)
+# - dry_run: 경로 계획만 반환 (로봇 이동 없음)
+class BatchOrderCreate(BaseModel):
+    moves: List[StockMove]
+    capacity: Optional[int] = None
+    dry_run: bool = False
+
+
+# 다중 로봇 작업 등록 스키마
+class FleetJobCreate(BaseModel):
+    moves: List[StockMove]
@@ -1,27 +1,51 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, root_validator
 from typing import Optional
 
 
+# "x,y" / "x,y,yaw" 문자열 좌표 → x / y / yaw 필드 (기존 요청 형식 호환)
+def _split_coords(cls, values: dict) -> dict:
+    coords = values.get("coords")
+    if coords and values.get("x") is None and values.get("y") is None:
+        parts = str(coords).split(",")
+        try:
+            values["x"], values["y"] = float(parts[0]), float(parts[1])
+            if len(parts) > 2 and values.get("yaw") is None:
+                values["yaw"] = float(parts[2])
+        except (ValueError, IndexError):
+            raise ValueError("coords must be 'x,y' or 'x,y,yaw'")
+    return values
+
+
 # 핀 기본 스키마
 class PinBase(BaseModel):
     name: str
-    coords: Optional[str] = None
+    x: Optional[float] = None
+    y: Optional[float] = None
+    yaw: Optional[float] = None
 
 
-# 핀 생성 스키마
+# 핀 생성 스키마 (x/y 또는 coords="x,y")
 class PinCreate(PinBase):
-    pass
+    coords: Optional[str] = None
+
+    _coords = root_validator(pre=True, allow_reuse=True)(_split_coords)
 
 
 # 핀 수정 스키마
 class PinUpdate(BaseModel):
     name: Optional[str] = None
+    x: Optional[float] = None
+    y: Optional[float] = None
+    yaw: Optional[float] = None
     coords: Optional[str] = None
 
+    _coords = root_validator(pre=True, allow_reuse=True)(_split_coords)
+
 
-# 핀 응답 스키마
+# 핀 응답 스키마 (coords: 기존 "x,y" 형식 호환)
 class PinResponse(PinBase):
     id: int
+    coords: Optional[str] = None
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+# 텔레메트리 재생 요청 스키마
+# source: REPLAY_DIR 기준 상대 경로 (JSONL 파일 또는 기록 세그먼트 디렉터리)
+# speed: 1 = 실시간, N = N배속, 0 = 최대 속도
+class ReplayRequest(BaseModel):
+    source: str
+    speed: float = 1.0
+    loop: bool = False
+    start: Optional[float] = None
+    end: Optional[float] = None
+    robot: Optional[str] = None
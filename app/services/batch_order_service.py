@@ -0,0 +1,320 @@
+import math
+import threading
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.broker import broker
+from app.core.database import SessionLocal
+from app.core.maps.occupancy import parse_coords
+from app.core.maps.route import plan_routes, tour_length
+from app.core.maps.travel import WAIT, travel_matrix
+from app.core.config import settings
+from app.models.stock_model import Stock
+from app.websocket.manager import ws_manager, log_move_start, apply_stock_move, start_return
+from app.websocket.state_store import state_store
+
+# 거리 모르는 구간 (지도 밖 / 좌표 없음) 대체 비용 (m)
+UNREACHABLE = 1e6
+
+
+# 배치 주문 경로 계획 서비스
+# - 같은 핀의 이동은 정차 1회로 병합
+# - 로봇 운반 용량 기준으로 트립 분할, 트립별 방문 순서는 최근접 이웃 + 2-opt
+# - 거리: 핀 간 주행 거리 행렬 (미계산 구간은 직선 거리)
+class BatchOrderService:
+
+    # 노드 좌표 목록 → 거리 행렬 (0번 = WAIT) + 거리 출처
+    @staticmethod
+    def _distance_matrix(keys: list, coords: list) -> tuple[np.ndarray, str]:
+        nodes, matrix = travel_matrix.snapshot()
+        pos = {n["key"]: i for i, n in enumerate(nodes)}
+        rows = [pos.get(k) for k in keys]
+
+        n = len(keys)
+        D = np.zeros((n, n), dtype=np.float64)
+        source = "matrix" if all(r is not None for r in rows) else "euclidean"
+        for i in range(n):
+            for j in range(i + 1, n):
+                d = math.inf
+                if rows[i] is not None and rows[j] is not None:
+                    d = float(matrix[rows[i], rows[j]])
+                if not math.isfinite(d):
+                    if coords[i] is not None and coords[j] is not None:
+                        d = math.dist(coords[i], coords[j])
+                    else:
+                        d = UNREACHABLE
+                    if source == "matrix":
+                        source = "mixed"
+                D[i, j] = D[j, i] = d
+        return D, source
+
+    # 재고 이동 목록 → 트립별 정차 순서
+    @staticmethod
+    def plan(db: Session, moves: list, capacity: int) -> dict:
+        stops: dict[int, dict] = {}
+        for move in moves:
+            stock = db.query(Stock).filter(Stock.id == move.stock_id).first()
+            if not stock:
+                raise ValueError(f"재고를 찾을 수 없습니다: {move.stock_id}")
+            pin = stock.pin
+            if not pin:
+                raise ValueError(f"재고 '{stock.name}' 의 핀이 없습니다.")
+
+            stop = stops.get(pin.id)
+            if stop is None:
+                stop = stops[pin.id] = {
+                    "pin_id": pin.id,
+                    "pin_name": pin.name,
+                    "coords": (pin.x, pin.y) if pin.x is not None and pin.y is not None else None,
+                    "moves": [],
+                    "load": 0,
+                }
+            stop["moves"].append({
+                "stock_id": stock.id,
+                "stock_name": stock.name,
+                "amount": move.amount,
+                "mode": move.mode,
+            })
+            stop["load"] += move.amount
+
+        stop_list = list(stops.values())
+        wait = parse_coords(settings.WAIT_COORDS) or (0.0, 0.0)
+        wait_node = next((n for n in travel_matrix.snapshot()[0] if n["key"] == WAIT), None)
+        if wait_node:
+            wait = (wait_node["x"], wait_node["y"])
+
+        keys = [WAIT] + [s["pin_id"] for s in stop_list]
+        coords = [wait] + [s["coords"] for s in stop_list]
+        D, source = BatchOrderService._distance_matrix(keys, coords)
+
+        tours = plan_routes(D, [s["load"] for s in stop_list], capacity)
+
+        trips = []
+        for tour in tours:
+            trips.append({
+                "stops": [
+                    {k: v for k, v in stop_list[i - 1].items() if k != "coords"}
+                    for i in tour[1:-1]
+                ],
+                "distance": round(tour_length(D, tour), 3),
+            })
+
+        # 비교 기준: 이동 1건마다 WAIT 왕복 (기존 단건 처리)
+        naive = sum(2 * D[0, i + 1] * len(s["moves"]) for i, s in enumerate(stop_list))
+        total = sum(t["distance"] for t in trips)
+        return {
+            "capacity": capacity,
+            "source": source,
+            "trips": trips,
+            "distance": round(total, 3),
+            "naive_distance": round(naive, 3),
+            "saving": round(1 - total / naive, 4) if naive > 0 else 0.0,
+        }
+
+
+# 배치 작업 시작 거절 (status_code: API 응답 코드)
+class BatchRejected(Exception):
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+# 배치 주문 실행기 (ROS 소유 워커에서 실행)
+# - 시작 시점의 활성 로봇 1대에 고정 (이후 이동 명령 / 로그 / 재고 반영 / 도착 신호 모두 이 로봇 기준)
+# - 진행 중인 배치 / 활성 로봇 없음 / 배정기 작업 중인 로봇이면 시작 거절 (BatchRejected)
+# - 정차 지점마다 기존 핸드셰이크 사용: send_ui_command(핀) → ARRIVED:핀 → 확인(complete_stock_move)
+# - 확인 시 해당 정차 지점 이동 전체 반영 후 다음 정차 지점, 트립 끝이면 WAIT 복귀
+# - WAIT 도착 시 다음 트립 시작, 마지막 트립이면 종료
+# - 다른 워커의 시작/확인/취소 요청은 batch 채널로 소유 워커에 전달,
+#   진행 상태는 batch 채널로 다른 워커에 복제 + batch_status 브로드캐스트
+class BatchRunner:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plan: dict | None = None
+        self._trip = 0
+        self._stop = 0
+        self._phase: str | None = None  # moving / arrived / returning
+        self.robot_name: str | None = None
+        self._status: dict = {"active": False}
+
+    @property
+    def active(self) -> bool:
+        return bool(self._status.get("active"))
+
+    def status(self) -> dict:
+        return self._status
+
+    # 배치 작업 로봇 여부 (로봇 이름 없는 요청은 배치 작업으로 간주, 복제된 상태 기준)
+    def owns(self, robot_name: str | None) -> bool:
+        return self.active and (robot_name is None or robot_name == self._status.get("robot_name"))
+
+    # ─────────────────────────────────────────
+    # 요청 (소유 워커가 아니면 전달)
+    # ─────────────────────────────────────────
+
+    # 시작 (거절 시 BatchRejected)
+    # - 다른 워커: 복제된 상태로 확인 후 전달, 소유 워커에서 lock 보유 상태로 다시 확인
+    def start(self, plan: dict):
+        if not broker.is_owner:
+            self._check(self.active, state_store.active_robot)
+            broker.publish("batch", {"op": "start", "plan": plan}, local=False)
+            return
+        from app.core.ros.ros_manager import ros_manager
+
+        with self._lock:
+            robot = ros_manager.active_robot
+            self._check(self._plan is not None, robot)
+            self._plan, self._trip, self._stop = plan, 0, 0
+            self.robot_name = robot
+            self._go()
+
+    @staticmethod
+    def _check(running: bool, robot: str | None):
+        from app.core.fleet.dispatcher import fleet_dispatcher
+
+        if running:
+            raise BatchRejected(409, "진행 중인 배치 작업이 있습니다.")
+        if robot is None:
+            raise BatchRejected(503, "활성 로봇이 없습니다.")
+        if fleet_dispatcher.is_running(robot):
+            raise BatchRejected(409, f"작업 배정기 작업 중인 로봇입니다: {robot}")
+
+    def complete(self):
+        if not broker.is_owner:
+            broker.publish("batch", {"op": "complete"}, local=False)
+            return
+        with self._lock:
+            if self._plan is None or self._phase not in ("moving", "arrived"):
+                print("[BATCH] 확인 무시: 정차 중인 지점 없음")
+                return
+            self._complete_stop()
+
+    def cancel(self):
+        if not broker.is_owner:
+            broker.publish("batch", {"op": "cancel"}, local=False)
+            return
+        with self._lock:
+            if self._plan is None:
+                return
+            print("[BATCH] 배치 작업 취소")
+            robot = self.robot_name
+            self._finish()
+            start_return(robot)
+
+    # ROS 도착 신호 (listener, 소유 워커, 배치 로봇 외 도착은 무시)
+    def on_arrived(self, robot_name: str, pin_name: str):
+        with self._lock:
+            if self._plan is None or robot_name != self.robot_name:
+                return
+            if self._phase == "moving" and pin_name == self._current()["pin_name"]:
+                self._phase = "arrived"
+                self._publish()
+            elif self._phase == "returning" and pin_name == WAIT:
+                self._trip += 1
+                self._stop = 0
+                self._phase = None
+                if self._trip < len(self._plan["trips"]):
+                    threading.Timer(0.3, self._go_locked).start()
+                else:
+                    print("[BATCH] ✅ 배치 작업 완료")
+                    self._finish()
+
+    # 다른 워커 메시지 수신
+    def _on_message(self, message: dict, remote: bool):
+        if not remote:
+            return
+        op = message.get("op")
+        if op == "status":
+            self._status = message.get("status") or {"active": False}
+        elif broker.is_owner and op == "start":
+            try:
+                self.start(message.get("plan"))
+            except BatchRejected as e:
+                print("[BATCH] 시작 거절:", e.detail)
+        elif broker.is_owner and op == "complete":
+            self.complete()
+        elif broker.is_owner and op == "cancel":
+            self.cancel()
+
+    # ─────────────────────────────────────────
+    # 진행 (lock 보유 상태에서 호출)
+    # ─────────────────────────────────────────
+
+    def _current(self) -> dict:
+        return self._plan["trips"][self._trip]["stops"][self._stop]
+
+    def _go_locked(self):
+        with self._lock:
+            if self._plan is not None:
+                self._go()
+
+    # 현재 정차 지점으로 이동 시작
+    def _go(self):
+        from app.core.ros.ros_manager import ros_manager
+
+        stop = self._current()
+        self._phase = "moving"
+
+        ros_manager.send_ui_command(stop["pin_name"], self.robot_name)
+
+        db = SessionLocal()
+        try:
+            for move in stop["moves"]:
+                stock = db.query(Stock).filter(Stock.id == move["stock_id"]).first()
+                if stock:
+                    log_move_start(db, stock, move["amount"], move["mode"], self.robot_name)
+        finally:
+            db.close()
+
+        print(f"[BATCH] 트립 {self._trip + 1} / 정차 {self._stop + 1} → {stop['pin_name']}")
+        self._publish()
+
+    # 현재 정차 지점 이동 반영 → 다음 정차 지점 또는 복귀
+    def _complete_stop(self):
+        robot = self.robot_name
+        for move in self._current()["moves"]:
+            try:
+                apply_stock_move(move["stock_id"], move["amount"], move["mode"], robot)
+            except Exception as e:
+                print(f"[BATCH] ⚠️ 재고 반영 실패 (stock_id={move['stock_id']}):", e)
+
+        self._stop += 1
+        if self._stop < len(self._plan["trips"][self._trip]["stops"]):
+            threading.Timer(0.3, self._go_locked).start()
+            self._phase = None
+        else:
+            self._phase = "returning"
+            threading.Timer(0.3, start_return, args=(robot,)).start()
+        self._publish()
+
+    def _finish(self):
+        self._plan, self._phase = None, None
+        self._trip = self._stop = 0
+        self.robot_name = None
+        self._publish()
+
+    # 진행 상태 → 다른 워커 복제 + UI 브로드캐스트
+    def _publish(self):
+        if self._plan is None:
+            status = {"active": False}
+        else:
+            trips = self._plan["trips"]
+            status = {
+                "active": True,
+                "robot_name": self.robot_name,
+                "phase": self._phase,
+                "trip": self._trip,
+                "stop": self._stop,
+                "trips": len(trips),
+                "plan": self._plan,
+            }
+        self._status = status
+        broker.publish("batch", {"op": "status", "status": status}, local=False)
+        ws_manager.broadcast({"type": "batch_status", "payload": status})
+
+
+# 전역 배치 실행기
+batch_runner = BatchRunner()
+broker.subscribe("batch", batch_runner._on_message)
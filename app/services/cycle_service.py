@@ -0,0 +1,189 @@
+import time
+import warnings
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.fleet.state_machine import robot_fsm
+from app.models.move_cycle_model import MoveCycle
+
+# 구간 지표 (이름, 시작 단계, 끝 단계)
+# - travel: 이동 명령 → 도착 / dwell: 도착 → 작업 확인 / return: 복귀 시작 → 복귀 완료
+# - cycle: 이동 명령 → 작업 확인 (핀 1회 작업 전체)
+PHASES = (
+    ("travel", "dispatched_at", "arrived_at"),
+    ("dwell", "arrived_at", "confirmed_at"),
+    ("return", "return_started_at", "returned_at"),
+    ("cycle", "dispatched_at", "confirmed_at"),
+)
+
+PERCENTILES = (50, 90, 95)
+
+# 시간대 그룹 기준 (KST, 초)
+KST_OFFSET = 9 * 3600
+
+
+# 이동 구간 기록기 (이동 명령 → 도착 → 작업 확인 → 복귀 시작 → 복귀 완료)
+# - 이동 / 도착 / 복귀 단계는 로봇 상태 기계 이벤트로 기록 (ROS 소유 워커)
+# - 작업 확인은 재고 반영 시 기록 (어느 워커에서든 DB 기준으로 로봇의 최근 구간 갱신)
+# - 배치 / 배정기 연속 작업은 정차마다 1행, 복귀는 트립 마지막 정차 행에 기록
+# - DB 기록은 상태 기계 기록 스레드(robot_fsm.defer)에서 실행
+#   (ROS 콜백 / 상태 기계 lock 구간 블로킹 방지, 도착 → 작업 확인 기록 순서 유지)
+class CycleRecorder:
+
+    # 로봇 상태 기계 이벤트 → 단계 기록 예약
+    def on_event(self, event: dict):
+        if event["event"] in ("move", "arrived", "return", "home"):
+            robot_fsm.defer(self._record, event)
+
+    def _record(self, event: dict):
+        kind = event["event"]
+        db = SessionLocal()
+        try:
+            name, ts = event["robot_name"], event["ts"]
+            if kind == "move":
+                db.add(MoveCycle(robot_name=name, pin_name=event["pin"], dispatched_at=ts))
+                db.commit()
+                return
+
+            cycle = self._latest(db, name)
+            if cycle is None:
+                return
+            if kind == "arrived" and cycle.arrived_at is None and cycle.pin_name == event["pin"]:
+                cycle.arrived_at = ts
+            elif kind == "return" and cycle.return_started_at is None and cycle.arrived_at is not None:
+                cycle.return_started_at = ts
+            elif kind == "home" and cycle.return_started_at is not None and cycle.returned_at is None:
+                cycle.returned_at = ts
+            else:
+                return
+            db.commit()
+        except Exception as e:
+            print("[CYCLE] ⚠️ 구간 기록 실패:", e)
+        finally:
+            db.close()
+
+    # 작업 확인 예약 (도착 후 미확인 구간에 재고 정보 + 확인 시각 기록)
+    def confirm(self, robot_name: str | None, stock_id: int, stock_name: str, mode: str, amount: int):
+        if robot_name:
+            robot_fsm.defer(self._confirm, robot_name, time.time(), stock_id, stock_name, mode, amount)
+
+    def _confirm(self, robot_name: str, ts: float, stock_id: int, stock_name: str, mode: str, amount: int):
+        db = SessionLocal()
+        try:
+            cycle = self._latest(db, robot_name)
+            if cycle is None or cycle.arrived_at is None or cycle.confirmed_at is not None:
+                return
+            cycle.confirmed_at = ts
+            cycle.stock_id, cycle.stock_name = stock_id, stock_name
+            cycle.mode, cycle.quantity = mode, amount
+            db.commit()
+        except Exception as e:
+            print("[CYCLE] ⚠️ 작업 확인 기록 실패:", e)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _latest(db: Session, robot_name: str) -> MoveCycle | None:
+        return (
+            db.query(MoveCycle)
+            .filter(MoveCycle.robot_name == robot_name)
+            .order_by(MoveCycle.id.desc())
+            .first()
+        )
+
+
+# 그룹별 백분위수 (NaN 제외)
+# - keys: 그룹 키 배열, values: {지표: 값 배열 (미완료 구간 NaN)}
+# - 그룹별 값을 (그룹 수 × 최대 건수) NaN 패딩 행렬로 모아 nanpercentile 1회
+def group_percentiles(keys: np.ndarray, values: dict[str, np.ndarray]) -> dict:
+    if len(keys) == 0:
+        return {}
+
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    groups, start, counts = np.unique(keys, return_index=True, return_counts=True)
+    col = np.arange(len(keys)) - np.repeat(start, counts)
+    row = np.repeat(np.arange(len(groups)), counts)
+
+    result = {str(g): {"count": int(c)} for g, c in zip(groups, counts)}
+    for metric, v in values.items():
+        grid = np.full((len(groups), counts.max()), np.nan)
+        grid[row, col] = v[order]
+
+        n = np.count_nonzero(~np.isnan(grid), axis=1)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            pct = np.nanpercentile(grid, PERCENTILES, axis=1) if n.any() else None
+            mean = np.nanmean(grid, axis=1)
+
+        for i, g in enumerate(groups):
+            stats = {"n": int(n[i])}
+            if n[i]:
+                stats["mean"] = round(float(mean[i]), 2)
+                for p, values_p in zip(PERCENTILES, pct):
+                    stats[f"p{p}"] = round(float(values_p[i]), 2)
+            result[str(g)][metric] = stats
+    return result
+
+
+# 이동 구간 분석 서비스
+class CycleAnalyticsService:
+    def __init__(self, db: Session):
+        self.db = db  # DB 세션
+
+    # 기간 내 구간 → 그룹(pin / robot / hour)별 단계 시간 백분위수
+    # - pin / robot: 작업 1회 시간(cycle) p90 내림차순 (느린 통로 / 로봇 우선)
+    # - hour: KST 시간대 순
+    # - service_time: 배정기 정차 작업 시간(DISPATCH_SERVICE_TIME) 보정용 실측 dwell 중앙값
+    def summary(self, group_by: str, since: float, until: float, robot: str | None = None, pin: str | None = None) -> dict:
+        q = self.db.query(
+            MoveCycle.robot_name, MoveCycle.pin_name, MoveCycle.dispatched_at, MoveCycle.arrived_at,
+            MoveCycle.confirmed_at, MoveCycle.return_started_at, MoveCycle.returned_at,
+        ).filter(MoveCycle.dispatched_at >= since, MoveCycle.dispatched_at < until)
+        if robot:
+            q = q.filter(MoveCycle.robot_name == robot)
+        if pin:
+            q = q.filter(MoveCycle.pin_name == pin)
+        rows = q.all()
+
+        cols = dict(zip(
+            ("dispatched_at", "arrived_at", "confirmed_at", "return_started_at", "returned_at"),
+            np.array([r[2:] for r in rows], dtype=np.float64).reshape(len(rows), 5).T,
+        ))
+        values = {name: cols[end] - cols[begin] for name, begin, end in PHASES}
+
+        if group_by == "robot":
+            keys = np.array([r[0] for r in rows], dtype=object)
+        elif group_by == "pin":
+            keys = np.array([r[1] for r in rows], dtype=object)
+        else:
+            keys = ((cols["dispatched_at"] + KST_OFFSET) // 3600 % 24).astype(np.int64)
+
+        groups = group_percentiles(keys, values)
+        overall = group_percentiles(np.zeros(len(rows), dtype=np.int64), values).get("0", {"count": 0})
+
+        items = [{"key": k, **v} for k, v in groups.items()]
+        if group_by == "hour":
+            items.sort(key=lambda g: int(g["key"]))
+        else:
+            items.sort(key=lambda g: g["cycle"].get("p90", -1.0), reverse=True)
+
+        return {
+            "group_by": group_by,
+            "since": since,
+            "until": until,
+            "overall": overall,
+            "service_time": {
+                "configured": settings.DISPATCH_SERVICE_TIME,
+                "observed_p50": overall.get("dwell", {}).get("p50"),
+            },
+            "groups": items,
+        }
+
+
+# 전역 이동 구간 기록기 (상태 기계 이벤트 구독)
+cycle_recorder = CycleRecorder()
+robot_fsm.on_event(cycle_recorder.on_event)
@@ -8,8 +8,8 @@ class PinService:
         self.db = db
 
     # CREATE 핀 생성
-    def create_pin(self, name: str, coords: Optional[str] = None):
-        pin = Pin(name=name, coords=coords)
+    def create_pin(self, name: str, x: Optional[float] = None, y: Optional[float] = None, yaw: Optional[float] = None):
+        pin = Pin(name=name, x=x, y=y, yaw=yaw)
         return pin_crud.create_pin(self.db, pin)
 
     # READ 전체 핀 조회
@@ -5,6 +5,7 @@ from datetime import datetime, timezone, timedelta
 from sqlalchemy.orm import Session
 
 from app.core.database import SessionLocal
+from app.core.list_cache import list_cache
 from app.models.stock_model import Stock
 from app.crud import log_crud
 from app.schemas.log_schema import LogCreate
@@ -158,7 +159,8 @@ class StockCsvService:
             # DB 세션 종료
             db.close()
 
-        # 재고 리스트 갱신 브로드캐스트
+        # 재고 목록 캐시 무효화 + 리스트 갱신 브로드캐스트
+        list_cache.invalidate("stocks")
         ws_manager.broadcast({"type": "stock_update", "payload": {}})
 
         return count
\ No newline at end of file
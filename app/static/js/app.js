@@ -17,6 +17,7 @@ document.addEventListener("DOMContentLoaded", () => {
   // 현재 로봇 및 단계 상태
   let activeRobot = null;
   let stage = "IDLE"; // IDLE → MOVING → ARRIVED → RETURNING → IDLE
+  let arrivedRobot = null; // 도착한 로봇 (다중 로봇 작업 확인용)
 
   // 확인 버튼 초기 비활성화
   actionBtn.style.display = "none";
@@ -112,6 +113,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
       if (pin !== "WAIT") {
         stage = "ARRIVED";
+        arrivedRobot = payload.robot_name || null;
         statusText.textContent = "상태: 도착!";
         actionBtn.textContent = "확인";
         actionBtn.style.display = "block";
@@ -129,7 +131,10 @@ document.addEventListener("DOMContentLoaded", () => {
   actionBtn.addEventListener("click", () => {
     if (stage !== "ARRIVED") return;
 
-    const msg = { type: "complete_stock_move" };
+    const msg = {
+      type: "complete_stock_move",
+      payload: { robot_name: arrivedRobot },
+    };
     console.log("WS SEND:", msg);
     ws.send(JSON.stringify(msg));
 
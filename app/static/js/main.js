@@ -4,7 +4,12 @@ document.addEventListener("DOMContentLoaded", () => {
   // WebSocket 연결
   const protocol = location.protocol === "https:" ? "wss" : "ws";
   const wsUrl = `${protocol}://${location.host}/ws`;
-  const ws = new WebSocket(wsUrl);
+  const wire = WmsWire.createDecoder();
+  let ws = null;
+
+  // 재접속 대기 시간 (ms, 실패 시 최대 10초까지 증가)
+  let reconnectDelay = 1000;
+  let wsConnectedOnce = false;
 
   // 지도 보정값 및 Pivot
   const PIVOT_X = 1.42;
@@ -167,10 +172,42 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
-  // WebSocket 메시지 수신 처리
-  ws.onmessage = (event) => {
-    const msg = JSON.parse(event.data);
-    const p = msg?.payload || {};
+  // WebSocket 연결 (재접속 시 마지막 순번 전달 → 누락 이벤트만 수신)
+  function connectWs() {
+    ws = new WebSocket(wire.resumeUrl(wsUrl));
+
+    // 위치 스트림 압축 형식 협상
+    ws.onopen = () => {
+      reconnectDelay = 1000;
+      WmsWire.hello(ws);
+    };
+
+    // 메시지 수신 (스냅샷 / 누락분은 개별 메시지로 전개)
+    ws.onmessage = (event) => {
+      const msg = wire.decode(event.data);
+      if (!msg) return;
+
+      // 재접속 후 스냅샷 = 누락 이벤트 복구 불가 → 목록 데이터 재조회
+      if (msg.type === "snapshot" && wsConnectedOnce) {
+        loadProducts();
+        loadRecentTasks();
+        loadTodaySummary();
+      }
+      if (msg.type === "snapshot" || msg.type === "replay") wsConnectedOnce = true;
+
+      WmsWire.expand(msg).forEach(handleMessage);
+    };
+
+    // 연결 종료 시 재접속
+    ws.onclose = () => {
+      setTimeout(connectWs, reconnectDelay);
+      reconnectDelay = Math.min(reconnectDelay * 2, 10000);
+    };
+  }
+
+  // WebSocket 메시지 처리
+  function handleMessage(msg) {
+    const p = msg.payload || {};
 
     // 신규 로그 알림 처리
     if (msg.type === "new_log") {
@@ -238,16 +275,19 @@ document.addEventListener("DOMContentLoaded", () => {
     }
 
     renderRobotCards();
-  };
+  }
 
-  // WebSocket 연결 종료 시 자동 새로고침
-  ws.onclose = () => {
-    setTimeout(() => location.reload(), 1500);
-  };
+  connectWs();
 
-  // 지도 정보 로딩
+  // 지도 정보 로딩 (서버 지도 이미지 변환 중 503 → Retry-After 후 재시도)
   async function loadMap() {
     const res = await fetch("/map/info");
+    if (res.status === 503) {
+      const wait = Number(res.headers.get("Retry-After")) || 1;
+      setTimeout(loadMap, wait * 1000);
+      return;
+    }
+    if (!res.ok) return console.error("지도 로딩 실패:", res.status);
     mapInfo = await res.json();
     document.getElementById("map_image").src = mapInfo.image;
   }
@@ -341,10 +381,32 @@ document.addEventListener("DOMContentLoaded", () => {
   });
 
   // 시작 버튼 처리
-  document.getElementById("btn_start").addEventListener("click", () => {
+  document.getElementById("btn_start").addEventListener("click", async () => {
     if (pendingCommands.length === 0)
       return alert("대기 중인 명령이 없습니다.");
 
+    // 여러 건 → 배치 주문 (경로 최적화 후 순차 방문)
+    if (pendingCommands.length > 1) {
+      const res = await fetch("/orders/batch", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({
+          moves: pendingCommands.map((c) => ({
+            stock_id: c.stock_id,
+            amount: c.amount,
+            mode: c.mode,
+          })),
+        }),
+      });
+      const data = await res.json();
+      if (!res.ok) return alert(data.detail || "배치 주문 실패");
+
+      pendingCommands = [];
+      document.getElementById("log_area").innerHTML = "";
+      alert(`배치 작업 시작: 트립 ${data.plan.trips.length}개, 예상 ${data.plan.distance}m`);
+      return;
+    }
+
     const cmd = pendingCommands.shift();
 
     ws.send(JSON.stringify({
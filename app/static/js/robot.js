@@ -62,18 +62,33 @@ document.addEventListener("DOMContentLoaded", () => {
     (location.protocol === "https:" ? "wss://" : "ws://") +
     location.host +
     "/ws";
-  const ws = new WebSocket(WS_URL);
+  const wire = WmsWire.createDecoder();
+  let ws = null;
+
+  // 재접속 대기 시간 (ms, 실패 시 최대 10초까지 증가)
+  let reconnectDelay = 1000;
 
   // 초기 상태 동기화 타이머
   let lastStatusAt = 0;
   let wsOpenedAt = 0;
   let initStatusTimeout = null;
 
-  ws.onopen = () => {
+  // WebSocket 연결 (재접속 시 마지막 순번 전달 → 누락 이벤트만 수신)
+  function connectWs() {
+    ws = new WebSocket(wire.resumeUrl(WS_URL));
+    ws.onopen = onWsOpen;
+    ws.onmessage = onWsMessage;
+    ws.onerror = (err) => console.error("[WS] Error:", err);
+    ws.onclose = onWsClose;
+  }
+
+  function onWsOpen() {
     console.log("[WS] Connected", WS_URL);
+    reconnectDelay = 1000;
 
     wsOpenedAt = Date.now();
     ws.send(JSON.stringify({ type: "init_request" }));
+    WmsWire.hello(ws);
 
     if (netStatusEl) {
       netStatusEl.textContent = "동기화 중…";
@@ -89,17 +104,21 @@ document.addEventListener("DOMContentLoaded", () => {
         }
       }
     }, 1500);
-  };
-
-  ws.onerror = (err) => console.error("[WS] Error:", err);
+  }
 
-  ws.onclose = () => {
+  // 연결 종료 시 재접속
+  function onWsClose() {
     console.warn("[WS] Disconnected");
     if (initStatusTimeout) {
       clearTimeout(initStatusTimeout);
       initStatusTimeout = null;
     }
-  };
+
+    setTimeout(connectWs, reconnectDelay);
+    reconnectDelay = Math.min(reconnectDelay * 2, 10000);
+  }
+
+  connectWs();
 
   // ping 전송 타이머
   const pingTimer = setInterval(() => {
@@ -159,10 +178,24 @@ document.addEventListener("DOMContentLoaded", () => {
   const manualLock = document.getElementById("manual_lock");
   const dirButtons = document.querySelectorAll(".dir_btn");
 
-  // WebSocket 메시지 수신 처리
-  ws.onmessage = (event) => {
+  // WebSocket 메시지 수신 (스냅샷 / 누락분은 개별 메시지로 전개)
+  function onWsMessage(event) {
+    try {
+      const data = wire.decode(event.data);
+      if (!data) return;
+
+      // 누락분 재전송 = 이전 연결 상태 유지 중 (연결 상태 동기화 완료로 처리)
+      if (data.type === "replay") lastStatusAt = Date.now();
+
+      WmsWire.expand(data).forEach(handleMessage);
+    } catch (err) {
+      console.error("[WS 메시지 처리 오류]", err);
+    }
+  }
+
+  // WebSocket 메시지 처리
+  function handleMessage(data) {
     try {
-      const data = JSON.parse(event.data);
 
       // 로봇 상태 표시 UI 갱신
       if (data.type === "robot_status") {
@@ -299,7 +332,7 @@ document.addEventListener("DOMContentLoaded", () => {
     } catch (err) {
       console.error("[WS 메시지 처리 오류]", err);
     }
-  };
+  }
 
   // 로봇 목록 로딩 및 셀렉트 갱신
   async function loadRobotList() {
@@ -731,10 +764,16 @@ document.addEventListener("DOMContentLoaded", () => {
   const ROBOT_MAP_SCALE_X = 0.85;
   const ROBOT_MAP_SCALE_Y = 0.80;
 
-  // 로봇 관리 지도 로딩
+  // 로봇 관리 지도 로딩 (서버 지도 이미지 변환 중 503 → Retry-After 후 재시도)
   async function robotMap_loadMap() {
     try {
       const res = await fetch("/map/info");
+      if (res.status === 503) {
+        const wait = Number(res.headers.get("Retry-After")) || 1;
+        setTimeout(robotMap_loadMap, wait * 1000);
+        return;
+      }
+      if (!res.ok) throw new Error(`HTTP ${res.status}`);
       const info = await res.json();
 
       robotMap_info = info;
@@ -173,12 +173,14 @@ document.addEventListener("DOMContentLoaded", () => {
       if (!name) return alert("위치명을 입력하세요.");
       if (!xVal || !yVal) return alert("좌표(X,Y)를 입력하세요.");
 
-      const coords = `${xVal},${yVal}`;
+      const x = Number(xVal);
+      const y = Number(yVal);
+      if (!Number.isFinite(x) || !Number.isFinite(y)) return alert("좌표는 숫자로 입력하세요.");
 
       const res = await fetch("/pins/", {
         method: "POST",
         headers: { "Content-Type": "application/json" },
-        body: JSON.stringify({ name, coords }),
+        body: JSON.stringify({ name, x, y }),
       });
 
       if (!res.ok) {
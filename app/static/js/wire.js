@@ -0,0 +1,146 @@
+// WebSocket 수신 디코더
+// - 위치 스트림 compact / binary 델타 프레임 → 기존 JSON 메시지 형태
+//   (접속 직후 hello 로 형식 협상, localStorage "wms_pose_format" 로 변경 가능)
+// - odom / amcl_pose 는 변경 필드만 수신하므로 로봇별 마지막 값을 보관해 복원
+// - 접속 시 상태 스냅샷 / 재접속 누락분(replay) → 개별 메시지 목록으로 전개
+// - 마지막 수신 순번(seq) 추적 → 재접속 URL 에 last_seq / epoch 전달
+window.WmsWire = (() => {
+  const KIND_AMCL = 1;
+  const KIND_ODOM = 2;
+  const KEYFRAME = 0x80;
+
+  // 서버 codec.FIELDS 와 동일 (hello_ack 수신 시 갱신)
+  let fields = {
+    [KIND_AMCL]: [["x", 0x01, 1000, "i"], ["y", 0x02, 1000, "i"], ["theta", 0x04, 10000, "h"]],
+    [KIND_ODOM]: [["v", 0x08, 1000, "h"], ["w", 0x10, 1000, "h"]],
+  };
+
+  function createDecoder() {
+    let robots = {};
+    const last = {};
+    let lastSeq = null;
+    let epoch = null;
+
+    // 델타 반영 → 전체 값 (키프레임 전 델타는 무시)
+    function apply(kind, mask, robot, values) {
+      const key = `${kind}:${robot}`;
+      let state = last[key];
+      if (mask & KEYFRAME) {
+        state = last[key] = {};
+      } else if (!state) {
+        return null;
+      }
+
+      let i = 0;
+      for (const [name, bit, scale] of fields[kind]) {
+        if (mask & bit) state[name] = values[i++] / scale;
+      }
+
+      const robotName = robots[robot];
+      if (robotName == null) return null;
+
+      if (kind === KIND_AMCL) {
+        return {
+          type: "amcl_pose",
+          payload: { robot_name: robotName, x: state.x, y: state.y, theta: state.theta },
+        };
+      }
+      return {
+        type: "odom",
+        payload: { robot_name: robotName, linear: { x: state.v }, angular: { z: state.w } },
+      };
+    }
+
+    // 바이너리 프레임: kind(u8) mask(u8) robot(u16) + 변경 필드 (little endian)
+    function decodeBinary(buf) {
+      const view = new DataView(buf);
+      const kind = view.getUint8(0);
+      const mask = view.getUint8(1);
+      const robot = view.getUint16(2, true);
+      if (!fields[kind]) return null;
+
+      const values = [];
+      let offset = 4;
+      for (const [, bit, , fmt] of fields[kind]) {
+        if (!(mask & bit)) continue;
+        if (fmt === "i") {
+          values.push(view.getInt32(offset, true));
+          offset += 4;
+        } else {
+          values.push(view.getInt16(offset, true));
+          offset += 2;
+        }
+      }
+      return apply(kind, mask, robot, values);
+    }
+
+    // 수신 데이터 → 메시지 객체 (내부 제어 메시지는 null)
+    function decode(data) {
+      if (data instanceof ArrayBuffer) return decodeBinary(data);
+
+      const msg = JSON.parse(data);
+      if (Array.isArray(msg)) {
+        const [kind, robot, mask, ...values] = msg;
+        return fields[kind] ? apply(kind, mask, robot, values) : null;
+      }
+
+      if (msg.seq != null && (lastSeq == null || msg.seq > lastSeq)) lastSeq = msg.seq;
+      if (msg.epoch) epoch = msg.epoch;
+
+      if (msg.type === "hello_ack") {
+        robots = msg.payload?.robots || {};
+        if (msg.payload?.fields) fields = msg.payload.fields;
+        return null;
+      }
+      if (msg.type === "wire_robots") {
+        robots = msg.payload || {};
+        return null;
+      }
+      return msg;
+    }
+
+    // 접속 URL (이전 연결 순번이 있으면 누락분 재전송 요청)
+    function resumeUrl(base) {
+      if (lastSeq == null || !epoch) return base;
+      return `${base}?last_seq=${lastSeq}&epoch=${encodeURIComponent(epoch)}`;
+    }
+
+    return { decode, resumeUrl };
+  }
+
+  // 메시지 → 처리할 메시지 목록
+  // - replay: 누락 메시지 배열
+  // - snapshot: 로봇별 status / robot_status / battery / amcl_pose
+  function expand(msg) {
+    if (msg.type === "replay") return msg.payload || [];
+    if (msg.type !== "snapshot") return [msg];
+
+    const { robots = {}, active_robot: active } = msg.payload || {};
+    const out = [];
+    // 활성 로봇을 마지막에 적용 (화면 기준 로봇 유지)
+    const names = Object.keys(robots).filter((n) => n !== active);
+    if (active && robots[active]) names.push(active);
+
+    for (const name of names) {
+      const r = robots[name];
+      out.push({ type: "status", payload: { robot_name: name, ip: r.ip, connected: r.connected } });
+      if (r.state) out.push({ type: "robot_status", payload: { name, state: r.state } });
+      if (r.battery != null) out.push({ type: "battery", payload: { robot_name: name, percentage: r.battery } });
+      if (r.pose) out.push({ type: "amcl_pose", payload: { robot_name: name, ...r.pose } });
+    }
+
+    if (active && robots[active]?.pose) {
+      out.push({ type: "robot_pose_restore", payload: robots[active].pose });
+    }
+    return out;
+  }
+
+  // 형식 협상 요청 (json / compact / binary)
+  function hello(ws) {
+    ws.binaryType = "arraybuffer";
+    const format = localStorage.getItem("wms_pose_format") || "binary";
+    ws.send(JSON.stringify({ type: "hello", payload: { pose_format: format } }));
+  }
+
+  return { createDecoder, expand, hello };
+})();
@@ -0,0 +1,145 @@
+import json
+import struct
+
+# 클라이언트별 협상 가능한 위치 스트림 형식
+# - json    : 기존 전체 JSON 메시지 (기본값)
+# - compact : 짧은 JSON 배열 [kind, robot, mask, 값...]
+# - binary  : 고정 소수점 바이너리 프레임
+POSE_FORMATS = ("json", "compact", "binary")
+
+# 압축 대상 메시지 타입 → 프레임 종류
+KIND_AMCL = 1
+KIND_ODOM = 2
+POSE_KINDS = {"amcl_pose": KIND_AMCL, "odom": KIND_ODOM}
+
+# 종류별 필드: (이름, 마스크 비트, 양자화 배율, struct 형식)
+# x/y: mm, theta: 0.1 mrad, v: mm/s, w: mrad/s
+FIELDS = {
+    KIND_AMCL: (
+        ("x", 0x01, 1000, "i"),
+        ("y", 0x02, 1000, "i"),
+        ("theta", 0x04, 10000, "h"),
+    ),
+    KIND_ODOM: (
+        ("v", 0x08, 1000, "h"),
+        ("w", 0x10, 1000, "h"),
+    ),
+}
+
+# 전체 값 프레임 표시 비트
+KEYFRAME = 0x80
+
+# 프레임 헤더: kind(u8), mask(u8), robot(u16)
+HEADER = struct.Struct("<BBH")
+
+_INT16 = 32767
+
+
+# 양자화 (int16 필드는 범위 내로 제한)
+def _quantize(value, scale: int, fmt: str) -> int:
+    q = int(round(float(value or 0.0) * scale))
+    if fmt == "h":
+        return max(-_INT16, min(_INT16, q))
+    return q
+
+
+# payload → 양자화 값 리스트
+def _values(kind: int, payload: dict) -> list:
+    if kind == KIND_AMCL:
+        raw = (payload.get("x"), payload.get("y"), payload.get("theta"))
+    else:
+        raw = (
+            (payload.get("linear") or {}).get("x"),
+            (payload.get("angular") or {}).get("z"),
+        )
+    return [
+        _quantize(v, scale, fmt)
+        for v, (_, _, scale, fmt) in zip(raw, FIELDS[kind])
+    ]
+
+
+# 위치 스트림 델타 인코더 (브로드캐스트당 1회 인코딩, 모든 compact/binary 클라이언트 공유)
+# - 직전 전송값 대비 변경된 필드만 포함
+# - keyframe_every 프레임마다 전체 값 전송 (누락/순서 역전 자동 복구)
+class PoseDeltaEncoder:
+    def __init__(self, keyframe_every: int = 50):
+        self.keyframe_every = keyframe_every
+        self._robots: dict[str, int] = {}
+        self._last: dict[tuple, list] = {}
+        self._since_key: dict[tuple, int] = {}
+
+    # 로봇 번호 테이블 (클라이언트 디코딩용)
+    def robot_table(self) -> dict:
+        return {idx: name for name, idx in self._robots.items()}
+
+    def _robot_index(self, name: str) -> tuple[int, bool]:
+        idx = self._robots.get(name)
+        if idx is not None:
+            return idx, False
+        idx = len(self._robots)
+        self._robots[name] = idx
+        return idx, True
+
+    # WS 메시지 → (binary 프레임, compact 텍스트, 신규 로봇 여부)
+    # 변경 사항이 없으면 None
+    def encode(self, data: dict):
+        kind = POSE_KINDS.get(data.get("type"))
+        payload = data.get("payload") or {}
+        if kind is None or not payload.get("robot_name"):
+            return None
+
+        robot, is_new = self._robot_index(payload["robot_name"])
+        key = (kind, robot)
+        values = _values(kind, payload)
+        last = self._last.get(key)
+
+        count = self._since_key.get(key, 0) + 1
+        keyframe = last is None or count >= self.keyframe_every
+        self._since_key[key] = 0 if keyframe else count
+        self._last[key] = values
+
+        fields = FIELDS[kind]
+        if keyframe:
+            mask = KEYFRAME
+            changed = list(zip(fields, values))
+            for f in fields:
+                mask |= f[1]
+        else:
+            changed = [(f, v) for f, v, old in zip(fields, values, last) if v != old]
+            if not changed:
+                return None
+            mask = 0
+            for f, _ in changed:
+                mask |= f[1]
+
+        return self._frames(kind, mask, robot, changed) + (is_new,)
+
+    @staticmethod
+    def _frames(kind: int, mask: int, robot: int, changed: list) -> tuple[bytes, str]:
+        fmt = "<" + "".join(f[3] for f, _ in changed)
+        vals = [v for _, v in changed]
+        binary = HEADER.pack(kind, mask, robot) + struct.pack(fmt, *vals)
+        compact = json.dumps([kind, robot, mask, *vals], separators=(",", ":"))
+        return binary, compact
+
+    # 현재 전체 상태 키프레임 (신규 클라이언트 hello 응답용)
+    def keyframes(self) -> list[tuple[bytes, str]]:
+        frames = []
+        for (kind, robot), values in self._last.items():
+            mask = KEYFRAME
+            for f in FIELDS[kind]:
+                mask |= f[1]
+            frames.append(self._frames(kind, mask, robot, list(zip(FIELDS[kind], values))))
+        return frames
+
+
+# hello 응답 payload (형식 / 필드 배율 / 로봇 테이블)
+def describe(fmt: str, encoder: PoseDeltaEncoder) -> dict:
+    return {
+        "pose_format": fmt,
+        "robots": encoder.robot_table(),
+        "fields": {
+            kind: [[name, bit, scale, fmt_] for name, bit, scale, fmt_ in fields]
+            for kind, fields in FIELDS.items()
+        },
+    }
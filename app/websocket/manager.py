@@ -1,121 +1,325 @@
+import time
+import json
+import uuid
 import asyncio
+from collections import deque
 from fastapi import WebSocket
 from datetime import datetime, timezone, timedelta
 
+from app.core.config import settings
+from app.core.broker import broker
+from app.core.list_cache import list_cache
+from app.core.telemetry.ring_buffer import telemetry_store
 from app.core.database import SessionLocal
 from app.models.stock_model import Stock
 from app.models.pin_model import Pin
 from app.schemas.log_schema import LogCreate
 from app.crud import log_crud
+from app.core.metrics import (
+    ws_clients,
+    ws_broadcast_seconds,
+    ws_dropped_frames_total,
+    ws_sent_bytes_total,
+    ros_ingest_to_broadcast_seconds,
+)
+from app.websocket import codec
+from app.websocket.state_store import state_store
 
 # WebSocket 활성 클라이언트 목록
 _active_clients = []
+ws_clients.set_function(lambda: len(_active_clients))
 
-# 로봇 상태 캐시 (새 클라이언트 접속 시 상태 복구용)
-robot_status_cache = {}
+# 클라이언트별 위치 스트림 형식 (hello 협상, 미등록 클라이언트는 json)
+_client_formats = {}
 
-# 마지막 작업(입고/출고) 정보 캐시
-_last_job = {
-    "stock_id": None,
-    "amount": None,
-    "mode": None,
+# 위치 스트림 델타 인코더 (전 클라이언트 공유)
+_pose_encoder = codec.PoseDeltaEncoder()
+
+# 브로드캐스트 순번 / 서버 기동 식별자 (재시작 후 순번 초기화 감지용)
+_seq = 0
+EPOCH = uuid.uuid4().hex[:8]
+
+# 고빈도 토픽 메시지 (최신값만 의미 있음 → 재전송 버퍼 대신 최신값만 보관)
+STREAM_TYPES = {
+    "odom", "amcl_pose", "battery", "diagnostics",
+    "base_link", "nav", "cmd_vel", "teleop_key",
 }
 
+# 이벤트 재전송 버퍼 [(seq, text)] + 버퍼에서 밀려난 마지막 순번
+_replay = deque(maxlen=settings.WS_REPLAY_BUFFER)
+_replay_floor = 0
+
+# 스트림 토픽 최신 메시지 {(type, robot): (seq, data)}
+_latest = {}
+
 # KST 현재 시간
 def now():
     return datetime.now(timezone(timedelta(hours=9)))
 
 
-# WebSocket 클라이언트 등록 + 캐시 복구 전송
-async def register(ws: WebSocket):
-    _active_clients.append(ws)
-    print(f"[WS] 클라이언트 연결됨 (total={len(_active_clients)})")
+# 재접속 클라이언트의 누락분 → replay 메시지 (복구 불가 시 None)
+# - last_seq 이후 이벤트 전체 + 스트림 토픽별 최신값
+def _resume_text(last_seq: int, epoch: str | None) -> str | None:
+    if epoch != EPOCH or last_seq < _replay_floor or last_seq > _seq:
+        return None
 
-    # 로봇 상태 복구 전송
-    for robot_name, status in robot_status_cache.items():
-        try:
-            await ws.send_json({
-                "type": "robot_status",
-                "payload": {
-                    "name": robot_name,
-                    "state": status.get("state", "대기중"),
-                },
-            })
-        except:
-            pass
+    missed = [(seq, text) for seq, text in _replay if seq > last_seq]
+    for seq, data in _latest.values():
+        if seq > last_seq:
+            missed.append((seq, json.dumps({**data, "seq": seq}, separators=(",", ":"), ensure_ascii=False)))
+    missed.sort(key=lambda item: item[0])
+
+    body = ",".join(text for _, text in missed)
+    return f'{{"type":"replay","seq":{_seq},"epoch":"{EPOCH}","payload":[{body}]}}'
+
+
+# WebSocket 클라이언트 등록 + 초기 상태 전송 (메시지 1개)
+# - last_seq / epoch 전달 시 누락 이벤트만 재전송 (버퍼 범위 밖이면 스냅샷)
+# - 메시지 생성과 클라이언트 등록을 await 없이 수행해 이후 브로드캐스트 누락 방지
+async def register(ws: WebSocket, last_seq: int | None = None, epoch: str | None = None):
+    text = _resume_text(last_seq, epoch) if last_seq is not None else None
+    mode = "재접속 복구" if text is not None else "스냅샷"
+    if text is None:
+        text = state_store.snapshot_text(_seq, EPOCH)
+
+    _active_clients.append(ws)
+    print(f"[WS] 클라이언트 연결됨 (total={len(_active_clients)}, {mode})")
 
-    # 활성 로봇 연결 상태 복구 전송
-    try:
-        from app.core.ros.ros_manager import ros_manager
-        active = ros_manager.active_robot
-        if active:
-            client = ros_manager.clients.get(active)
-            if client and client.connected:
-                await ws.send_json({
-                    "type": "status",
-                    "payload": {
-                        "robot_name": active,
-                        "ip": client.ip,
-                        "connected": True,
-                    },
-                })
-    except:
-        pass
-
-    # 마지막 로봇 위치 복구 전송
     try:
-        from app.core.ros.ros_manager import ros_manager
-        last_pose = ros_manager.last_pose
-        if last_pose:
-            await ws.send_json({
-                "type": "robot_pose_restore",
-                "payload": last_pose,
-            })
-    except:
-        pass
+        await ws.send_text(text)
+    except Exception as e:
+        print("[WS] 초기 상태 전송 실패:", e)
 
 
 # WebSocket 클라이언트 해제
 async def unregister(ws: WebSocket):
     if ws in _active_clients:
         _active_clients.remove(ws)
+    _client_formats.pop(ws, None)
+
+
+# 위치 스트림 형식 협상 (hello → hello_ack + 현재 위치 키프레임)
+async def negotiate(ws: WebSocket, payload: dict):
+    fmt = payload.get("pose_format") or "json"
+    if fmt not in codec.POSE_FORMATS:
+        fmt = "json"
+
+    if fmt == "json":
+        _client_formats.pop(ws, None)
+    else:
+        _client_formats[ws] = fmt
+
+    await ws.send_json({
+        "type": "hello_ack",
+        "payload": codec.describe(fmt, _pose_encoder),
+    })
+    if fmt == "json":
+        return
+
+    for binary, compact in _pose_encoder.keyframes():
+        if fmt == "binary":
+            await ws.send_bytes(binary)
+        else:
+            await ws.send_text(compact)
 
 
 # 모든 클라이언트에 메시지 브로드캐스트
-async def broadcast_json(data: dict):
+# - 순번(seq)과 서버 송신 시각(ts, epoch 초)을 붙여 전송 (재접속 복구 / 전달 지연 측정)
+# - JSON 직렬화는 브로드캐스트당 1회만 수행 후 텍스트로 팬아웃
+# - 이벤트 메시지는 재전송 버퍼에, 스트림 토픽은 최신값만 보관
+# - odom / amcl_pose 는 compact / binary 클라이언트에 델타 프레임으로 전송
+#   (변경 필드가 없으면 해당 클라이언트에는 전송 생략)
+# ingest_ts: ROS 콜백 수신 시각(perf_counter), 지연 측정용
+async def broadcast_json(data: dict, ingest_ts: float | None = None):
+    global _seq, _replay_floor
+    start = time.perf_counter()
+
+    # 순번 부여 + 상태 저장소 반영 (await 전 수행 → 스냅샷/재전송 기준 일치)
+    _seq += 1
+    seq = _seq
+    state_store.observe(data)
+
+    msg_type = data.get("type")
+    text = None
+    if msg_type in STREAM_TYPES:
+        robot = (data.get("payload") or {}).get("robot_name")
+        _latest[(msg_type, robot)] = (seq, data)
+    else:
+        text = json.dumps({**data, "seq": seq, "ts": time.time()}, separators=(",", ":"), ensure_ascii=False)
+        if len(_replay) == _replay.maxlen:
+            _replay_floor = _replay[0][0]
+        _replay.append((seq, text))
+
+    # 델타 인코딩은 클라이언트 유무와 관계없이 수행 (키프레임 상태 유지)
+    pose_stream = msg_type in codec.POSE_KINDS
+    frames = _pose_encoder.encode(data) if pose_stream else None
+
+    robots_text = None
     for ws in list(_active_clients):
+        fmt = _client_formats.get(ws, "json")
         try:
-            await ws.send_json(data)
+            if fmt == "json" or not pose_stream:
+                if text is None:
+                    text = json.dumps({**data, "seq": seq, "ts": time.time()}, separators=(",", ":"), ensure_ascii=False)
+                await ws.send_text(text)
+                ws_sent_bytes_total.inc("json", amount=len(text))
+                continue
+
+            if frames is None:
+                continue
+
+            binary, compact, new_robot = frames
+            if new_robot:
+                # 신규 로봇 번호 테이블 먼저 전송
+                if robots_text is None:
+                    robots_text = json.dumps({
+                        "type": "wire_robots",
+                        "payload": _pose_encoder.robot_table(),
+                    }, ensure_ascii=False)
+                await ws.send_text(robots_text)
+
+            if fmt == "binary":
+                await ws.send_bytes(binary)
+                ws_sent_bytes_total.inc("binary", amount=len(binary))
+            else:
+                await ws.send_text(compact)
+                ws_sent_bytes_total.inc("compact", amount=len(compact))
         except:
+            ws_dropped_frames_total.inc()
             await unregister(ws)
 
+    end = time.perf_counter()
+    ws_broadcast_seconds.observe(end - start)
+    if ingest_ts is not None:
+        ros_ingest_to_broadcast_seconds.observe(end - ingest_ts, msg_type)
+
 
 # 동기 코드에서 안전하게 broadcast 호출하기 위한 래퍼
 class WSManager:
     def __init__(self):
         self.loop = asyncio.get_event_loop()
 
-    def broadcast(self, data: dict):
+    # 서버 이벤트 루프 지정 (uvicorn은 루프 생성 전에 앱을 import할 수 있음)
+    def bind_loop(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+
+    # 브로커로 발행 → 모든 워커가 각자의 클라이언트에 팬아웃
+    def broadcast(self, data: dict, ingest_ts: float | None = None):
+        broker.publish("broadcast", {"data": data, "ingest_ts": ingest_ts})
+
+    # 브로커 수신 (로컬 발행 포함)
+    # - 다른 워커의 ROS 텔레메트리는 로컬 이력 버퍼에도 기록 (텔레메트리 조회 API 일관성)
+    # - ingest_ts 는 프로세스 내 perf_counter 값이므로 로컬 발행분만 사용
+    def _on_broadcast(self, message: dict, remote: bool):
+        data = message.get("data") or {}
+        ingest_ts = None
+        if remote:
+            robot = (data.get("payload") or {}).get("robot_name")
+            if robot and data.get("type") in ("amcl_pose", "odom", "battery"):
+                telemetry_store.record_message(robot, data)
+        else:
+            ingest_ts = message.get("ingest_ts")
+
         try:
-            asyncio.run_coroutine_threadsafe(broadcast_json(data), self.loop)
+            asyncio.run_coroutine_threadsafe(broadcast_json(data, ingest_ts), self.loop)
         except RuntimeError:
             loop = asyncio.get_event_loop()
-            asyncio.run_coroutine_threadsafe(broadcast_json(data), loop)
+            asyncio.run_coroutine_threadsafe(broadcast_json(data, ingest_ts), loop)
 
 
 # 전역 WS 매니저
 ws_manager = WSManager()
+broker.subscribe("broadcast", ws_manager._on_broadcast)
+
+
+# 입고/출고 시작 로그 저장
+def log_move_start(db, stock: Stock, amount: int, mode: str, robot_name: str | None):
+    action = "입고 시작" if mode == "INBOUND" else "출고 시작"
+    log_crud.create_log(db, LogCreate(
+        robot_name=robot_name,
+        pin_name=stock.pin.name,
+        category_name=stock.category.name,
+        stock_name=stock.name,
+        stock_id=stock.id,
+        quantity=amount,
+        action=action,
+        timestamp=now(),
+    ))
+
+
+# 재고 수량 반영 + 완료 로그 저장 → (이전 수량, 이후 수량)
+def apply_stock_move(stock_id: int, amount: int, mode: str, robot_name: str | None) -> tuple[int, int]:
+    db = SessionLocal()
+    try:
+        stock = db.query(Stock).filter(Stock.id == stock_id).first()
+        pin = stock.pin
+
+        old_qty = stock.quantity
+        if mode == "INBOUND":
+            stock.quantity += amount
+        else:
+            stock.quantity = max(stock.quantity - amount, 0)
+
+        new_qty = stock.quantity
+        db.commit()
+        state_store.bump_stock_version()
+        list_cache.invalidate("stocks")
+
+        # 이동 구간 작업 확인 시각 기록
+        from app.services.cycle_service import cycle_recorder
+        cycle_recorder.confirm(robot_name, stock_id, stock.name, mode, amount)
+
+        # 입고/출고 완료 로그 저장
+        action = f"{'입고' if mode=='INBOUND' else '출고'} 완료 ({old_qty} → {new_qty})"
+        log_crud.create_log(db, LogCreate(
+            robot_name=robot_name,
+            pin_name=pin.name,
+            category_name=stock.category.name,
+            stock_name=stock.name,
+            stock_id=stock_id,
+            quantity=amount,
+            action=action,
+            timestamp=now(),
+        ))
+        return old_qty, new_qty
+    finally:
+        db.close()
+
+
+# 복귀 시작 (WAIT 명령 + 로그)
+def start_return(robot_name: str | None):
+    from app.core.ros.ros_manager import ros_manager
+
+    # 로봇 복귀 명령 (복귀중 상태는 상태 기계가 브로드캐스트)
+    ros_manager.send_ui_command("WAIT", robot_name)
+
+    # 복귀 시작 로그 저장
+    db = SessionLocal()
+    log_crud.create_log(db, LogCreate(
+        robot_name=robot_name,
+        pin_name="-",
+        category_name="-",
+        stock_name="-",
+        stock_id=None,
+        quantity=0,
+        action="복귀 시작",
+        timestamp=now(),
+    ))
+    db.close()
 
 
 # WebSocket 메시지 핸들러
 async def handle_message(ws: WebSocket, data: dict):
-    global _last_job
-
     # 메시지 타입 확인
     msg_type = data.get("type")
     if not msg_type:
         return
 
+    # hello → 위치 스트림 형식 협상
+    if msg_type == "hello":
+        await negotiate(ws, data.get("payload") or {})
+        return
+
     # cmd_vel → 로봇 속도 명령 전달
     if msg_type == "cmd_vel":
         from app.core.ros.ros_manager import ros_manager
@@ -134,35 +338,19 @@ async def handle_message(ws: WebSocket, data: dict):
 
             print(f"[WS] 이동 요청 → stock_id={stock_id}, mode={mode}")
 
-            # UI 상태 브로드캐스트 (이동중)
-            ws_manager.broadcast({
-                "type": "robot_status",
-                "payload": {"state": "이동중"},
-            })
-
             # DB에서 stock/pin 조회
             db = SessionLocal()
             stock = db.query(Stock).filter(Stock.id == stock_id).first()
             pin = db.query(Pin).filter(Pin.id == stock.pin_id).first()
 
-            # 마지막 작업 캐시 저장
-            _last_job = {"stock_id": stock_id, "amount": amount, "mode": mode}
+            # 마지막 작업 저장
+            state_store.set_job(stock_id, amount, mode)
 
             # 로봇에게 목표 핀 이동 명령 전송
             ros_manager.send_ui_command(pin.name)
 
             # 입고/출고 시작 로그 저장
-            action = "입고 시작" if mode == "INBOUND" else "출고 시작"
-            log_crud.create_log(db, LogCreate(
-                robot_name=ros_manager.active_robot,
-                pin_name=pin.name,
-                category_name=stock.category.name,
-                stock_name=stock.name,
-                stock_id=stock_id,
-                quantity=amount,
-                action=action,
-                timestamp=now(),
-            ))
+            log_move_start(db, stock, amount, mode, ros_manager.active_robot)
 
             db.close()
 
@@ -176,66 +364,26 @@ async def handle_message(ws: WebSocket, data: dict):
         try:
             from app.core.ros.ros_manager import ros_manager
 
-            job = _last_job
-            stock_id = job["stock_id"]
-            amount = job["amount"]
-            mode = job["mode"]
+            robot_name = (data.get("payload") or {}).get("robot_name")
 
-            # DB에서 재고 반영
-            db = SessionLocal()
-            stock = db.query(Stock).filter(Stock.id == stock_id).first()
-            pin = stock.pin
+            # 작업 배정기가 시작한 작업이면 해당 로봇 작업 반영
+            from app.core.fleet.dispatcher import fleet_dispatcher
+            if fleet_dispatcher.complete(robot_name):
+                return
 
-            old_qty = stock.quantity
-            if mode == "INBOUND":
-                stock.quantity += amount
-            else:
-                stock.quantity = max(stock.quantity - amount, 0)
-
-            new_qty = stock.quantity
-            db.commit()
-
-            # 입고/출고 완료 로그 저장
-            action = f"{'입고' if mode=='INBOUND' else '출고'} 완료 ({old_qty} → {new_qty})"
-            log_crud.create_log(db, LogCreate(
-                robot_name=ros_manager.active_robot,
-                pin_name=pin.name,
-                category_name=stock.category.name,
-                stock_name=stock.name,
-                stock_id=stock_id,
-                quantity=amount,
-                action=action,
-                timestamp=now(),
-            ))
+            # 배치 작업 로봇이면 현재 정차 지점 작업 일괄 처리
+            from app.services.batch_order_service import batch_runner
+            if batch_runner.owns(robot_name):
+                batch_runner.complete()
+                return
 
-            db.close()
+            job = state_store.last_job
+            apply_stock_move(job["stock_id"], job["amount"], job["mode"], ros_manager.active_robot)
 
             # 0.3초 후 복귀 시작 (WAIT 명령 + 상태/로그)
             async def delayed_return():
                 await asyncio.sleep(0.3)
-
-                # 로봇 복귀 명령
-                ros_manager.send_ui_command("WAIT")
-
-                # UI 상태 브로드캐스트 (복귀중)
-                ws_manager.broadcast({
-                    "type": "robot_status",
-                    "payload": {"state": "복귀중"},
-                })
-
-                # 복귀 시작 로그 저장
-                db2 = SessionLocal()
-                log_crud.create_log(db2, LogCreate(
-                    robot_name=ros_manager.active_robot,
-                    pin_name="-",
-                    category_name="-",
-                    stock_name="-",
-                    stock_id=None,
-                    quantity=0,
-                    action="복귀 시작",
-                    timestamp=now(),
-                ))
-                db2.close()
+                start_return(ros_manager.active_robot)
 
             asyncio.create_task(delayed_return())
 
@@ -244,57 +392,18 @@ async def handle_message(ws: WebSocket, data: dict):
 
         return
 
-    # robot_status → 상태 캐시 + 도착/복귀완료 로그 + 상태 브로드캐스트
+    # robot_status (클라이언트 보고) → 비상정지만 서버 상태 기계에 반영
+    # - 이동 / 도착 / 복귀 / 대기 상태와 도착·복귀 완료 로그는 상태 기계가 ROS 이벤트로 처리
     if msg_type == "robot_status":
         payload = data.get("payload") or {}
-        state = payload.get("state")
 
         from app.core.ros.ros_manager import ros_manager
+        from app.core.fleet.state_machine import robot_fsm
 
         # 로봇 이름 보정 (없으면 active_robot 사용)
         name = payload.get("name") or ros_manager.active_robot
-        payload["name"] = name
-
-        # 상태 캐시에 저장
-        robot_status_cache[name] = {"state": state}
-
-        # 도착 로그 저장
-        if state == "도착":
-            db = SessionLocal()
-            stock = db.query(Stock).filter(Stock.id == _last_job["stock_id"]).first()
-            pin = stock.pin
-            log_crud.create_log(db, LogCreate(
-                robot_name=name,
-                pin_name=pin.name,
-                category_name="-",
-                stock_name="-",
-                stock_id=None,
-                quantity=0,
-                action="도착",
-                timestamp=now(),
-            ))
-            db.close()
-
-        # 대기중 상태 → 복귀 완료 로그 저장
-        if state == "대기중":
-            db = SessionLocal()
-            log_crud.create_log(db, LogCreate(
-                robot_name=name,
-                pin_name="-",
-                category_name="-",
-                stock_name="-",
-                stock_id=None,
-                quantity=0,
-                action="복귀 완료",
-                timestamp=now(),
-            ))
-            db.close()
-
-        # 상태 브로드캐스트
-        ws_manager.broadcast({
-            "type": "robot_status",
-            "payload": payload,
-        })
+        if name:
+            robot_fsm.on_client_status(name, payload.get("state"))
         return
 
     # ui_command → 로봇에 UI 명령 전달
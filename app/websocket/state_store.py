@@ -0,0 +1,138 @@
+import json
+import threading
+
+from app.core.broker import broker
+
+
+# 서버 실시간 상태 저장소 (신규 WS 클라이언트 스냅샷용)
+# - 로봇별 작업 상태 / 연결 상태 / 위치 / 배터리, 활성 로봇, 마지막 작업, 재고 버전
+# - 브로드캐스트 메시지와 ROS 연결 관리자에서 갱신
+# - 직접 변경(set_*)은 브로커로 다른 워커에 복제 (브로드캐스트 반영분은 워커별로 각자 수행)
+# - 스냅샷은 1개 메시지로 미리 직렬화해 캐시, 상태 변경 시에만 무효화
+#   (재접속 폭주 시에도 직렬화는 변경 1회당 최대 1번)
+class StateStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.robots: dict[str, dict] = {}
+        self.active_robot: str | None = None
+        self.last_job = {
+            "stock_id": None,
+            "amount": None,
+            "mode": None,
+        }
+        self.stock_version = 0
+        self._snapshot: str | None = None
+
+    # 로봇 항목 (없으면 생성) - lock 보유 상태에서 호출
+    def _robot(self, name: str) -> dict:
+        robot = self.robots.get(name)
+        if robot is None:
+            robot = self.robots[name] = {
+                "state": None,
+                "connected": False,
+                "ip": None,
+                "pose": None,
+                "battery": None,
+            }
+        return robot
+
+    # 로봇 연결 상태 반영
+    def set_connection(self, name: str, connected: bool, ip: str | None = None):
+        self._update("set_connection", name, connected, ip)
+
+    # 활성 로봇 변경
+    def set_active(self, name: str | None):
+        self._update("set_active", name)
+
+    # 마지막 작업(입고/출고) 저장
+    def set_job(self, stock_id, amount, mode):
+        self._update("set_job", stock_id, amount, mode)
+
+    # 재고 변경 → 버전 증가
+    def bump_stock_version(self):
+        self._update("bump_stock_version")
+
+    # 로컬 반영 + 다른 워커로 복제
+    def _update(self, op: str, *args):
+        self._apply(op, args)
+        broker.publish("state", {"op": op, "args": list(args)}, local=False)
+
+    # 다른 워커의 변경 수신
+    def _on_remote(self, message: dict, remote: bool):
+        if remote and message.get("op") in ("set_connection", "set_active", "set_job", "bump_stock_version"):
+            self._apply(message["op"], message.get("args") or [])
+
+    def _apply(self, op: str, args):
+        with self._lock:
+            if op == "set_connection":
+                name, connected, ip = args
+                robot = self._robot(name)
+                robot["connected"] = connected
+                if ip is not None:
+                    robot["ip"] = ip
+            elif op == "set_active":
+                if self.active_robot == args[0]:
+                    return
+                self.active_robot = args[0]
+            elif op == "set_job":
+                stock_id, amount, mode = args
+                self.last_job = {"stock_id": stock_id, "amount": amount, "mode": mode}
+            elif op == "bump_stock_version":
+                self.stock_version += 1
+            self._snapshot = None
+
+    # 브로드캐스트 메시지 → 상태 반영
+    def observe(self, data: dict):
+        msg_type = data.get("type")
+        payload = data.get("payload") or {}
+
+        if msg_type == "stock_update":
+            self._apply("bump_stock_version", ())
+            return
+
+        with self._lock:
+            if msg_type == "robot_status":
+                name = payload.get("name") or self.active_robot
+                if not name:
+                    return
+                self._robot(name)["state"] = payload.get("state")
+
+            elif msg_type == "amcl_pose" and payload.get("robot_name"):
+                self._robot(payload["robot_name"])["pose"] = {
+                    "x": payload.get("x"),
+                    "y": payload.get("y"),
+                    "theta": payload.get("theta"),
+                }
+
+            elif msg_type == "battery" and payload.get("robot_name"):
+                self._robot(payload["robot_name"])["battery"] = payload.get("percentage")
+
+            elif msg_type == "status" and payload.get("robot_name"):
+                robot = self._robot(payload["robot_name"])
+                robot["connected"] = bool(payload.get("connected"))
+                if payload.get("ip"):
+                    robot["ip"] = payload["ip"]
+
+            else:
+                return
+
+            self._snapshot = None
+
+    # 스냅샷 메시지 (payload 직렬화 결과 캐시)
+    # seq / epoch: 스냅샷 시점 브로드캐스트 순번 / 서버 기동 식별자 (재접속 복구 기준)
+    def snapshot_text(self, seq: int = 0, epoch: str = "") -> str:
+        with self._lock:
+            if self._snapshot is None:
+                self._snapshot = json.dumps({
+                    "robots": self.robots,
+                    "active_robot": self.active_robot,
+                    "last_job": self.last_job,
+                    "stock_version": self.stock_version,
+                }, separators=(",", ":"), ensure_ascii=False)
+            body = self._snapshot
+        return f'{{"type":"snapshot","seq":{seq},"epoch":"{epoch}","payload":{body}}}'
+
+
+# 전역 상태 저장소
+state_store = StateStore()
+broker.subscribe("state", state_store._on_remote)
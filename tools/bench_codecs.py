@@ -0,0 +1,248 @@
+"""
+메시지 코덱 마이크로 벤치마크 (ROS 메시지 1건마다 실행되는 경로)
+
+대상:
+  - process_ros_data   : 토픽별 변환 (data_processor.py 처리 토픽 전체)
+  - build_message      : WS 전송 메시지 생성
+  - quaternion_to_yaw  : yaw 변환
+  - /nav 경로 단순화   : 5k 점 전역 경로 추출 + RDP
+  - /diagnostics 요약  : 정상 / 경고 / 오류 상태 배열
+
+입력은 tools/data/ros_samples.json 의 기록 payload (TurtleBot3 / ROS2 형식)
+결과는 케이스별 ns/message 와 메시지당 할당 (tracemalloc 블록 수, 바이트)
+
+사용 예:
+    python tools/bench_codecs.py                         # 결과 표 출력
+    python tools/bench_codecs.py --save bench.json       # 기준 결과 저장
+    python tools/bench_codecs.py --compare bench.json    # 기준 대비 비교 (회귀 시 exit 1)
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.message import data_processor, message_builder, path_utils  # noqa: E402
+
+SAMPLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "ros_samples.json")
+
+
+def load_samples(path: str = SAMPLES_PATH) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 긴 전역 경로 (nav_msgs/Path, 2.5cm 간격 완만한 곡선) 생성
+def make_plan(n: int, seed: int = 7) -> dict:
+    rnd = random.Random(seed)
+    x = y = 0.0
+    th = 0.3
+    poses = []
+    for _ in range(n):
+        th += rnd.uniform(-0.05, 0.05)
+        x += 0.025 * math.cos(th)
+        y += 0.025 * math.sin(th)
+        poses.append({"pose": {
+            "position": {"x": x, "y": y, "z": 0.0},
+            "orientation": {"x": 0.0, "y": 0.0, "z": math.sin(th / 2), "w": math.cos(th / 2)},
+        }})
+    return {"header": {"frame_id": "map"}, "poses": poses}
+
+
+# 벤치마크 케이스 목록 → [(이름, 함수, 인자 리스트)]
+def build_cases(samples: dict) -> list:
+    cases = []
+
+    # 토픽별 변환 (diagnostics는 상태별로 분리)
+    for topic, msgs in samples.items():
+        if topic == "/diagnostics":
+            continue
+        cases.append((
+            f"process_ros_data{topic}",
+            data_processor.process_ros_data,
+            [(topic, m, "tb3") for m in msgs],
+        ))
+
+    # 5k 점 전역 경로 (추출 + 단순화)
+    plan = make_plan(5000)
+    cases.append(("process_ros_data/nav[5k]", data_processor.process_ros_data, [("/nav", plan, "tb3")]))
+    cases.append((
+        "simplify_path[5k]",
+        path_utils.simplify_path,
+        [(path_utils.extract_path(plan["poses"]), data_processor.NAV_PATH_BUDGET, data_processor.NAV_PATH_TOLERANCE)],
+    ))
+
+    for label, msg in zip(("ok", "warn", "error"), samples["/diagnostics"]):
+        cases.append((
+            f"diagnostics_summary[{label}]",
+            data_processor.process_ros_data,
+            [("/diagnostics", msg, "tb3")],
+        ))
+
+    # 변환 결과로 build_message 입력 구성
+    for topic, msgs in samples.items():
+        data = data_processor.process_ros_data(topic, msgs[0], "tb3")
+        cases.append((
+            f"build_message[{data['type']}]",
+            message_builder.build_message,
+            [(data["type"], data["payload"])],
+        ))
+
+    quats = [
+        m["pose"]["pose"]["orientation"]
+        for m in samples["/odom"] + samples["/amcl_pose"]
+    ]
+    cases.append(("quaternion_to_yaw", data_processor.quaternion_to_yaw, [(q,) for q in quats]))
+
+    # 수신 → 변환 → 생성 전체 (odom 기준)
+    def pipeline(topic, msg):
+        data = data_processor.process_ros_data(topic, msg, "tb3")
+        return message_builder.build_message(data["type"], data["payload"])
+
+    cases.append(("pipeline[odom]", pipeline, [("/odom", m) for m in samples["/odom"]]))
+    return cases
+
+
+# 호출 1회 평균 시간 (ns) - repeat 회 측정 중 최소/중앙값
+def time_case(func, args_list: list, min_time: float, repeat: int) -> dict:
+    # 측정 1회가 min_time 이상이 되도록 반복 수 결정
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            for a in args_list:
+                func(*a)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+
+    calls = loops * len(args_list)
+    runs = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            for _ in range(loops):
+                for a in args_list:
+                    func(*a)
+            runs.append((time.perf_counter_ns() - start) / calls)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    return {
+        "ns_per_msg": round(min(runs), 1),
+        "ns_median": round(statistics.median(runs), 1),
+        "calls": calls,
+    }
+
+
+# 메시지당 할당량 (결과 보존 블록 수 / 임시 포함 최대 바이트)
+def alloc_case(func, args_list: list, rounds: int = 200) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        keep = []
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base, _ = tracemalloc.get_traced_memory()
+        for _ in range(rounds):
+            for a in args_list:
+                keep.append(func(*a))
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    calls = rounds * len(args_list)
+    stats = after.compare_to(before, "filename")
+    blocks = sum(s.count_diff for s in stats)
+    return {
+        "alloc_blocks": round(blocks / calls, 1),
+        "alloc_bytes": round((current - base) / calls, 1),
+        "peak_bytes": round((peak - base) / calls, 1),
+    }
+
+
+def run(args) -> dict:
+    cases = build_cases(load_samples(args.samples))
+    results = {}
+    for name, func, args_list in cases:
+        if args.filter and args.filter not in name:
+            continue
+        res = time_case(func, args_list, args.min_time, args.repeat)
+        res.update(alloc_case(func, args_list))
+        results[name] = res
+        print(
+            f"  {name:<36} {res['ns_per_msg']:>10.1f} ns/msg  "
+            f"{res['alloc_blocks']:>6.1f} blocks  {res['alloc_bytes']:>8.1f} B",
+            file=sys.stderr,
+        )
+
+    return {
+        "python": sys.version.split()[0],
+        "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": results,
+    }
+
+
+# 기준 결과 대비 비교 → 회귀 케이스 목록
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    regressions = []
+    print(f"\n {'case':<36} | {'base ns':>9} | {'now ns':>9} | {'change':>8}")
+    print("-" * 38 + "+" + "-" * 11 + "+" + "-" * 11 + "+" + "-" * 9)
+    for name, res in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f" {name:<36} | {'-':>9} | {res['ns_per_msg']:>9.1f} | {'new':>8}")
+            continue
+
+        change = (res["ns_per_msg"] - base["ns_per_msg"]) / base["ns_per_msg"]
+        flag = ""
+        if change > threshold:
+            flag = " ⚠️"
+            regressions.append(name)
+        print(
+            f" {name:<36} | {base['ns_per_msg']:>9.1f} | {res['ns_per_msg']:>9.1f} | "
+            f"{change * 100:>+7.1f}%{flag}"
+        )
+    return regressions
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="메시지 코덱 마이크로 벤치마크")
+    p.add_argument("--samples", default=SAMPLES_PATH, help="기록 payload JSON")
+    p.add_argument("--filter", help="이름에 포함된 케이스만 실행")
+    p.add_argument("--min-time", type=float, default=0.05, help="측정 1회 최소 시간 (초)")
+    p.add_argument("--repeat", type=int, default=7, help="측정 반복 횟수")
+    p.add_argument("--save", help="결과 JSON 저장 경로")
+    p.add_argument("--compare", help="비교할 기준 결과 JSON")
+    p.add_argument("--threshold", type=float, default=0.15, help="회귀 판정 비율 (기본 15%%)")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = run(args)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[BENCH] 결과 저장 → {args.save}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            regressions = compare(result, json.load(f), args.threshold)
+        if regressions:
+            print(f"\n[BENCH] ❌ 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n[BENCH] ✅ 회귀 없음")
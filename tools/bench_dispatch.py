@@ -0,0 +1,100 @@
+"""
+작업 배정 벤치마크 (배정기 1주기 = 대기 작업 전체 재배정)
+
+대상:
+  - robot_arrays : 로봇 스냅샷 → 배정 입력 배열
+  - assign_jobs  : 작업 대기열 순서대로 최소 비용 로봇 배정
+                   (직선 거리만 / 핀 간 주행 거리 행렬 사용 두 경우, 배터리 예측 포함)
+
+입력은 무작위 창고 배치 (50m × 30m, 핀 격자, 로봇 상태 / 배터리 / 진행 중 작업 혼합)
+결과는 주기당 시간 (ms, 최소 / 중앙값)과 로봇별 배정 작업 수 분포
+
+사용 예:
+    python tools/bench_dispatch.py                        # 로봇 50대 × 작업 500건
+    python tools/bench_dispatch.py --robots 10 --jobs 100
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.fleet.scoring import DEFAULT_WEIGHTS, STATE_COST, robot_arrays, assign_jobs  # noqa: E402
+
+
+# 무작위 로봇 스냅샷 (상태 / 배터리 / 위치 / 진행 중 작업)
+def make_robots(n: int, rnd: random.Random) -> list[dict]:
+    states = list(STATE_COST) + ["비상정지"]
+    robots = []
+    for i in range(n):
+        busy = rnd.random() < 0.4
+        robots.append({
+            "name": f"tb3_{i}",
+            "connected": rnd.random() > 0.05,
+            "state": rnd.choice(states),
+            "battery": rnd.uniform(5, 100),
+            "drain": rnd.uniform(10, 40) / 3600,
+            "x": rnd.uniform(0, 50),
+            "y": rnd.uniform(0, 30),
+            "ready": rnd.uniform(0, 120) if busy else 0.0,
+            "queue": 1 if busy else 0,
+        })
+    return robots
+
+
+# 무작위 작업 (핀 격자 위) + 핀 간 주행 거리 (맨해튼 거리로 근사)
+def make_jobs(n: int, rnd: random.Random) -> tuple[np.ndarray, np.ndarray]:
+    pins = np.array([(x, y) for x in np.arange(1, 50, 2.0) for y in np.arange(1, 30, 3.0)])
+    job_xy = pins[[rnd.randrange(len(pins)) for _ in range(n)]]
+    job_dist = np.abs(job_xy[:, None, 0] - job_xy[None, :, 0]) + np.abs(job_xy[:, None, 1] - job_xy[None, :, 1])
+    return job_xy, job_dist
+
+
+# 1주기 시간 (ms) - repeat 회 측정
+def time_tick(robots: list[dict], job_xy: np.ndarray, job_dist, job_dock, repeat: int) -> tuple[list[float], np.ndarray]:
+    runs = []
+    owner = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        xy, ready, queue, base, level, drain = robot_arrays(robots, DEFAULT_WEIGHTS)
+        owner = assign_jobs(xy, ready, queue, base, job_xy, job_dist, DEFAULT_WEIGHTS, level, drain, job_dock)
+        runs.append((time.perf_counter() - start) * 1000)
+    return runs, owner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작업 배정 벤치마크")
+    parser.add_argument("--robots", type=int, default=50)
+    parser.add_argument("--jobs", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rnd = random.Random(args.seed)
+    robots = make_robots(args.robots, rnd)
+    job_xy, job_dist = make_jobs(args.jobs, rnd)
+
+    # 충전 핀 2곳 (창고 양 끝) 까지 이동 시간
+    docks = np.array([(0.0, 0.0), (50.0, 0.0)])
+    job_dock = np.hypot(*(job_xy[:, None, :] - docks[None, :, :]).transpose(2, 0, 1)).min(axis=1)
+    job_dock *= DEFAULT_WEIGHTS["detour"] / DEFAULT_WEIGHTS["speed"]
+
+    print(f"로봇 {args.robots}대 × 작업 {args.jobs}건 (반복 {args.repeat}회)")
+    for label, dist in (("직선 거리", None), ("주행 거리 행렬", job_dist)):
+        runs, owner = time_tick(robots, job_xy, dist, job_dock, args.repeat)
+        counts = np.bincount(owner[owner >= 0], minlength=args.robots)
+        eligible = counts[counts > 0]
+        print(
+            f"  {label:<12} min {min(runs):7.2f} ms  median {statistics.median(runs):7.2f} ms  "
+            f"배정 {int((owner >= 0).sum())}/{args.jobs}건, 로봇 {len(eligible)}대 "
+            f"(로봇당 {eligible.min() if len(eligible) else 0}~{eligible.max() if len(eligible) else 0}건)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+읽기 API 동시 요청 벤치마크 (requests/sec, 지연 백분위수)
+
+- 동시 연결 --concurrency 개가 --paths 를 번갈아 GET (응답 본문까지 수신)
+- 동기 DB 세션(스레드풀) / 비동기 DB 엔진(DB_ASYNC=True) 전후 비교용
+- 목록 API(/stocks/, /pins/, /categories/)는 목록 캐시로 응답하므로
+  DB 경로 측정은 기본값처럼 /logs/ 계열 위주로 구성
+- 결과는 JSON 으로 출력 (--baseline 으로 이전 결과와 비교)
+
+사용 예:
+    DB_ASYNC=False uvicorn app.main:app --port 8000   # 기준 측정
+    python tools/http_bench.py --concurrency 100 --duration 20 --json http_sync.json
+    DB_ASYNC=True uvicorn app.main:app --port 8000    # 비동기 엔진
+    python tools/http_bench.py --concurrency 100 --duration 20 --baseline http_sync.json
+
+httpx 필요 (pip install -r requirements-dev.txt)
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+DEFAULT_PATHS = "/logs/recent-tasks,/logs/today-summary,/logs/1,/stocks/,/pins/,/categories/"
+
+
+def percentile(values: list, p: float) -> float | None:
+    if not values:
+        return None
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+def summarize(values: list) -> dict:
+    values.sort()
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "count": len(values),
+        "p50_ms": ms(percentile(values, 0.50)),
+        "p90_ms": ms(percentile(values, 0.90)),
+        "p99_ms": ms(percentile(values, 0.99)),
+        "max_ms": ms(values[-1] if values else None),
+    }
+
+
+class HttpBench:
+    def __init__(self, args):
+        self.args = args
+        self.server = args.server.rstrip("/")
+        self.paths = [p.strip() for p in args.paths.split(",") if p.strip()]
+        self.latency = {path: [] for path in self.paths}
+        self.errors = {path: 0 for path in self.paths}
+
+    # 연결 1개: 종료 시각까지 경로를 순서대로 반복 요청
+    async def worker(self, client: httpx.AsyncClient, index: int, deadline: float):
+        i = index
+        while time.perf_counter() < deadline:
+            path = self.paths[i % len(self.paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                res = await client.get(self.server + path)
+                ok = res.status_code < 500
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                self.latency[path].append(time.perf_counter() - start)
+            else:
+                self.errors[path] += 1
+
+    async def run(self) -> dict:
+        args = self.args
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+            # 워밍업 (연결 수립 / 목록 캐시 적재)
+            for path in self.paths:
+                await client.get(self.server + path)
+
+            started = time.perf_counter()
+            deadline = started + args.duration
+            await asyncio.gather(*(self.worker(client, i, deadline) for i in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+
+        total = sum(len(v) for v in self.latency.values())
+        return {
+            "server": self.server,
+            "concurrency": args.concurrency,
+            "duration": round(elapsed, 2),
+            "requests": total,
+            "rps": round(total / elapsed, 1),
+            "errors": sum(self.errors.values()),
+            "latency": summarize([v for values in self.latency.values() for v in values]),
+            "paths": {
+                path: {**summarize(values), "errors": self.errors[path]}
+                for path, values in self.latency.items()
+            },
+        }
+
+
+# 이전 결과 대비 변화율 출력
+def compare(result: dict, baseline: dict):
+    rows = [("rps", result["rps"], baseline["rps"])]
+    for key in ("p50_ms", "p90_ms", "p99_ms"):
+        rows.append((key, result["latency"][key], baseline["latency"][key]))
+
+    print("\n metric          |   baseline |    current |   change")
+    print("-----------------+------------+------------+---------")
+    for name, new, old in rows:
+        change = f"{(new - old) / old * 100:+7.1f}%" if old and new is not None else "      -"
+        print(f" {name:<15} | {old!s:>10} | {new!s:>10} | {change}")
+
+
+def main():
+    p = argparse.ArgumentParser(description="읽기 API 동시 요청 벤치마크")
+    p.add_argument("--server", default="http://127.0.0.1:8000")
+    p.add_argument("--paths", default=DEFAULT_PATHS, help="요청 경로 (쉼표 구분)")
+    p.add_argument("--concurrency", type=int, default=100, help="동시 연결 수")
+    p.add_argument("--duration", type=float, default=20.0, help="측정 시간 (초)")
+    p.add_argument("--timeout", type=float, default=30.0, help="요청 제한 시간 (초)")
+    p.add_argument("--json", help="결과 JSON 저장 경로 (미지정 시 stdout)")
+    p.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    args = p.parse_args()
+
+    result = asyncio.run(HttpBench(args).run())
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(result, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
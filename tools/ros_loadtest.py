@@ -0,0 +1,234 @@
+"""
+rosbridge 시뮬레이터 기반 서버 부하 테스트
+
+로봇 수 단계(기본 1, 10, 50)마다:
+  1) tools/rosbridge_sim.py 를 N대로 실행
+  2) 서버에 sim 로봇 등록 + 연결 (POST /robots/, /robots/connect/{id})
+  3) /ws 클라이언트로 odom / amcl_pose 수신 → header stamp 대비 종단 지연 측정
+  4) /proc/<pid>/stat 으로 서버 프로세스 CPU 사용률 측정
+  5) 연결 해제 후 시뮬레이터 종료
+
+서버는 ROS_MULTI_ROBOT=True 로 실행해야 로봇 N대가 동시에 연결 유지됨.
+
+사용 예:
+    ROS_MULTI_ROBOT=True uvicorn app.main:app --port 8000 &
+    python tools/ros_loadtest.py --server http://127.0.0.1:8000 --pid $! --json result.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+import websockets
+
+SIM_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "rosbridge_sim.py")
+
+# 지연 측정 대상 메시지 타입 (payload.stamp 포함)
+STAMPED_TYPES = ("odom", "amcl_pose")
+
+
+# 정렬된 리스트 백분위수
+def percentile(values: list, p: float) -> float | None:
+    if not values:
+        return None
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+# 프로세스 누적 CPU 시간 (초)
+def process_cpu_seconds(pid: int) -> float | None:
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        # utime, stime (state 필드 이후 12, 13번째)
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.server = args.server.rstrip("/")
+        self.http = requests.Session()
+
+    # sim 로봇 등록 (이미 있으면 재사용) → [(id, name)]
+    def ensure_robots(self, count: int) -> list:
+        existing = {r["name"]: r for r in self.http.get(f"{self.server}/robots/").json()}
+        robots = []
+        for i in range(1, count + 1):
+            name = f"{self.args.name_prefix}{i:02d}"
+            ip = f"{self.args.host_prefix}.{i}"
+            robot = existing.get(name)
+            if robot is None:
+                res = self.http.post(f"{self.server}/robots/", json={"name": name, "ip": ip})
+                res.raise_for_status()
+                robot = res.json()
+            elif robot["ip"] != ip:
+                res = self.http.put(f"{self.server}/robots/{robot['id']}", json={"ip": ip})
+                res.raise_for_status()
+                robot = res.json()
+            robots.append((robot["id"], name))
+        return robots
+
+    def start_sim(self, count: int) -> subprocess.Popen:
+        cmd = [
+            sys.executable, SIM_SCRIPT,
+            "--robots", str(count),
+            "--host-prefix", self.args.host_prefix,
+            "--odom-hz", str(self.args.odom_hz),
+            "--amcl-hz", str(self.args.amcl_hz),
+            "--pins-from", self.server,
+        ]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+
+        # 시작 완료 로그 대기
+        for line in proc.stdout:
+            if "시뮬레이션 시작" in line:
+                break
+        else:
+            raise RuntimeError("시뮬레이터 시작 실패")
+
+        # 이후 출력은 버려서 파이프가 차지 않도록 함
+        threading.Thread(target=proc.stdout.read, daemon=True).start()
+        return proc
+
+    def connect_all(self, robots: list) -> int:
+        for rid, _ in robots:
+            self.http.post(f"{self.server}/robots/connect/{rid}", timeout=10)
+
+        connected = sum(
+            1 for rid, _ in robots
+            if self.http.get(f"{self.server}/robots/status/{rid}").json().get("connected")
+        )
+        return connected
+
+    def disconnect_all(self, robots: list):
+        for rid, _ in robots:
+            try:
+                self.http.post(f"{self.server}/robots/disconnect/{rid}", timeout=10)
+            except requests.RequestException:
+                pass
+
+    # /ws 수신 → (지연 리스트, 수신 메시지 수, 로봇 수)
+    async def collect(self, names: set, duration: float):
+        ws_url = self.server.replace("http", "ws", 1) + "/ws"
+        latencies = []
+        received = 0
+        seen = set()
+
+        async with websockets.connect(ws_url, max_size=None) as ws:
+            end = time.time() + duration
+            while True:
+                remaining = end - time.time()
+                if remaining <= 0:
+                    break
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+
+                now = time.time()
+                msg = json.loads(raw)
+                payload = msg.get("payload") or {}
+                if payload.get("robot_name") not in names:
+                    continue
+
+                received += 1
+                seen.add(payload["robot_name"])
+                stamp = payload.get("stamp")
+                if msg.get("type") in STAMPED_TYPES and stamp:
+                    latencies.append(now - stamp)
+
+        return latencies, received, len(seen)
+
+    # 로봇 수 1단계 실행
+    def run_stage(self, count: int) -> dict:
+        print(f"\n[LOAD] ── 로봇 {count}대 ──")
+        robots = self.ensure_robots(count)
+        sim = self.start_sim(count)
+        try:
+            connected = self.connect_all(robots)
+            print(f"[LOAD] 연결된 로봇 {connected}/{count}")
+            if connected < count:
+                print("[LOAD] ⚠️ 일부 로봇 미연결 (서버 ROS_MULTI_ROBOT=True 확인)")
+
+            # 워밍업 후 측정
+            time.sleep(self.args.warmup)
+            cpu0 = process_cpu_seconds(self.args.pid) if self.args.pid else None
+            t0 = time.time()
+            latencies, received, seen = asyncio.run(
+                self.collect({name for _, name in robots}, self.args.duration)
+            )
+            wall = time.time() - t0
+            cpu1 = process_cpu_seconds(self.args.pid) if self.args.pid else None
+        finally:
+            self.disconnect_all(robots)
+            sim.terminate()
+            sim.wait(timeout=5)
+
+        latencies.sort()
+        ms = lambda v: round(v * 1000, 2) if v is not None else None
+        return {
+            "robots": count,
+            "connected": connected,
+            "robots_seen": seen,
+            "duration": round(wall, 2),
+            "messages": received,
+            "messages_per_sec": round(received / wall, 1) if wall else None,
+            "latency_samples": len(latencies),
+            "latency_ms": {
+                "p50": ms(percentile(latencies, 0.50)),
+                "p95": ms(percentile(latencies, 0.95)),
+                "p99": ms(percentile(latencies, 0.99)),
+                "max": ms(latencies[-1] if latencies else None),
+            },
+            "server_cpu_percent": (
+                round((cpu1 - cpu0) / wall * 100, 1)
+                if cpu0 is not None and cpu1 is not None and wall else None
+            ),
+        }
+
+
+def print_table(results: list):
+    print("\n robots | conn |   msg/s |  p50 ms |  p95 ms |  p99 ms |  max ms | cpu %")
+    print("--------+------+---------+---------+---------+---------+---------+------")
+    for r in results:
+        lat = r["latency_ms"]
+        cells = [lat["p50"], lat["p95"], lat["p99"], lat["max"]]
+        print(
+            f" {r['robots']:>6} | {r['connected']:>4} | {r['messages_per_sec'] or 0:>7} | "
+            + " | ".join(f"{c if c is not None else '-':>7}" for c in cells)
+            + f" | {r['server_cpu_percent'] if r['server_cpu_percent'] is not None else '-':>5}"
+        )
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="rosbridge 시뮬레이터 기반 부하 테스트")
+    p.add_argument("--server", default="http://127.0.0.1:8000")
+    p.add_argument("--pid", type=int, help="CPU 측정할 서버 프로세스 PID")
+    p.add_argument("--robots", default="1,10,50", help="단계별 로봇 수 (쉼표 구분)")
+    p.add_argument("--duration", type=float, default=20.0, help="단계별 측정 시간 (초)")
+    p.add_argument("--warmup", type=float, default=2.0)
+    p.add_argument("--odom-hz", type=float, default=20.0)
+    p.add_argument("--amcl-hz", type=float, default=5.0)
+    p.add_argument("--host-prefix", default="127.0.1")
+    p.add_argument("--name-prefix", default="sim-")
+    p.add_argument("--json", help="결과 JSON 저장 경로")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    test = LoadTest(args)
+    results = [test.run_stage(int(n)) for n in args.robots.split(",")]
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n[LOAD] 결과 저장 → {args.json}")
@@ -0,0 +1,308 @@
+"""
+로컬 rosbridge 시뮬레이터 (실제 TurtleBot 없이 ROSConnectionManager 검증용)
+
+- 로봇 N대를 각각 127.0.1.<i>:9090 에서 rosbridge v2 프로토콜로 제공
+  (서버는 로봇 포트를 9090으로 고정 사용하므로 루프백 주소로 로봇을 구분, Linux 기준)
+- /odom, /amcl_pose, /battery_state, /diagnostics 를 설정 주기로 퍼블리시
+- /cmd_vel 수신 시 속도 적분, /wasd_ui_command(핀 이름) 수신 시 핀 좌표까지 이동 후
+  /nav 로 "ARRIVED:<pin>" 퍼블리시 (이동 시간 = 거리 / 속도)
+
+사용 예:
+    python tools/rosbridge_sim.py --robots 10 --pins-from http://127.0.0.1:8000
+    python tools/rosbridge_sim.py --robots 3 --pins-file pins.json --odom-hz 30
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+
+import websockets
+
+# 자동 주행 기본 속도 (ros_manager AUTO_SPEED 1단 기준, m/s)
+DEFAULT_SPEED = 0.22
+
+# 토픽별 메시지 타입 (advertise / subscribe 응답용)
+TOPIC_TYPES = {
+    "/odom": "nav_msgs/msg/Odometry",
+    "/amcl_pose": "geometry_msgs/msg/PoseWithCovarianceStamped",
+    "/battery_state": "sensor_msgs/msg/BatteryState",
+    "/diagnostics": "diagnostic_msgs/msg/DiagnosticArray",
+    "/nav": "std_msgs/msg/String",
+}
+
+
+# ROS2 header.stamp 형식 현재 시각
+def _stamp() -> dict:
+    now = time.time()
+    sec = int(now)
+    return {"sec": sec, "nanosec": int((now - sec) * 1e9)}
+
+
+def _quaternion(theta: float) -> dict:
+    return {"x": 0.0, "y": 0.0, "z": math.sin(theta / 2), "w": math.cos(theta / 2)}
+
+
+# 핀 좌표 로드 ("x,y" 문자열 → (x, y))
+def _parse_coords(coords) -> tuple[float, float] | None:
+    try:
+        x, y = str(coords).split(",")[:2]
+        return float(x), float(y)
+    except (ValueError, TypeError):
+        return None
+
+
+def load_pins(pins_file: str | None, server: str | None) -> dict:
+    pins = {}
+    if pins_file:
+        with open(pins_file, "r", encoding="utf-8") as f:
+            for name, coords in json.load(f).items():
+                xy = _parse_coords(",".join(map(str, coords)) if isinstance(coords, list) else coords)
+                if xy:
+                    pins[name] = xy
+
+    if server:
+        import requests
+        for pin in requests.get(f"{server.rstrip('/')}/pins/", timeout=5).json():
+            xy = _parse_coords(pin.get("coords"))
+            if xy:
+                pins[pin["name"]] = xy
+
+    # 대기 위치 기본값
+    pins.setdefault("WAIT", (0.0, 0.0))
+    return pins
+
+
+# 시뮬레이션 로봇 1대 (상태 + rosbridge 세션 관리)
+class SimRobot:
+    def __init__(self, index: int, host: str, port: int, pins: dict, args):
+        self.index = index
+        self.host = host
+        self.port = port
+        self.pins = pins
+        self.args = args
+
+        # 대기 위치 주변에 분산 배치
+        wx, wy = pins["WAIT"]
+        self.x = wx + random.uniform(-0.5, 0.5)
+        self.y = wy + random.uniform(-0.5, 0.5)
+        self.theta = random.uniform(-math.pi, math.pi)
+        self.v = 0.0
+        self.w = 0.0
+        self.battery = random.uniform(0.6, 1.0)
+
+        # 수동 속도 명령 (마지막 수신 시각 기준 타임아웃)
+        self._manual = (0.0, 0.0)
+        self._manual_at = 0.0
+
+        # 자동 이동 목표 (pin, x, y)
+        self._goal = None
+
+        # 접속한 세션별 구독 토픽
+        self.sessions: dict = {}
+
+    # 세션 처리 (rosbridge v2 op 처리)
+    async def handle(self, ws):
+        self.sessions[ws] = set()
+        try:
+            async for raw in ws:
+                try:
+                    msg = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+
+                op = msg.get("op")
+                topic = msg.get("topic")
+                if op == "subscribe":
+                    self.sessions[ws].add(topic)
+                elif op == "unsubscribe":
+                    self.sessions[ws].discard(topic)
+                elif op == "publish":
+                    self.on_publish(topic, msg.get("msg") or {})
+                elif op == "call_service":
+                    await ws.send(json.dumps({
+                        "op": "service_response",
+                        "id": msg.get("id"),
+                        "service": msg.get("service"),
+                        "values": {},
+                        "result": True,
+                    }))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self.sessions.pop(ws, None)
+
+    # 서버 → 로봇 명령 수신
+    def on_publish(self, topic: str, msg: dict):
+        if topic == "/cmd_vel":
+            self._manual = (
+                float(msg.get("linear", {}).get("x", 0.0)),
+                float(msg.get("angular", {}).get("z", 0.0)),
+            )
+            self._manual_at = time.monotonic()
+            self._goal = None
+
+        elif topic == "/wasd_ui_command":
+            name = msg.get("data", "")
+            xy = self.pins.get(name)
+            if xy is None:
+                print(f"[SIM] robot{self.index}: 알 수 없는 핀 {name} → 제자리 도착 처리")
+                xy = (self.x, self.y)
+            self._goal = (name, xy[0], xy[1])
+
+    # 상태 적분 (dt 초)
+    def step(self, dt: float):
+        if self._goal:
+            name, gx, gy = self._goal
+            dx, dy = gx - self.x, gy - self.y
+            dist = math.hypot(dx, dy)
+            move = self.args.speed * dt
+
+            if dist <= move:
+                self.x, self.y = gx, gy
+                self.v = self.w = 0.0
+                self._goal = None
+                self.publish("/nav", {"data": f"ARRIVED:{name}"})
+            else:
+                self.theta = math.atan2(dy, dx)
+                self.x += dx / dist * move
+                self.y += dy / dist * move
+                self.v, self.w = self.args.speed, 0.0
+
+        elif time.monotonic() - self._manual_at < 0.5:
+            self.v, self.w = self._manual
+            self.theta += self.w * dt
+            self.x += self.v * math.cos(self.theta) * dt
+            self.y += self.v * math.sin(self.theta) * dt
+        else:
+            self.v = self.w = 0.0
+
+        # 주행 중 방전 (정지 시 1/5)
+        drain = self.args.drain * dt * (1.0 if self.v else 0.2)
+        self.battery = max(self.battery - drain, 0.0)
+
+    # 구독 중인 세션에 퍼블리시
+    def publish(self, topic: str, msg: dict):
+        if not self.sessions:
+            return
+        data = json.dumps({"op": "publish", "topic": topic, "msg": msg})
+        for ws, topics in list(self.sessions.items()):
+            if topic in topics:
+                asyncio.ensure_future(self._send(ws, data))
+
+    @staticmethod
+    async def _send(ws, data: str):
+        try:
+            await ws.send(data)
+        except websockets.ConnectionClosed:
+            pass
+
+    def odom_msg(self) -> dict:
+        pose = {
+            "position": {"x": self.x, "y": self.y, "z": 0.0},
+            "orientation": _quaternion(self.theta),
+        }
+        return {
+            "header": {"stamp": _stamp(), "frame_id": "odom"},
+            "child_frame_id": "base_footprint",
+            "pose": {"pose": pose, "covariance": [0.0] * 36},
+            "twist": {"twist": {
+                "linear": {"x": self.v, "y": 0.0, "z": 0.0},
+                "angular": {"x": 0.0, "y": 0.0, "z": self.w},
+            }, "covariance": [0.0] * 36},
+        }
+
+    def amcl_msg(self) -> dict:
+        return {
+            "header": {"stamp": _stamp(), "frame_id": "map"},
+            "pose": {"pose": {
+                "position": {"x": self.x, "y": self.y, "z": 0.0},
+                "orientation": _quaternion(self.theta),
+            }, "covariance": [0.0] * 36},
+        }
+
+    def battery_msg(self) -> dict:
+        return {
+            "header": {"stamp": _stamp(), "frame_id": ""},
+            "voltage": 11.1 + self.battery,
+            "current": -0.8 if self.v else -0.3,
+            "percentage": self.battery,
+            "power_supply_status": 2,
+        }
+
+    def diagnostics_msg(self) -> dict:
+        level = 1 if self.battery < 0.35 else 0
+        return {
+            "header": {"stamp": _stamp(), "frame_id": ""},
+            "status": [
+                {"level": 0, "name": "motor", "message": "OK", "hardware_id": "", "values": []},
+                {"level": level, "name": "battery",
+                 "message": "battery low" if level else "OK", "hardware_id": "", "values": []},
+            ],
+        }
+
+    # 토픽별 주기 퍼블리시 루프
+    async def run(self):
+        rates = {
+            "/odom": (self.args.odom_hz, self.odom_msg),
+            "/amcl_pose": (self.args.amcl_hz, self.amcl_msg),
+            "/battery_state": (self.args.battery_hz, self.battery_msg),
+            "/diagnostics": (self.args.diag_hz, self.diagnostics_msg),
+        }
+        # 로봇별 위상 분산 (동시 버스트 방지)
+        next_due = {t: time.monotonic() + random.random() / max(hz, 1e-6) for t, (hz, _) in rates.items()}
+
+        tick = 1.0 / self.args.sim_hz
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(tick)
+            now = time.monotonic()
+            self.step(now - last)
+            last = now
+
+            for topic, (hz, build) in rates.items():
+                if hz > 0 and now >= next_due[topic]:
+                    next_due[topic] = now + 1.0 / hz
+                    self.publish(topic, build())
+
+
+async def main(args):
+    pins = load_pins(args.pins_file, args.pins_from)
+    print(f"[SIM] 핀 {len(pins)}개 로드: {', '.join(sorted(pins))}")
+
+    robots = []
+    servers = []
+    for i in range(1, args.robots + 1):
+        host = f"{args.host_prefix}.{i}"
+        robot = SimRobot(i, host, args.port, pins, args)
+        servers.append(await websockets.serve(robot.handle, host, args.port, max_size=None))
+        robots.append(robot)
+        print(f"[SIM] robot{i} rosbridge → ws://{host}:{args.port}")
+
+    print(f"[SIM] ✅ 로봇 {len(robots)}대 시뮬레이션 시작", flush=True)
+    await asyncio.gather(*(r.run() for r in robots))
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="로컬 rosbridge 시뮬레이터")
+    p.add_argument("--robots", type=int, default=1, help="시뮬레이션 로봇 수")
+    p.add_argument("--host-prefix", default="127.0.1", help="로봇 i → <prefix>.<i>")
+    p.add_argument("--port", type=int, default=9090)
+    p.add_argument("--pins-file", help='핀 좌표 JSON ({"A1": "x,y"} 또는 {"A1": [x, y]})')
+    p.add_argument("--pins-from", help="핀 좌표를 가져올 WMS 서버 URL (GET /pins/)")
+    p.add_argument("--speed", type=float, default=DEFAULT_SPEED, help="자동 주행 속도 (m/s)")
+    p.add_argument("--odom-hz", type=float, default=20.0)
+    p.add_argument("--amcl-hz", type=float, default=5.0)
+    p.add_argument("--battery-hz", type=float, default=1.0)
+    p.add_argument("--diag-hz", type=float, default=1.0)
+    p.add_argument("--sim-hz", type=float, default=50.0, help="상태 적분 주기")
+    p.add_argument("--drain", type=float, default=0.0002, help="주행 중 초당 배터리 감소 (0~1)")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(parse_args()))
+    except KeyboardInterrupt:
+        print("[SIM] 종료")
@@ -0,0 +1,325 @@
+"""
+/ws 종단 부하 생성기 + 브로드캐스트 지연 벤치마크
+
+- 클라이언트 수백 개를 /ws 에 동시 접속
+- 그중 일부(sender)가 cmd_vel / request_stock_move / complete_stock_move
+  메시지를 설정 비율로 전송
+- 모든 클라이언트가 수신 메시지의 서버 송신 시각(ts) → 수신 시각으로 전달 지연 측정
+- 누락(drop)은 서버 /metrics 의 wms_ws_dropped_frames_total 측정 전후 차이로 집계
+  (robot_status 는 서버 상태 기계가 결정하므로 클라이언트 메시지는 다시 브로드캐스트되지 않음)
+- 결과는 JSON 으로 출력 (릴리스 간 회귀 추적용, --baseline 으로 이전 결과와 비교)
+
+주의: cmd_vel / request_stock_move / complete_stock_move 는 실제 로봇을 움직이고 작업 로그를 남김
+      - 서버에 실제 로봇(루프백 외 주소)이 연결돼 있으면 실행 거부 (--allow-robot-motion 으로만 허용)
+      - 부하 측정은 rosbridge 시뮬레이터(tools/rosbridge_sim.py) 로봇으로 실행 권장
+      - 수량 변경을 피하려면 기본값 --amount 0 유지
+
+사용 예:
+    python tools/ws_bench.py --server http://127.0.0.1:8000 --clients 300 --duration 30 --json ws.json
+    python tools/ws_bench.py --clients 300 --baseline ws_prev.json
+"""
+import argparse
+import asyncio
+import ipaddress
+import json
+import random
+import sys
+import time
+import uuid
+
+import requests
+import websockets
+
+# 기본 전송 비율 (가중치)
+DEFAULT_MIX = "cmd_vel=90,request_stock_move=5,complete_stock_move=5"
+
+# 서버 전송 실패 프레임 지표
+DROPPED_METRIC = "wms_ws_dropped_frames_total"
+
+# 로봇을 움직이는 메시지 (연결된 로봇이 있으면 --allow-robot-motion 필요)
+ROBOT_MOTION = ("cmd_vel", "request_stock_move", "complete_stock_move")
+
+
+def percentile(values: list, p: float) -> float | None:
+    if not values:
+        return None
+    return values[min(int(len(values) * p), len(values) - 1)]
+
+
+def summarize(values: list) -> dict:
+    values.sort()
+    ms = lambda v: round(v * 1000, 3) if v is not None else None
+    return {
+        "count": len(values),
+        "p50_ms": ms(percentile(values, 0.50)),
+        "p90_ms": ms(percentile(values, 0.90)),
+        "p99_ms": ms(percentile(values, 0.99)),
+        "max_ms": ms(values[-1] if values else None),
+    }
+
+
+def parse_mix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, weight = part.split("=")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+# 서버에 연결된 실제 로봇 이름 목록 (루프백 주소 = 시뮬레이터 제외, 조회 실패 시 None)
+def connected_robots(server: str) -> list | None:
+    try:
+        names = []
+        for robot in requests.get(f"{server}/robots/", timeout=5).json():
+            status = requests.get(f"{server}/robots/status/{robot['id']}", timeout=5).json()
+            if status.get("connected") and not ipaddress.ip_address(status.get("ip") or "0.0.0.0").is_loopback:
+                names.append(robot["name"])
+        return names
+    except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+        print("[BENCH] 로봇 연결 상태 조회 실패:", e, file=sys.stderr)
+        return None
+
+
+# 로봇 이동 메시지 전송 전 확인 (실제 로봇 연결 중이면 거부)
+def check_robot_motion(args) -> bool:
+    if args.allow_robot_motion:
+        return True
+    if not any(parse_mix(args.mix).get(name) for name in ROBOT_MOTION):
+        return True
+
+    robots = connected_robots(args.server.rstrip("/"))
+    if robots == []:
+        return True
+    reason = f"연결된 로봇 있음 ({', '.join(robots)})" if robots else "로봇 연결 상태 확인 불가"
+    print(
+        f"[BENCH] ❌ 실행 거부: {reason}\n"
+        f"        {', '.join(ROBOT_MOTION)} 메시지는 실제 로봇을 움직입니다.\n"
+        "        tools/rosbridge_sim.py 시뮬레이터 로봇으로 측정하거나, --mix 에서 제외하거나,\n"
+        "        의도한 경우 --allow-robot-motion 을 지정하세요.",
+        file=sys.stderr,
+    )
+    return False
+
+
+class WsBench:
+    def __init__(self, args):
+        self.args = args
+        self.server = args.server.rstrip("/")
+        self.ws_url = self.server.replace("http", "ws", 1) + "/ws"
+        self.mix = parse_mix(args.mix)
+        self.run_id = uuid.uuid4().hex[:8]
+
+        self.stock_id = args.stock_id
+        self.sent = {name: 0 for name in self.mix}
+
+        # 수신 통계 (전체 클라이언트 합산)
+        self.latency = {}
+        self.received = 0
+        self.received_bytes = 0
+        self.connect_failures = 0
+        self.disconnects = 0
+
+    # 재고 이동 메시지용 stock_id 확보
+    def resolve_stock(self):
+        if self.stock_id is not None:
+            return
+        try:
+            stocks = requests.get(f"{self.server}/stocks/", timeout=5).json()
+        except requests.RequestException as e:
+            stocks = []
+            print("[BENCH] /stocks/ 조회 실패:", e)
+
+        if stocks:
+            self.stock_id = stocks[0]["id"]
+        else:
+            for name in ("request_stock_move", "complete_stock_move"):
+                self.mix.pop(name, None)
+            print("[BENCH] ⚠️ 재고 없음 → 재고 이동 메시지 제외")
+
+    def build(self, msg_type: str, sender: int, seq: int) -> dict:
+        if msg_type == "cmd_vel":
+            return {"type": "cmd_vel", "payload": {
+                "linear": {"x": round(random.uniform(-0.1, 0.1), 3)},
+                "angular": {"z": round(random.uniform(-0.5, 0.5), 3)},
+                "gear": 1,
+            }}
+        if msg_type == "request_stock_move":
+            return {"type": "request_stock_move", "payload": {
+                "stock_id": self.stock_id,
+                "amount": self.args.amount,
+                "mode": random.choice(("INBOUND", "OUTBOUND")),
+            }}
+        return {"type": msg_type}
+
+    # 수신 루프 (모든 클라이언트)
+    async def receiver(self, ws, deadline: float):
+        try:
+            while True:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return
+                try:
+                    raw = await asyncio.wait_for(ws.recv(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    return
+
+                now = time.time()
+                msg = json.loads(raw)
+                self.received += 1
+                self.received_bytes += len(raw)
+
+                ts = msg.get("ts")
+                if ts is not None:
+                    self.latency.setdefault(msg.get("type"), []).append(now - ts)
+        except websockets.ConnectionClosed:
+            self.disconnects += 1
+
+    # 송신 루프 (sender 클라이언트, 포아송 도착)
+    async def sender(self, ws, index: int, rate: float, deadline: float):
+        names = list(self.mix)
+        weights = [self.mix[n] for n in names]
+        seq = 0
+        try:
+            while True:
+                await asyncio.sleep(random.expovariate(rate))
+                if time.time() >= deadline:
+                    return
+                msg_type = random.choices(names, weights)[0]
+                await ws.send(json.dumps(self.build(msg_type, index, seq)))
+                self.sent[msg_type] = self.sent.get(msg_type, 0) + 1
+                seq += 1
+        except websockets.ConnectionClosed:
+            pass
+
+    async def client(self, index: int, start_at: float, deadline: float, rate: float):
+        try:
+            ws = await websockets.connect(self.ws_url, max_size=None, open_timeout=20)
+        except Exception:
+            self.connect_failures += 1
+            return None
+
+        # 전원 접속 완료 후 동시에 측정 시작
+        await asyncio.sleep(max(start_at - time.time(), 0))
+        tasks = [self.receiver(ws, deadline)]
+        if rate > 0:
+            tasks.append(self.sender(ws, index, rate, deadline - self.args.drain))
+        await asyncio.gather(*tasks)
+        await ws.close()
+        return ws
+
+    # 서버 전송 실패 프레임 누적 수 (/metrics 조회 실패 시 None, 다중 워커면 응답한 워커 기준)
+    def scrape_dropped(self) -> float | None:
+        try:
+            text = requests.get(f"{self.server}/metrics", timeout=5).text
+        except requests.RequestException as e:
+            print("[BENCH] /metrics 조회 실패:", e)
+            return None
+        for line in text.splitlines():
+            if line.startswith(DROPPED_METRIC + " "):
+                return float(line.split()[1])
+        # 증가 전 카운터는 샘플 줄 없음
+        return 0.0
+
+    async def run(self) -> dict:
+        args = self.args
+        self.resolve_stock()
+        dropped_before = self.scrape_dropped()
+
+        senders = min(args.senders, args.clients)
+        per_sender = args.rate / senders if senders else 0.0
+
+        start_at = time.time() + args.ramp
+        deadline = start_at + args.duration
+        await asyncio.gather(*(
+            self.client(i, start_at, deadline, per_sender if i < senders else 0.0)
+            for i in range(args.clients)
+        ))
+
+        connected = args.clients - self.connect_failures
+        dropped_after = self.scrape_dropped()
+        dropped = (
+            int(dropped_after - dropped_before)
+            if dropped_before is not None and dropped_after is not None else None
+        )
+        all_latency = [v for vals in self.latency.values() for v in vals]
+
+        return {
+            "run_id": self.run_id,
+            "at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "config": {
+                "server": self.server,
+                "clients": args.clients,
+                "senders": senders,
+                "rate": args.rate,
+                "duration": args.duration,
+                "mix": self.mix,
+            },
+            "connected": connected,
+            "connect_failures": self.connect_failures,
+            "disconnects": self.disconnects,
+            "sent": self.sent,
+            "received": self.received,
+            "received_per_sec": round(self.received / args.duration, 1),
+            "received_mb_per_sec": round(self.received_bytes / args.duration / 1e6, 3),
+            "latency": summarize(all_latency),
+            "latency_by_type": {t: summarize(v) for t, v in sorted(self.latency.items())},
+            "drops": {
+                "dropped": dropped,
+                "drop_rate": round(dropped / (dropped + self.received), 5) if dropped is not None and dropped + self.received else None,
+            },
+        }
+
+
+# 이전 결과 대비 주요 지표 변화 출력
+def compare(result: dict, baseline: dict):
+    rows = [
+        ("latency p50 ms", ("latency", "p50_ms")),
+        ("latency p99 ms", ("latency", "p99_ms")),
+        ("received/s", ("received_per_sec",)),
+        ("drop rate", ("drops", "drop_rate")),
+    ]
+    print("\n metric          |   baseline |    current |   change")
+    print("-----------------+------------+------------+---------")
+    for label, path in rows:
+        old, new = baseline, result
+        for key in path:
+            old = (old or {}).get(key)
+            new = (new or {}).get(key)
+        change = f"{(new - old) / old * 100:+.1f}%" if old and new is not None else "-"
+        print(f" {label:<15} | {old if old is not None else '-':>10} | {new if new is not None else '-':>10} | {change:>8}")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="/ws 부하 생성 + 브로드캐스트 지연 벤치마크")
+    p.add_argument("--server", default="http://127.0.0.1:8000")
+    p.add_argument("--clients", type=int, default=200, help="동시 접속 클라이언트 수")
+    p.add_argument("--senders", type=int, default=20, help="메시지를 보내는 클라이언트 수")
+    p.add_argument("--rate", type=float, default=50.0, help="전체 송신 속도 (msg/s)")
+    p.add_argument("--duration", type=float, default=20.0, help="측정 시간 (초)")
+    p.add_argument("--ramp", type=float, default=3.0, help="접속 대기 시간 (초)")
+    p.add_argument("--drain", type=float, default=1.0, help="종료 전 송신 중단 후 수신 대기 (초)")
+    p.add_argument("--mix", default=DEFAULT_MIX, help="메시지 비율 (type=weight,...)")
+    p.add_argument("--stock-id", type=int, help="재고 이동 메시지에 사용할 stock_id")
+    p.add_argument("--amount", type=int, default=0, help="재고 이동 수량")
+    p.add_argument("--allow-robot-motion", action="store_true", help="연결된 실제 로봇이 있어도 이동 / 작업 메시지 전송")
+    p.add_argument("--json", help="결과 JSON 저장 경로 (미지정 시 stdout)")
+    p.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    return p.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if not check_robot_motion(args):
+        sys.exit(2)
+    result = asyncio.run(WsBench(args).run())
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"[BENCH] 결과 저장 → {args.json}", file=sys.stderr)
+    else:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            compare(result, json.load(f))